@@ -1,5 +1,5 @@
 """Network adapters."""
 
-from app.adapters.network.tcp import tcp_ping
+from app.adapters.network.tcp import async_tcp_ping, tcp_ping
 
-__all__ = ["tcp_ping"]
+__all__ = ["async_tcp_ping", "tcp_ping"]
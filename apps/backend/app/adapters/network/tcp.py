@@ -3,10 +3,12 @@
 
 - TCP 接続を試みて即時にクローズする。
 - 返り値は (成功可否, レイテンシ, エラー文字列)。
+- イベントループ上では `async_tcp_ping` を使う（`tcp_ping` はループを止める）。
 """
 
 from __future__ import annotations
 
+import asyncio
 import socket
 import time
 from typing import Final
@@ -97,3 +99,54 @@ def tcp_ping(
         # その他のソケット系エラー。
         error_message = str(e) or e.__class__.__name__
         return False, _elapsed_ms(start_ns), error_message
+
+
+async def async_tcp_ping(
+    host: str, port: int, timeout: float = _DEFAULT_TIMEOUT_SEC
+) -> tuple[bool, int, str | None]:
+    """
+    イベントループをブロックしない TCP 到達性チェック。
+
+    `tcp_ping` と同じ判定・返り値を asyncio ネイティブに実装したもの。
+    名前解決と接続待ちはループ上で非同期に行うため、到達不能なホストでも
+    他リクエストの処理を止めない。
+
+    引数:
+        host: 対象ホスト名または IP
+        port: 対象ポート番号
+        timeout: 名前解決を含む接続タイムアウト秒（既定: 1.0）
+
+    戻り値:
+        tuple[bool, int, str | None]: `tcp_ping` と同じ (ok, latency_ms, error)
+    """
+    _validate_target(host, port)
+    normalized_timeout = _normalize_timeout(timeout)
+    start_ns = time.perf_counter_ns()
+    try:
+        async with asyncio.timeout(normalized_timeout):
+            _, writer = await asyncio.open_connection(host, port)
+        latency_ms = _elapsed_ms(start_ns)
+        # 到達性だけを見るため、計測後すぐにクローズする。
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            # クローズ時のリセットは到達性の判定には影響しない。
+            pass
+        return True, latency_ms, None
+
+    except TimeoutError:
+        return False, _elapsed_ms(start_ns), "timeout"
+
+    except ConnectionRefusedError as e:
+        # ポート閉塞や未待受など。
+        return False, _elapsed_ms(start_ns), str(e)
+
+    except socket.gaierror as e:
+        # 名前解決エラー。
+        return False, _elapsed_ms(start_ns), str(e)
+
+    except OSError as e:
+        # その他のソケット系エラー。
+        error_message = str(e) or e.__class__.__name__
+        return False, _elapsed_ms(start_ns), error_message
@@ -0,0 +1,116 @@
+"""
+設定からエンジン/セッションファクトリを組み立てる。
+
+- プール設定・計測（プール/ステートメント）・死活確認を、プライマリとレプリカで
+  共通に適用する
+- PgBouncer（transaction プーリング）互換モードでは次を行う
+  - psycopg のサーバサイド prepared statement を無効化する（prepare_threshold=None）
+    （トランザクションごとにサーバ接続が替わり、準備済み文が見つからなくなるため）
+  - 既定では NullPool を使い、接続の保持は PgBouncer に任せる
+    （小さなクライアント側プールを残す場合は DB_POOL_SIZE / DB_MAX_OVERFLOW で調整）
+  - セッションレベルの状態（SET / LISTEN / advisory lock など）を持ち込まない。
+    本アプリの設定値は SET LOCAL（トランザクション内）か、クライアント側の
+    autocommit 切り替えのみで与える
+- 既定の statement_timeout は接続確立時の options で与える（互換モードを除く）
+- DATABASE_URL を要求しないため、テストやベンチマークからも利用できる
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
+
+from app.adapters.postgres.liveness import install_idle_ping
+from app.adapters.postgres.pool_metrics import InstrumentedAsyncPool, instrument_pool
+from app.adapters.postgres.query_metrics import instrument_queries
+from app.adapters.postgres.unit_of_work import DeadlineSession
+from app.core.settings.config import AppSettings
+
+
+def engine_options(settings: AppSettings) -> dict[str, Any]:
+    """
+    `create_async_engine` へ渡すプール・ドライバ設定を返す。
+
+    引数:
+        settings: アプリ設定
+
+    戻り値:
+        dict[str, Any]: create_async_engine のキーワード引数
+    """
+    if settings.db_pgbouncer_mode and settings.db_pgbouncer_null_pool:
+        options: dict[str, Any] = {"poolclass": NullPool}
+    else:
+        options = {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout_sec,
+            "pool_recycle": settings.db_pool_recycle_sec,
+            "pool_pre_ping": settings.db_pool_liveness == "pre_ping",
+        }
+    if settings.db_pgbouncer_mode:
+        options["connect_args"] = {"prepare_threshold": None}
+    elif settings.db_statement_timeout_ms > 0:
+        # 接続確立時に既定の statement_timeout を与える（往復は増えない）。
+        # PgBouncer は startup の options を転送しないため、互換モードでは
+        # トランザクションごとの SET LOCAL のみで与える。
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        }
+    return options
+
+
+def server_statement_timeout_ms(settings: AppSettings) -> int:
+    """
+    接続確立時に設定される statement_timeout を返す（未設定なら 0）。
+    """
+    if settings.db_pgbouncer_mode:
+        return 0
+    return settings.db_statement_timeout_ms
+
+
+def create_engine(url: str, label: str, settings: AppSettings) -> AsyncEngine:
+    """
+    共通のプール設定・計測・死活確認を適用したエンジンを作成する。
+
+    引数:
+        url: 接続 URL（postgresql+psycopg://...）
+        label: メトリクス/ヘルス応答で使うプール名
+        settings: アプリ設定
+
+    戻り値:
+        AsyncEngine: 作成したエンジン
+    """
+    options = engine_options(settings)
+    created = create_async_engine(url, echo=False, future=True, **options)
+    instrument_pool(created, label, settings.db_max_overflow)
+    instrument_queries(created, settings.db_slow_query_ms)
+    # NullPool は毎回新しい接続を張るため、死活確認は不要
+    if settings.db_pool_liveness == "idle" and options["poolclass"] is not NullPool:
+        install_idle_ping(created, label, settings.db_pool_idle_ping_sec)
+    return created
+
+
+def create_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """
+    アプリ共通設定のセッションファクトリを作成する。
+
+    引数:
+        bind: バインドするエンジン
+
+    戻り値:
+        async_sessionmaker[AsyncSession]: セッションファクトリ
+    """
+    return async_sessionmaker(
+        bind=bind,
+        class_=DeadlineSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
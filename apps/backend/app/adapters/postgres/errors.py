@@ -0,0 +1,32 @@
+"""
+DB アクセスの期限超過・利用不可を表す例外。
+
+API 層でそれぞれ 504 / 503 に対応付ける（app.api.errors を参照）。
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+DeadlineSource = Literal["server", "client"]
+
+
+class DatabaseDeadlineExceeded(Exception):
+    """
+    リクエストの DB 期限を超過した。
+
+    属性:
+        timeout_ms: 適用していた期限（ミリ秒）
+        source: server（statement_timeout による取消）/ client（asyncio.timeout）
+    """
+
+    def __init__(self, timeout_ms: int, source: DeadlineSource) -> None:
+        super().__init__(f"database deadline exceeded ({source}, {timeout_ms} ms)")
+        self.timeout_ms = timeout_ms
+        self.source = source
+
+
+class DatabaseUnavailable(Exception):
+    """
+    プールから接続を取得できなかった（プール枯渇・接続待ちタイムアウト）。
+    """
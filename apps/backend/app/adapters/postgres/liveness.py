@@ -0,0 +1,64 @@
+"""
+プール接続の死活確認（アイドル時のみ ping）。
+
+`pool_pre_ping=True` はチェックアウトのたびに `SELECT 1` を往復させるため、
+短いクエリでは DB 往復が 2 倍になる。本モジュールは次の組み合わせで代替する:
+
+- 最後の返却から `idle_sec` 以上経過した接続だけを、チェックアウト時に ping する
+- 経過時間による作り直しは `pool_recycle`（DB_POOL_RECYCLE_SEC）に任せる
+- ping 失敗時は `InvalidatePoolError` を送出し、プール全体を無効化する
+  （同時期に作られた接続も同様に切れている可能性が高いため。
+  クエリ実行中の切断検知でも SQLAlchemy は既定でプール全体を無効化する）
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Final
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection
+
+from app.adapters.postgres.pool_metrics import POOL_LIVENESS_PINGS
+
+_RETURNED_AT: Final[str] = "returned_at"
+
+
+def install_idle_ping(engine: AsyncEngine, label: str, idle_sec: float) -> None:
+    """
+    アイドル時間が閾値を超えた接続のみ、チェックアウト時に ping する。
+
+    引数:
+        engine: 対象エンジン（`pool_pre_ping=False` で作成すること）
+        label: メトリクスで使うプール名
+        idle_sec: ping を行うアイドル秒数の閾値
+    """
+    sync_engine = engine.sync_engine
+    dialect = sync_engine.dialect
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        # 確立直後の接続は疎通済みのため ping 不要
+        record.info[_RETURNED_AT] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        record.info[_RETURNED_AT] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        proxy: PoolProxiedConnection,
+    ) -> None:
+        returned_at = record.info.get(_RETURNED_AT)
+        if returned_at is not None and time.monotonic() - returned_at < idle_sec:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as err:
+            POOL_LIVENESS_PINGS.inc((label, "fail"))
+            # プール側で当該接続を作り直し、古い接続はまとめて無効化される
+            raise exc.InvalidatePoolError() from err
+        POOL_LIVENESS_PINGS.inc((label, "ok"))
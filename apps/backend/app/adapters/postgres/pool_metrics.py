@@ -0,0 +1,247 @@
+"""
+SQLAlchemy コネクションプールの計測。
+
+- チェックアウト待ち時間はプールクラス（`InstrumentedAsyncPool`）で計測する
+  （SQLAlchemy のプールイベントには「取得開始」がないため）
+- 接続の利用中/待機/オーバーフロー数は収集時にプールから直接読む
+- pre-ping 失敗・無効化・チェックイン時の接続経過時間はプールイベントで記録する
+- 同じ値をヘルス応答用に `pool_status()` でも返す
+- `engine.dispose()` でプールは作り直されるため、プールではなくエンジンを保持する
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Final, cast
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from app.core.metrics import get_registry
+
+_CONNECTED_AT: Final[str] = "connected_at"
+
+_WAIT_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+_AGE_BUCKETS: Final[tuple[float, ...]] = (
+    1.0,
+    10.0,
+    60.0,
+    300.0,
+    900.0,
+    1800.0,
+    3600.0,
+    7200.0,
+    21600.0,
+    86400.0,
+)
+
+POOL_CHECKOUT_WAIT = get_registry().histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent acquiring a connection from the pool (including new connects).",
+    ("pool",),
+    _WAIT_BUCKETS,
+)
+POOL_CHECKOUT_TIMEOUTS = get_registry().counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that failed with a pool timeout.",
+    ("pool",),
+)
+POOL_PRE_PING_FAILURES = get_registry().counter(
+    "db_pool_pre_ping_failures_total",
+    "Pre-ping checks that found a disconnected connection.",
+    ("pool",),
+)
+POOL_LIVENESS_PINGS = get_registry().counter(
+    "db_pool_liveness_pings_total",
+    "Idle-connection liveness pings on checkout by result.",
+    ("pool", "result"),
+)
+POOL_INVALIDATIONS = get_registry().counter(
+    "db_pool_invalidations_total",
+    "Connections invalidated by the pool (hard or soft).",
+    ("pool", "kind"),
+)
+POOL_CONNECTION_AGE = get_registry().histogram(
+    "db_pool_connection_age_seconds",
+    "Age of connections when they are returned to the pool.",
+    ("pool",),
+    _AGE_BUCKETS,
+)
+POOL_CONNECTIONS = get_registry().gauge(
+    "db_pool_connections",
+    "Pooled connections by state (in_use, idle).",
+    ("pool", "state"),
+)
+POOL_OVERFLOW = get_registry().gauge(
+    "db_pool_overflow",
+    "Connections currently open beyond pool_size.",
+    ("pool",),
+)
+POOL_LIMIT = get_registry().gauge(
+    "db_pool_limit",
+    "Maximum connections (pool_size + max_overflow).",
+    ("pool",),
+)
+
+# ラベル → エンジン（登録はインポート時/起動時のみ）
+_engines: dict[str, AsyncEngine] = {}
+# ラベル → プール作成時に与えた max_overflow（SQLAlchemy の内部属性は読まない）
+_max_overflows: dict[str, int] = {}
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    チェックアウト待ち時間とタイムアウトを計測する `AsyncAdaptedQueuePool`。
+
+    `create_async_engine(..., poolclass=InstrumentedAsyncPool)` として使い、
+    ラベルは `instrument_pool()` で設定する。
+    """
+
+    metrics_label: str = "default"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        labels = (self.metrics_label,)
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(labels)
+            POOL_CHECKOUT_WAIT.observe(labels, time.perf_counter() - started)
+            raise
+        POOL_CHECKOUT_WAIT.observe(labels, time.perf_counter() - started)
+        return record
+
+    def recreate(self) -> QueuePool:
+        # dispose() 後の新しいプールへラベルを引き継ぐ
+        pool = cast(InstrumentedAsyncPool, super().recreate())
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def _overflow(pool: QueuePool) -> int:
+    # QueuePool.overflow() は未作成分を負数で表すため 0 で下限を取る
+    return max(0, pool.overflow())
+
+
+def _collect_connections() -> dict[tuple[str, ...], float]:
+    values: dict[tuple[str, ...], float] = {}
+    for label, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            values[(label, "in_use")] = float(pool.checkedout())
+            values[(label, "idle")] = float(pool.checkedin())
+    return values
+
+
+def _collect_overflow() -> dict[tuple[str, ...], float]:
+    return {
+        (label,): float(_overflow(engine.pool))
+        for label, engine in _engines.items()
+        if isinstance(engine.pool, QueuePool)
+    }
+
+
+def _collect_limit() -> dict[tuple[str, ...], float]:
+    return {
+        (label,): float(engine.pool.size() + _max_overflows[label])
+        for label, engine in _engines.items()
+        if isinstance(engine.pool, QueuePool)
+    }
+
+
+POOL_CONNECTIONS.set_function(_collect_connections)
+POOL_OVERFLOW.set_function(_collect_overflow)
+POOL_LIMIT.set_function(_collect_limit)
+
+
+def instrument_pool(engine: AsyncEngine, label: str, max_overflow: int) -> None:
+    """
+    エンジンのプールへ計測用イベントを登録する。
+
+    引数:
+        engine: 計測対象のエンジン
+        label: メトリクス/ヘルス応答で使うプール名（例: "primary"）
+        max_overflow: プール作成時に与えた max_overflow（上限の算出に使う）
+    """
+    if label in _engines:
+        return
+    _engines[label] = engine
+    _max_overflows[label] = max(0, max_overflow)
+    if isinstance(engine.pool, InstrumentedAsyncPool):
+        engine.pool.metrics_label = label
+
+    labels = (label,)
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        record.info[_CONNECTED_AT] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        connected_at = record.info.get(_CONNECTED_AT)
+        if dbapi_connection is None or connected_at is None:
+            return
+        POOL_CONNECTION_AGE.observe(labels, time.monotonic() - connected_at)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(
+        dbapi_connection: Any, record: ConnectionPoolEntry, exception: Any
+    ) -> None:
+        POOL_INVALIDATIONS.inc((label, "hard"))
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def _on_soft_invalidate(
+        dbapi_connection: Any, record: ConnectionPoolEntry, exception: Any
+    ) -> None:
+        POOL_INVALIDATIONS.inc((label, "soft"))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: ExceptionContext) -> None:
+        if context.is_pre_ping:
+            POOL_PRE_PING_FAILURES.inc(labels)
+
+
+def pool_status() -> list[dict[str, Any]]:
+    """
+    計測対象プールの現在値を返す（ヘルス応答用）。
+
+    戻り値:
+        list[dict[str, Any]]: プールごとの name / size / in_use / idle /
+            overflow / max_overflow / timeout_sec
+    """
+    statuses: list[dict[str, Any]] = []
+    for label, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            statuses.append({"name": label, "pool_class": type(pool).__name__})
+            continue
+        statuses.append(
+            {
+                "name": label,
+                "pool_class": type(pool).__name__,
+                "size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": _overflow(pool),
+                "max_overflow": _max_overflows[label],
+                "timeout_sec": pool.timeout(),
+            }
+        )
+    return statuses
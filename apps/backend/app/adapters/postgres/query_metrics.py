@@ -0,0 +1,185 @@
+"""
+SQL ステートメントの計測と slow_query ログ。
+
+- `before_cursor_execute` / `after_cursor_execute` で 1 ステートメントごとの
+  レイテンシと行数を記録する
+- ステートメントはリテラル・プレースホルダ・IN リストを正規化した
+  フィンガープリントに集約し、短いハッシュ（query_id）をメトリクスのラベルにする
+  （フィンガープリント本文は slow_query ログで確認できる）
+- 系列数の増加を防ぐため、query_id の種類は上限を超えたら `other` に丸める
+- 閾値以上のステートメントは `slow_query` として WARNING で出力する
+  （request_id / route は structlog の contextvars から付与される）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from functools import lru_cache
+from typing import Any, Final
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging.config import get_logger
+from app.core.metrics import get_registry
+
+logger = get_logger(__name__)
+
+_STARTED: Final[str] = "query_started"
+_MAX_QUERY_IDS: Final[int] = 500
+_OTHER: Final[str] = "other"
+
+_QUERY_BUCKETS: Final[tuple[float, ...]] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+QUERY_DURATION = get_registry().histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency in seconds by normalized query.",
+    ("query_id", "operation"),
+    _QUERY_BUCKETS,
+)
+QUERY_ROWS = get_registry().counter(
+    "db_query_rows_total",
+    "Rows returned or affected by normalized query.",
+    ("query_id", "operation"),
+)
+QUERY_ERRORS = get_registry().counter(
+    "db_query_errors_total",
+    "SQL statements that raised an error by normalized query.",
+    ("query_id", "operation"),
+)
+
+_COMMENT = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s|\$\d+|(?<!:):\w+")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> tuple[str, str, str]:
+    """
+    ステートメントを正規化し、(query_id, operation, fingerprint) を返す。
+
+    SQLAlchemy はコンパイル済み SQL をキャッシュするため、同じ文字列が
+    繰り返し渡される。結果は文字列単位でキャッシュする。
+
+    引数:
+        statement: ドライバへ渡される SQL 文字列
+
+    戻り値:
+        tuple[str, str, str]: (12 桁のハッシュ, 先頭キーワード, 正規化後の SQL)
+    """
+    normalized = _COMMENT.sub(" ", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("(...)", normalized)
+    normalized = _VALUES_ROWS.sub("(...)", normalized)
+    operation = normalized.split(" ", 1)[0].upper() if normalized else ""
+    query_id = hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+    return query_id, operation, normalized
+
+
+class _QueryIds:
+    """
+    メトリクスに使う query_id の種類を上限までに抑える。
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._seen: set[str] = set()
+
+    def label(self, query_id: str) -> str:
+        if query_id in self._seen:
+            return query_id
+        if len(self._seen) >= self._limit:
+            return _OTHER
+        self._seen.add(query_id)
+        return query_id
+
+
+_query_ids = _QueryIds(_MAX_QUERY_IDS)
+
+
+def instrument_queries(engine: AsyncEngine, slow_ms: float) -> None:
+    """
+    エンジンへステートメント計測用イベントを登録する。
+
+    引数:
+        engine: 計測対象のエンジン
+        slow_ms: これ以上のステートメントを slow_query として出力する（0 で無効）
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info[_STARTED] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        started = conn.info.pop(_STARTED, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        query_id, operation, normalized = fingerprint(statement)
+        labels = (_query_ids.label(query_id), operation)
+        QUERY_DURATION.observe(labels, elapsed)
+        rows = cursor.rowcount
+        if rows > 0:
+            QUERY_ROWS.inc(labels, rows)
+
+        elapsed_ms = elapsed * 1000.0
+        if 0 < slow_ms <= elapsed_ms:
+            logger.warning(
+                "slow_query",
+                query_id=query_id,
+                operation=operation,
+                fingerprint=normalized,
+                duration_ms=round(elapsed_ms, 2),
+                rows=rows,
+                slow_threshold_ms=slow_ms,
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: ExceptionContext) -> None:
+        conn = context.connection
+        if conn is not None:
+            conn.info.pop(_STARTED, None)
+        if context.statement is None or context.is_pre_ping:
+            return
+        query_id, operation, _ = fingerprint(context.statement)
+        QUERY_ERRORS.inc((_query_ids.label(query_id), operation))
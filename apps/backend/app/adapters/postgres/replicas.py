@@ -0,0 +1,190 @@
+"""
+読み取りレプリカへのルーティング。
+
+- レプリカごとに独立したエンジン/プールを持ち、読み取りセッションの接続先を選ぶ
+- 選択方式は round_robin（順番）または least_loaded（利用中接続数が最小）
+- 接続断・接続失敗を検知したレプリカは一定時間除外し、経過後に自動で戻す
+  （実リクエストの失敗に基づく受動的なヘルスチェック。戻した直後に
+  再び失敗すれば、その時点で再度除外される）
+- 検知はレプリカごとのエンジンの `handle_error` イベントで行い、
+  そのレプリカ自身の接続で起きた失敗だけを数える
+  （ハンドラの例外、文のキャンセル、プール待ちのタイムアウトでは除外しない）
+- 利用可能なレプリカがなければプライマリへフォールバックする
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Final, Literal
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core.logging.config import get_logger
+from app.core.metrics import get_registry
+
+logger = get_logger(__name__)
+
+ReplicaSelection = Literal["round_robin", "least_loaded"]
+
+PRIMARY: Final[str] = "primary"
+
+READ_ROUTES = get_registry().counter(
+    "db_read_routes_total",
+    "Read sessions by target (replica name or primary).",
+    ("target",),
+)
+REPLICA_EJECTIONS = get_registry().counter(
+    "db_replica_ejections_total",
+    "Replicas ejected from read routing after a connection failure.",
+    ("replica",),
+)
+REPLICA_AVAILABLE = get_registry().gauge(
+    "db_replica_available",
+    "1 if the replica currently receives reads, 0 while ejected.",
+    ("replica",),
+)
+
+
+@dataclass(slots=True)
+class Replica:
+    """
+    レプリカ 1 台分の接続先と除外状態。
+    """
+
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    ejected_until: float = field(default=0.0)
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def in_use(self) -> int:
+        pool = self.engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+def is_connection_failure(context: ExceptionContext) -> bool:
+    """
+    レプリカ除外の対象となる失敗（接続断・接続不可）かを判定する。
+
+    引数:
+        context: エンジンの `handle_error` イベントの文脈
+
+    戻り値:
+        bool: 接続断、または接続確立時の OperationalError なら True
+    """
+    if context.is_disconnect:
+        return True
+    # 接続確立前（connection が None）の OperationalError は接続不可。
+    # 確立済みの接続上の OperationalError（statement_timeout による取消など）は
+    # レプリカの不調ではないため含めない。
+    return context.connection is None and isinstance(
+        context.sqlalchemy_exception, exc.OperationalError
+    )
+
+
+class ReplicaSet:
+    """
+    レプリカ群とプライマリへのフォールバックを管理する。
+
+    選択・除外はイベントループ上でのみ行うため、ロックは不要。
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        primary: async_sessionmaker[AsyncSession],
+        *,
+        selection: ReplicaSelection = "round_robin",
+        eject_sec: float = 30.0,
+    ) -> None:
+        self._replicas = list(replicas)
+        self._primary = primary
+        self._selection = selection
+        self._eject_sec = eject_sec
+        self._counter = itertools.count()
+        for replica in self._replicas:
+            event.listen(
+                replica.engine.sync_engine,
+                "handle_error",
+                self._error_listener(replica.name),
+            )
+        REPLICA_AVAILABLE.set_function(self._availability)
+
+    @property
+    def replicas(self) -> list[Replica]:
+        return list(self._replicas)
+
+    def _availability(self) -> dict[tuple[str, ...], float]:
+        now = time.monotonic()
+        return {(r.name,): float(r.available(now)) for r in self._replicas}
+
+    def select(self) -> tuple[str, async_sessionmaker[AsyncSession]]:
+        """
+        読み取りセッションの接続先を選ぶ。
+
+        戻り値:
+            tuple[str, async_sessionmaker[AsyncSession]]: (接続先名, ファクトリ)
+        """
+        now = time.monotonic()
+        candidates = [r for r in self._replicas if r.available(now)]
+        if not candidates:
+            READ_ROUTES.inc((PRIMARY,))
+            return PRIMARY, self._primary
+
+        # 開始位置を回すことで、least_loaded の同数時も偏らないようにする
+        start = next(self._counter) % len(candidates)
+        ordered = candidates[start:] + candidates[:start]
+        if self._selection == "least_loaded":
+            chosen = min(ordered, key=Replica.in_use)
+        else:
+            chosen = ordered[0]
+        READ_ROUTES.inc((chosen.name,))
+        return chosen.name, chosen.session_factory
+
+    def _error_listener(self, name: str) -> Callable[[ExceptionContext], None]:
+        # 非同期エンジンの同期処理はイベントループ上の greenlet で動くため、
+        # このリスナーもイベントループスレッドで呼ばれる。
+        def on_error(context: ExceptionContext) -> None:
+            if is_connection_failure(context):
+                self.report_failure(name, context.original_exception)
+
+        return on_error
+
+    def report_failure(self, name: str, err: BaseException) -> None:
+        """
+        接続失敗を報告し、該当レプリカを `eject_sec` 秒間除外する。
+
+        引数:
+            name: レプリカ名
+            err: 失敗の原因（ログ用）
+        """
+        for replica in self._replicas:
+            if replica.name != name:
+                continue
+            now = time.monotonic()
+            if not replica.available(now):
+                return
+            replica.ejected_until = now + self._eject_sec
+            REPLICA_EJECTIONS.inc((name,))
+            logger.warning(
+                "db_replica_ejected",
+                replica=name,
+                eject_sec=self._eject_sec,
+                error=type(err).__name__,
+            )
+            return
+
+    async def dispose(self) -> None:
+        """
+        全レプリカのプール接続を閉じる。
+        """
+        for replica in self._replicas:
+            await replica.engine.dispose()
@@ -2,7 +2,14 @@
 psycopg v3 を用いた非同期 SQLAlchemy エンジンと FastAPI 依存。
 
 - DATABASE_URL（例: postgresql+psycopg://...）を使用する。
-- get_session() は UoW としてトランザクション範囲を提供する。
+- get_session() は UoW としてトランザクション範囲を提供する（開始は遅延）。
+- get_read_only_session() は COMMIT を行わない読み取り専用の範囲を提供する。
+- get_read_session() は読み取りレプリカ（DATABASE_REPLICA_URLS）へ振り分ける。
+- プール設定は AppSettings（DB_POOL_*）から engine モジュールで組み立てる。
+- リクエスト単位の DB 期限（statement_timeout + クライアント側タイムアウト）を
+  既定値（DB_STATEMENT_TIMEOUT_MS）またはルートごとの上書きで適用する。
+- DB_PGBOUNCER_MODE で PgBouncer（transaction プーリング）互換の設定にする。
+- 接続の死活確認は既定でアイドル時のみ行う（liveness を参照）。
 - 重要: Router/Service では commit()/rollback() を呼ばない。
   トランザクション制御はこの層で一元化する。
 """
@@ -10,15 +17,22 @@ psycopg v3 を用いた非同期 SQLAlchemy エンジンと FastAPI 依存。
 from __future__ import annotations
 
 import logging
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import (
-    AsyncEngine,
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.adapters.postgres.engine import (
+    create_engine,
+    create_session_factory,
+    server_statement_timeout_ms,
+)
+from app.adapters.postgres.replicas import PRIMARY, Replica, ReplicaSet
+from app.adapters.postgres.unit_of_work import (
+    DbDeadline,
+    read_only_bind,
+    session_scope,
+)
 from app.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -31,19 +45,33 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
 # 非同期エンジン（psycopg v3）。
-engine: AsyncEngine = create_async_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,
-    future=True,
-)
+engine: AsyncEngine = create_engine(DATABASE_URL, PRIMARY, settings)
 
 # セッションファクトリ。
-SessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=False,
+SessionLocal: async_sessionmaker[AsyncSession] = create_session_factory(engine)
+
+# 読み取り専用セッションファクトリ（同じプールを AUTOCOMMIT で使う）。
+ReadOnlySessionLocal: async_sessionmaker[AsyncSession] = create_session_factory(
+    read_only_bind(engine)
+)
+
+
+# 読み取りレプリカ（レプリカごとに独立したエンジン/プールを持つ）。
+def _create_replica(index: int, url: str) -> Replica:
+    name = f"replica{index}"
+    replica_engine = create_engine(url, name, settings)
+    return Replica(
+        name=name,
+        engine=replica_engine,
+        session_factory=create_session_factory(read_only_bind(replica_engine)),
+    )
+
+
+replica_set = ReplicaSet(
+    [_create_replica(i, url) for i, url in enumerate(settings.database_replica_urls)],
+    primary=ReadOnlySessionLocal,
+    selection=settings.db_replica_selection,
+    eject_sec=settings.db_replica_eject_sec,
 )
 
 
@@ -57,18 +85,145 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     return SessionLocal
 
 
+def _deadline(timeout_ms: int | None) -> DbDeadline:
+    return DbDeadline(
+        timeout_ms=settings.db_statement_timeout_ms
+        if timeout_ms is None
+        else timeout_ms,
+        grace_ms=settings.db_deadline_grace_ms,
+        server_default_ms=server_statement_timeout_ms(settings),
+    )
+
+
+_default_deadline = _deadline(None)
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     """
-    トランザクション（UoW）内で AsyncSession を yield する FastAPI 依存。
+    Unit of Work として AsyncSession を yield する FastAPI 依存。
 
     yield 値:
-        AsyncSession: `async with session.begin()` 範囲内のアクティブセッション
+        AsyncSession: 最初のステートメント実行時に接続・BEGIN されるセッション
 
     注意:
-        - 成功時は commit、例外時は rollback を SQLAlchemy が自動管理する。
+        - 成功時は commit、例外時は rollback をこの層で行う。
+        - DB に触れなかったリクエストでは接続も COMMIT も発生しない。
         - 上位レイヤーで commit()/rollback() は呼ばない。
+        - DB 期限は DB_STATEMENT_TIMEOUT_MS（上書きは session_with_deadline）。
+    """
+    async with session_scope(
+        get_session_factory(), deadline=_default_deadline
+    ) as session:
+        yield session
+
+
+def session_with_deadline(
+    timeout_ms: int,
+) -> Callable[[], AsyncIterator[AsyncSession]]:
+    """
+    DB 期限を上書きした get_session 相当の FastAPI 依存を返す。
+
+    例:
+        session: AsyncSession = Depends(session_with_deadline(timeout_ms=200))
+
+    引数:
+        timeout_ms: このルートの DB 期限（ミリ秒）。0 で期限なし
+            （接続既定値も SET LOCAL statement_timeout = 0 で打ち消す）
+
+    戻り値:
+        Callable[[], AsyncIterator[AsyncSession]]: FastAPI 依存
     """
-    session_factory = get_session_factory()
-    async with session_factory() as session:
-        async with session.begin():  # 成功時 commit / 例外時 rollback
+    deadline = _deadline(timeout_ms)
+
+    async def dependency() -> AsyncIterator[AsyncSession]:
+        async with session_scope(get_session_factory(), deadline=deadline) as session:
             yield session
+
+    return dependency
+
+
+async def get_read_only_session() -> AsyncIterator[AsyncSession]:
+    """
+    読み取り専用の AsyncSession を yield する FastAPI 依存。
+
+    yield 値:
+        AsyncSession: AUTOCOMMIT で動作し、BEGIN / COMMIT を送らないセッション
+
+    注意:
+        - 各ステートメントが個別に確定するため、複数クエリ間で同一スナップショットが
+          必要な読み取りには get_session を使う。
+        - 追加・変更したオブジェクトは書き込まれない。
+    """
+    async with session_scope(
+        ReadOnlySessionLocal, read_only=True, deadline=_default_deadline
+    ) as session:
+        yield session
+
+
+def get_replica_set() -> ReplicaSet:
+    """
+    読み取りレプリカ群を返す。
+
+    戻り値:
+        ReplicaSet: レプリカ群（未設定なら常にプライマリを返す）
+    """
+    return replica_set
+
+
+@asynccontextmanager
+async def _replica_session(deadline: DbDeadline) -> AsyncIterator[AsyncSession]:
+    # 接続失敗によるレプリカ除外は、レプリカのエンジンのイベントで行う。
+    _, session_factory = replica_set.select()
+    async with session_scope(
+        session_factory, read_only=True, deadline=deadline
+    ) as session:
+        yield session
+
+
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """
+    読み取りレプリカ（不在・全除外時はプライマリ）の AsyncSession を yield する
+    FastAPI 依存。
+
+    yield 値:
+        AsyncSession: 読み取り専用（AUTOCOMMIT）のセッション
+
+    注意:
+        - レプリカは非同期複製のため、直前の書き込みが見えない場合がある。
+          書き込み直後の読み取りには get_session を使う。
+        - 接続失敗したレプリカは一定時間ルーティング対象から外す。
+    """
+    async with _replica_session(_default_deadline) as session:
+        yield session
+
+
+def read_session_with_deadline(
+    timeout_ms: int,
+) -> Callable[[], AsyncIterator[AsyncSession]]:
+    """
+    DB 期限を上書きした get_read_session 相当の FastAPI 依存を返す。
+
+    AUTOCOMMIT では SET LOCAL が効かないため、サーバ側は接続既定値
+    （DB_STATEMENT_TIMEOUT_MS）が上限となる。短縮はクライアント側で強制される。
+
+    引数:
+        timeout_ms: このルートの DB 期限（ミリ秒）。0 で期限なし
+            （接続既定値がある場合は打ち消せないため指定できない）
+
+    戻り値:
+        Callable[[], AsyncIterator[AsyncSession]]: FastAPI 依存
+
+    例外:
+        ValueError: 接続既定値がある状態で 0 を指定した場合
+    """
+    if timeout_ms == 0 and server_statement_timeout_ms(settings) > 0:
+        raise ValueError(
+            "timeout_ms=0 cannot disable DB_STATEMENT_TIMEOUT_MS on read sessions"
+        )
+    deadline = _deadline(timeout_ms)
+
+    async def dependency() -> AsyncIterator[AsyncSession]:
+        async with _replica_session(deadline) as session:
+            yield session
+
+    return dependency
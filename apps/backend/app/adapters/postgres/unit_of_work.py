@@ -0,0 +1,185 @@
+"""
+遅延開始の Unit of Work。
+
+- 接続のチェックアウトと BEGIN は、最初のステートメント実行時まで行わない
+  （SQLAlchemy の autobegin に任せ、`session.begin()` を先行して呼ばない）
+- 一度も DB に触れなかったリクエストは、接続も COMMIT も発生しない
+- 読み取り専用スコープは AUTOCOMMIT の接続を使い、BEGIN / COMMIT を送らない
+  （psycopg は autocommit の切り替えをクライアント側で行うため往復は増えない）
+- commit / rollback はこの層だけが行う（Router / Service からは呼ばない）
+- リクエスト単位の DB 期限（`DbDeadline`）を次の 2 段で強制する
+  - サーバ側: トランザクション開始時に `SET LOCAL statement_timeout`
+    （DeadlineSession のセッションに限る）
+    （接続既定値と同じなら省略。AUTOCOMMIT では SET LOCAL が効かないため、
+    接続既定値のみが適用される）
+  - クライアント側: スコープ開始から期限 + 猶予で `asyncio.timeout_at`
+    （超過時は接続を破棄する。実行中のクエリの状態が不明なため）
+  - 期限 0 はどちらも無効にする（接続既定値は `SET LOCAL statement_timeout = 0`
+    で打ち消す）
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Final
+
+from psycopg.errors import QueryCanceled
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.adapters.postgres.errors import DatabaseDeadlineExceeded, DatabaseUnavailable
+
+_DEADLINE: Final[str] = "db_deadline"
+_TIMEOUT_MS: Final[str] = "db_timeout_ms"
+_SET_LOCAL: Final[str] = "db_set_local_timeout"
+
+
+@dataclass(frozen=True, slots=True)
+class DbDeadline:
+    """
+    リクエスト単位の DB 期限。
+
+    属性:
+        timeout_ms: サーバ側 statement_timeout（ミリ秒）。0 は期限なし
+            （接続既定値があれば SET LOCAL で 0 に戻し、クライアント側期限も設けない）
+        grace_ms: クライアント側期限へ上乗せする猶予
+            （通常はサーバ側の取消を先に発生させ、接続を再利用可能に保つ）
+        server_default_ms: 接続確立時に設定済みの statement_timeout（0 は未設定）
+    """
+
+    timeout_ms: int
+    grace_ms: int = 0
+    server_default_ms: int = 0
+
+
+def read_only_bind(engine: AsyncEngine) -> AsyncEngine:
+    """
+    プールを共有し、AUTOCOMMIT で接続を使うエンジンビューを返す。
+
+    引数:
+        engine: 元のエンジン
+
+    戻り値:
+        AsyncEngine: 読み取り専用スコープ用のバインド
+    """
+    return engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+class DeadlineSyncSession(Session):
+    """
+    DeadlineSession が内部で使う同期 Session。
+
+    SET LOCAL のリスナーはこのクラスにだけ登録し、プロセス内の
+    他の Session（スクリプトや他ライブラリ）には影響させない。
+    """
+
+
+@event.listens_for(DeadlineSyncSession, "after_begin")
+def _set_local_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    if not session.info.get(_SET_LOCAL):
+        return
+    if connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT":
+        return
+    timeout_ms = int(session.info[_TIMEOUT_MS])
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+class DeadlineSession(AsyncSession):
+    """
+    DB 期限の強制と、期限超過・接続枯渇の例外変換を行う AsyncSession。
+
+    対象は execute / scalar / scalars / get / flush / commit。
+    """
+
+    sync_session_class = DeadlineSyncSession
+
+    @asynccontextmanager
+    async def _guard(self) -> AsyncIterator[None]:
+        deadline: float | None = self.info.get(_DEADLINE)
+        try:
+            async with asyncio.timeout_at(deadline):
+                yield
+        except TimeoutError as err:
+            await self.invalidate()
+            raise DatabaseDeadlineExceeded(
+                self.info.get(_TIMEOUT_MS, 0), "client"
+            ) from err
+        except exc.OperationalError as err:
+            if isinstance(err.orig, QueryCanceled):
+                raise DatabaseDeadlineExceeded(
+                    self.info.get(_TIMEOUT_MS, 0), "server"
+                ) from err
+            raise
+        except exc.TimeoutError as err:
+            raise DatabaseUnavailable(str(err)) from err
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        async with self._guard():
+            return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        async with self._guard():
+            return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        async with self._guard():
+            return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        async with self._guard():
+            return await super().get(*args, **kwargs)
+
+    async def flush(self, objects: Any = None) -> None:
+        async with self._guard():
+            await super().flush(objects)
+
+    async def commit(self) -> None:
+        async with self._guard():
+            await super().commit()
+
+
+@asynccontextmanager
+async def session_scope(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    read_only: bool = False,
+    deadline: DbDeadline | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """
+    セッションを提供し、終了時にトランザクションを確定する。
+
+    引数:
+        session_factory: セッションファクトリ（DeadlineSession を推奨）
+        read_only: True なら COMMIT を行わない
+            （AUTOCOMMIT バインドのファクトリと組み合わせる）
+        deadline: リクエスト単位の DB 期限（None なら期限なし）
+
+    yield 値:
+        AsyncSession: 未開始のセッション（最初の実行で接続・BEGIN される）
+    """
+    async with session_factory() as session:
+        if deadline is not None:
+            info = session.info
+            info[_TIMEOUT_MS] = deadline.timeout_ms
+            # 0 の上書きも接続既定値と異なれば SET LOCAL で無効化する
+            info[_SET_LOCAL] = deadline.timeout_ms != deadline.server_default_ms
+            if deadline.timeout_ms > 0:
+                info[_DEADLINE] = (
+                    asyncio.get_running_loop().time()
+                    + (deadline.timeout_ms + deadline.grace_ms) / 1000
+                )
+        try:
+            yield session
+        except BaseException:
+            if session.in_transaction():
+                await session.rollback()
+            raise
+        if not read_only and session.in_transaction():
+            await session.commit()
@@ -0,0 +1,97 @@
+"""
+起動時のコネクションプール事前接続（ウォームアップ）。
+
+- N 本の接続を並行に確立し、各接続で軽量な SQL を 1 回実行する
+  （TCP / TLS / 認証のハンドシェイクを最初のリクエストから切り離す）
+- 全接続を同時に保持してから返却するため、N 本の別々の接続がプールに残る
+- 本数は pool_size を上限とする（超過分はオーバーフロー接続となり返却時に閉じられる）
+- NullPool（PgBouncer 互換モード）では接続が残らないため、疎通確認のみ行う
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+
+@dataclass(frozen=True, slots=True)
+class WarmupResult:
+    """
+    ウォームアップ結果。
+
+    属性:
+        requested: 確立を試みた接続数
+        warmed: SQL 実行まで成功した接続数
+        error: 失敗時の代表的なエラー（成功時は None）
+    """
+
+    requested: int
+    warmed: int
+    error: str | None
+
+    @property
+    def ok(self) -> bool:
+        return self.warmed == self.requested
+
+
+async def _open_and_ping(engine: AsyncEngine) -> AsyncConnection:
+    conn = await engine.connect()
+    try:
+        await conn.execute(text("SELECT 1"))
+    except BaseException:
+        await conn.close()
+        raise
+    return conn
+
+
+def _bounded(engine: AsyncEngine, connections: int) -> int:
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        return min(connections, pool.size())
+    # 接続を保持しないプール（NullPool）では疎通確認の 1 本のみ行う
+    return min(connections, 1)
+
+
+async def warm_pool(
+    engine: AsyncEngine, connections: int, timeout_sec: float
+) -> WarmupResult:
+    """
+    プールへ接続を事前に確立する。
+
+    引数:
+        engine: 対象エンジン
+        connections: 確立する接続数（pool_size で上限を取る）
+        timeout_sec: 全体の待ち時間上限
+
+    戻り値:
+        WarmupResult: 要求数・成功数・エラー
+    """
+    requested = _bounded(engine, connections)
+    if requested <= 0:
+        return WarmupResult(requested=0, warmed=0, error=None)
+
+    tasks = [asyncio.create_task(_open_and_ping(engine)) for _ in range(requested)]
+    _, pending = await asyncio.wait(tasks, timeout=timeout_sec)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    opened: list[AsyncConnection] = []
+    error: str | None = "timeout" if pending else None
+    for task in tasks:
+        if task.cancelled():
+            continue
+        exc = task.exception()
+        if exc is None:
+            opened.append(task.result())
+        elif error is None:
+            error = f"{type(exc).__name__}: {exc}"
+
+    # 全接続を保持した状態から返却し、別々の接続としてプールに残す。
+    for conn in opened:
+        await conn.close()
+    return WarmupResult(requested=requested, warmed=len(opened), error=error)
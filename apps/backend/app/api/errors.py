@@ -0,0 +1,67 @@
+"""
+API 共通の例外ハンドラ。
+
+- DB 期限超過は 504（上流の DB が期限内に応答しなかった）
+- 接続プールの枯渇は 503（一時的に受け付けられない。Retry-After を付与）
+- いずれもルートテンプレートとルート名を添えてログに残す
+"""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from app.adapters.postgres.errors import DatabaseDeadlineExceeded, DatabaseUnavailable
+from app.core.logging.config import get_logger
+from app.core.logging.context import route_template
+
+logger = get_logger(__name__)
+
+_RETRY_AFTER_SEC: Final[str] = "1"
+
+
+def _route_fields(request: Request) -> dict[str, Any]:
+    route = request.scope.get("route")
+    return {
+        "route": route_template(request.scope) or request.url.path,
+        "route_name": getattr(route, "name", None),
+        "method": request.method,
+    }
+
+
+async def _handle_deadline_exceeded(request: Request, exc: Exception) -> JSONResponse:
+    assert isinstance(exc, DatabaseDeadlineExceeded)
+    logger.warning(
+        "db_deadline_exceeded",
+        **_route_fields(request),
+        timeout_ms=exc.timeout_ms,
+        source=exc.source,
+    )
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "database deadline exceeded"},
+    )
+
+
+async def _handle_unavailable(request: Request, exc: Exception) -> JSONResponse:
+    logger.warning("db_unavailable", **_route_fields(request), error=str(exc))
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "database unavailable"},
+        headers={"Retry-After": _RETRY_AFTER_SEC},
+    )
+
+
+def register_exception_handlers(application: FastAPI) -> None:
+    """
+    アプリへ共通の例外ハンドラを登録する。
+
+    Args:
+        application: 対象の FastAPI アプリ
+    """
+    application.add_exception_handler(
+        DatabaseDeadlineExceeded, _handle_deadline_exceeded
+    )
+    application.add_exception_handler(DatabaseUnavailable, _handle_unavailable)
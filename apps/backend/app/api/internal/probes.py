@@ -1,15 +1,58 @@
+"""
+内部専用プローブ（Kubernetes の liveness / readiness）とメトリクス公開。
+
+- `/readyz` はメモリ上の readiness 状態のみを参照し、I/O を行わない
+- 応答ボディは事前に生成し、リクエストごとの JSON 変換を避ける
+- `/metrics` は Prometheus テキスト形式でプロセス内メトリクスを返す
+  （METRICS_MULTIPROC_DIR 設定時は全ワーカー分を合算する）
+"""
+
 from __future__ import annotations
 
-from fastapi import APIRouter
+import asyncio
+from typing import Final, get_args
+
+from fastapi import APIRouter, Response, status
+
+from app.core.lifecycle.readiness import NotReadyReason, get_readiness
+from app.core.metrics import CONTENT_TYPE, get_registry, render_snapshot
+from app.core.metrics.multiprocess import collect_merged
+from app.core.settings import get_settings
 
 router = APIRouter(tags=["probes"])
 
+_JSON: Final[str] = "application/json"
+_OK_BODY: Final[bytes] = b'{"status":"ok"}'
+_NOT_READY_BODIES: Final[dict[str, bytes]] = {
+    reason: b'{"status":"fail","reason":"%s"}' % reason.encode()
+    for reason in get_args(NotReadyReason)
+}
+
 
 @router.get("/livez")
-def livez() -> dict[str, str]:
-    return {"status": "ok"}
+async def livez() -> Response:
+    return Response(_OK_BODY, media_type=_JSON)
 
 
 @router.get("/readyz")
-def readyz() -> dict[str, str]:
-    return {"status": "ok"}
+async def readyz() -> Response:
+    reason = get_readiness().not_ready_reason()
+    if reason is None:
+        return Response(_OK_BODY, media_type=_JSON)
+    return Response(
+        _NOT_READY_BODIES[reason],
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        media_type=_JSON,
+    )
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    registry = get_registry()
+    directory = get_settings().metrics_multiproc_dir
+    if directory:
+        # 共有ファイルの読み書きはループ外で行う。
+        snapshot = await asyncio.to_thread(collect_merged, directory, registry)
+    else:
+        snapshot = registry.snapshot()
+    return Response(render_snapshot(snapshot), media_type=CONTENT_TYPE)
@@ -7,9 +7,9 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.adapters.postgres.session import get_session
+from app.adapters.postgres.session import get_session_factory
 from app.api.v1.schemas.health import HealthzResponse
 from app.core.security.auth import ApiTokenPrincipal, get_current_principal
 from app.services.health import build_health_payload
@@ -24,9 +24,9 @@ router = APIRouter(tags=["health"])
 )
 async def get_healthz(
     _principal: ApiTokenPrincipal = Depends(get_current_principal),
-    db_session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ) -> HealthzResponse:
     """
     ヘルスチェック結果を返す。
     """
-    return HealthzResponse(**(await build_health_payload(db_session)))
+    return HealthzResponse(**(await build_health_payload(session_factory)))
@@ -48,6 +48,70 @@ class HealthDependencyCheck(BaseModel):
         description="失敗時のエラー詳細。成功時は null。",
         examples=["timeout"],
     )
+    p50_ms: int | None = Field(
+        default=None,
+        description="直近チェックのレイテンシ p50(ms)。履歴がない場合は null。",
+        examples=[10],
+    )
+    p95_ms: int | None = Field(
+        default=None,
+        description="直近チェックのレイテンシ p95(ms)。履歴がない場合は null。",
+        examples=[25],
+    )
+    p99_ms: int | None = Field(
+        default=None,
+        description="直近チェックのレイテンシ p99(ms)。履歴がない場合は null。",
+        examples=[40],
+    )
+
+
+class HealthPoolStatus(BaseModel):
+    """
+    DB コネクションプールの現在値。
+
+    QueuePool 以外（NullPool など）は name / pool_class のみを返す。
+    """
+
+    name: str = Field(
+        ...,
+        description="プール名。",
+        examples=["primary"],
+    )
+    pool_class: str = Field(
+        ...,
+        description="プール実装クラス名。",
+        examples=["InstrumentedAsyncPool"],
+    )
+    size: int | None = Field(
+        default=None,
+        description="常時保持する接続数（pool_size）。",
+        examples=[5],
+    )
+    in_use: int | None = Field(
+        default=None,
+        description="チェックアウト中の接続数。",
+        examples=[2],
+    )
+    idle: int | None = Field(
+        default=None,
+        description="プール内で待機中の接続数。",
+        examples=[3],
+    )
+    overflow: int | None = Field(
+        default=None,
+        description="pool_size を超えて開いている接続数。",
+        examples=[0],
+    )
+    max_overflow: int | None = Field(
+        default=None,
+        description="オーバーフロー接続の上限。",
+        examples=[10],
+    )
+    timeout_sec: float | None = Field(
+        default=None,
+        description="チェックアウト待ちのタイムアウト秒。",
+        examples=[30.0],
+    )
 
 
 class HealthzResponse(BaseModel):
@@ -62,6 +126,10 @@ class HealthzResponse(BaseModel):
         app: アプリケーション識別子（サービス名）。
         now: レスポンス生成時点のサーバ時刻（UTC）。
         version: API またはアプリケーションのバージョン。
+        dependencies: 依存先ごとのチェック結果。
+        cached_at: 依存先チェック結果の取得時刻（UTC）。
+        age_ms: 依存先チェック結果の経過ミリ秒。
+        pools: DB コネクションプールの現在値。
     """
 
     status: Literal["ok", "fail"] = Field(
@@ -88,3 +156,18 @@ class HealthzResponse(BaseModel):
         ...,
         description="依存先ごとのヘルスチェック結果一覧。",
     )
+    cached_at: datetime = Field(
+        ...,
+        description="依存先チェック結果の取得時刻（UTC）。",
+        examples=[datetime.now(tz=UTC)],
+    )
+    age_ms: int = Field(
+        ...,
+        ge=0,
+        description="依存先チェック結果の経過時間(ms)。キャッシュの鮮度を表す。",
+        examples=[350],
+    )
+    pools: list[HealthPoolStatus] = Field(
+        default_factory=list,
+        description="DB コネクションプールごとの利用状況。",
+    )
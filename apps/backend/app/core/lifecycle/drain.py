@@ -0,0 +1,133 @@
+"""
+ローリングデプロイ向けのドレイン（段階的停止）制御
+
+- SIGTERM 受信時に即座にドレインへ入り、`/readyz` を失敗させる
+- ドレイン中の応答には `Connection: close` を付け、keep-alive 接続を畳む
+- サーバ本来の終了処理（新規受付停止）は猶予秒だけ遅らせて呼び出す
+  （Service/Ingress からエンドポイントが外れるまで流入が続くため）
+- 処理中リクエスト数を追跡し、終了時に予算内で完了を待つ
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import threading
+import time
+from types import FrameType
+from typing import Final
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.lifecycle.readiness import get_readiness
+from app.core.logging.config import get_logger
+
+logger = get_logger(__name__)
+
+_CONNECTION_CLOSE: Final[tuple[bytes, bytes]] = (b"connection", b"close")
+_IDLE_POLL_SEC: Final[float] = 0.05
+
+
+class DrainState:
+    """
+    処理中リクエスト数を保持する。
+
+    更新はイベントループスレッドのみで行うため、ロックは不要。
+    """
+
+    __slots__ = ("in_flight",)
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        処理中リクエストが 0 になるまで最大 `timeout` 秒待つ。
+
+        戻り値:
+            bool: 予算内に完了すれば True
+        """
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(_IDLE_POLL_SEC)
+        return True
+
+
+_drain = DrainState()
+
+
+def get_drain_state() -> DrainState:
+    """
+    プロセス共有のドレイン状態を返す。
+    """
+    return _drain
+
+
+def _log_drain_started() -> None:
+    logger.info("api_drain_started", in_flight=_drain.in_flight)
+
+
+def install_sigterm_drain(delay_sec: float) -> None:
+    """
+    SIGTERM をドレイン開始に置き換え、既存ハンドラを `delay_sec` 秒後に呼ぶ。
+
+    Uvicorn / Gunicorn ワーカーが登録済みの SIGTERM ハンドラを包む。
+    2 回目の SIGTERM では待たずに既存ハンドラへ渡す。
+    シグナルはメインスレッドでしか扱えないため、それ以外では何もしない。
+
+    引数:
+        delay_sec: サーバの終了処理を開始するまでの猶予秒
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    original = signal.getsignal(signal.SIGTERM)
+    if not callable(original):
+        # 既定動作（即時終了）や無視設定のままなら、サーバ管理外として触らない。
+        return
+
+    loop = asyncio.get_running_loop()
+
+    def handle_sigterm(signum: int, frame: FrameType | None) -> None:
+        readiness = get_readiness()
+        if readiness.draining:
+            original(signum, frame)
+            return
+        # フラグだけ即時に立て、ログ出力や遅延呼び出しはループへ委ねる
+        # （シグナルハンドラ内でロックを取る処理を避けるため）。
+        readiness.draining = True
+        loop.call_soon_threadsafe(_log_drain_started)
+        loop.call_soon_threadsafe(loop.call_later, delay_sec, original, signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+class DrainMiddleware:
+    """
+    処理中リクエスト数の追跡と、ドレイン中の `Connection: close` 付与を行う。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        readiness = get_readiness()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and readiness.draining:
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", ()), _CONNECTION_CLOSE],
+                }
+            await send(message)
+
+        _drain.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _drain.in_flight -= 1
@@ -0,0 +1,92 @@
+"""
+Readiness（受け入れ可否）状態の保持と判定
+
+- lifespan / バックグラウンドプローブが状態を更新し、`/readyz` は参照のみ行う
+- 判定はメモリ上のフラグと時刻比較だけで完結し、I/O を行わない
+- 失敗理由は機械可読なコード（`NotReadyReason`）で返す
+- バックグラウンドプローブ無効時は依存先を判定に含めない
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Literal
+
+NotReadyReason = Literal[
+    "draining",
+    "jwt_key_invalid",
+    "pool_cold",
+    "probe_stale",
+    "dependency_unavailable",
+]
+
+
+class ReadinessState:
+    """
+    プロセス内の readiness 状態。
+
+    属性:
+        pool_warmed: DB プールへの接続確立を確認済みか
+        jwt_key_ready: JWT 検証鍵を解析済みか
+        draining: シャットダウンに向けたドレイン中か
+        track_dependencies: 依存先（プール接続・プローブ結果）を判定に含めるか
+            （バックグラウンドプローブ無効時は False。判定材料が更新されないため）
+    """
+
+    __slots__ = (
+        "pool_warmed",
+        "jwt_key_ready",
+        "draining",
+        "track_dependencies",
+        "max_probe_age_sec",
+        "_probe_ok",
+        "_probe_at",
+    )
+
+    def __init__(self) -> None:
+        self.pool_warmed = False
+        self.jwt_key_ready = False
+        self.draining = False
+        self.track_dependencies = True
+        # 0 の場合はプローブ鮮度を判定しない（バックグラウンドプローブ無効時）
+        self.max_probe_age_sec = 0.0
+        self._probe_ok = False
+        self._probe_at: float | None = None
+
+    def record_probe(self, ok: bool) -> None:
+        """
+        依存先プローブの結果と時刻を記録する。
+        """
+        self._probe_ok = ok
+        self._probe_at = time.monotonic()
+
+    def not_ready_reason(self) -> NotReadyReason | None:
+        """
+        受け入れ不可の理由を返す（受け入れ可能なら None）。
+        """
+        if self.draining:
+            return "draining"
+        if not self.jwt_key_ready:
+            return "jwt_key_invalid"
+        if not self.track_dependencies:
+            return None
+        if not self.pool_warmed:
+            return "pool_cold"
+        if self.max_probe_age_sec > 0 and (
+            self._probe_at is None
+            or time.monotonic() - self._probe_at > self.max_probe_age_sec
+        ):
+            return "probe_stale"
+        if self._probe_at is not None and not self._probe_ok:
+            return "dependency_unavailable"
+        return None
+
+
+_readiness = ReadinessState()
+
+
+def get_readiness() -> ReadinessState:
+    """
+    プロセス共有の readiness 状態を返す。
+    """
+    return _readiness
@@ -2,6 +2,12 @@
 アプリ起動時のライフサイクル管理
 
 - 起動時にログ初期化を行い、起動・終了ログを出力する
+- 依存先ヘルスチェックのバックグラウンドプローブを起動・停止する
+- readiness 状態（JWT 検証鍵・DB プール・プローブ鮮度）を初期化する
+- DB プールへ事前接続し、失敗時は設定に応じて起動中止または縮退起動する
+- SIGTERM でドレインへ入り、終了時は処理中リクエストを待ってから DB を解放する
+- 終了時にログキューを書き切る
+- 複数ワーカー集約が有効なら、メトリクスの定期書き出しを起動・停止する
 """
 
 from __future__ import annotations
@@ -11,8 +17,24 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.core.logging.config import get_logger, setup_logging
+from app.adapters.postgres.session import (
+    engine,
+    get_replica_set,
+    get_session_factory,
+)
+from app.adapters.postgres.warmup import warm_pool
+from app.core.lifecycle.drain import get_drain_state, install_sigterm_drain
+from app.core.lifecycle.readiness import get_readiness
+from app.core.logging.config import get_logger, setup_logging, shutdown_logging
+from app.core.metrics import get_registry
+from app.core.metrics.multiprocess import SnapshotFlusher
+from app.core.security.auth import (
+    load_verification_keys,
+    shutdown_verify_offloader,
+    stop_key_refresh,
+)
 from app.core.settings import get_settings
+from app.services.health_prober import get_health_prober
 
 logger = get_logger(__name__)
 
@@ -24,14 +46,94 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """
 
     settings = get_settings()
-    setup_logging(level=settings.api_log_level)
+    setup_logging(
+        level=settings.api_log_level,
+        queue_size=settings.api_log_queue_size,
+        overflow=settings.api_log_overflow,
+        batch_size=settings.api_log_batch_size,
+        json_backend=settings.json_backend,
+    )
 
     logger.info(
         "api_startup",
         version=settings.api_version,
         service=settings.service_name,
     )
+
+    readiness = get_readiness()
+
+    def _jwt_key_loaded() -> None:
+        readiness.jwt_key_ready = True
+
+    try:
+        await load_verification_keys(on_loaded=_jwt_key_loaded)
+        readiness.jwt_key_ready = True
+    except RuntimeError:
+        # 起動は継続し、readyz で not ready（jwt_key_invalid）として公開する。
+        # JWKS は定期再取得で鍵を読み込めた時点で ready に戻る。
+        logger.exception("jwt_key_invalid")
+
+    if settings.db_pool_warmup_connections > 0:
+        warmup = await warm_pool(
+            engine,
+            settings.db_pool_warmup_connections,
+            settings.db_pool_warmup_timeout_sec,
+        )
+        if warmup.ok:
+            readiness.pool_warmed = True
+            logger.info("db_pool_warmed", connections=warmup.warmed)
+        elif settings.db_pool_warmup_policy == "fail":
+            logger.error(
+                "db_pool_warmup_failed",
+                requested=warmup.requested,
+                warmed=warmup.warmed,
+                error=warmup.error,
+            )
+            await engine.dispose()
+            shutdown_logging()
+            raise RuntimeError(f"DB pool warm-up failed: {warmup.error}")
+        else:
+            # 縮退起動: プローブで SQL 実行が成功するまで pool_cold のまま。
+            logger.warning(
+                "db_pool_warmup_degraded",
+                requested=warmup.requested,
+                warmed=warmup.warmed,
+                error=warmup.error,
+            )
+
+    prober = get_health_prober()
+    if settings.health_probe_interval_sec > 0:
+        readiness.max_probe_age_sec = settings.readiness_max_probe_age_sec
+        prober.start(
+            get_session_factory(),
+            interval_sec=settings.health_probe_interval_sec,
+        )
+    else:
+        # プローブ無効時は依存先の状態を更新する経路がないため、readiness の
+        # 判定から依存先を外す（/readyz はメモリ上の判定のみを保つ）。
+        readiness.track_dependencies = False
+
+    metrics_dir = settings.metrics_multiproc_dir
+    flusher = SnapshotFlusher()
+    if metrics_dir:
+        flusher.start(metrics_dir, get_registry(), settings.metrics_flush_interval_sec)
+
+    install_sigterm_drain(settings.api_drain_delay_sec)
     try:
         yield
     finally:
+        # サーバ側の待機で足りない場合に備え、予算内で処理中リクエストを待つ。
+        drained = await get_drain_state().wait_idle(settings.api_drain_timeout_sec)
+        if not drained:
+            logger.warning("api_drain_timeout", in_flight=get_drain_state().in_flight)
+        await prober.stop()
+        if metrics_dir:
+            await flusher.stop(metrics_dir, get_registry())
+        # プールの接続を明示的に閉じ、Postgres 側に孤児接続を残さない。
+        await engine.dispose()
+        await get_replica_set().dispose()
+        await stop_key_refresh()
+        shutdown_verify_offloader()
         logger.info("api_shutdown", service=settings.service_name)
+        # 最後に残りのログを書き切る
+        shutdown_logging()
@@ -4,16 +4,26 @@ structlogで構造化ログを初期化
 - アプリのログをJSONでstdoutへ出力
 - Uvicornのアクセス/エラーログは標準ログ伝播に任せる
   （アクセスはUvicorn側で無効化し、別ミドルウェアでJSON出力する推奨構成）
+- stdoutへの書き込みはキュー経由で専用スレッドへ逃がし、まとめて書き出す
+  （コンテナランタイム側のパイプが遅くても、イベントループを止めない）
+- キュー満杯で破棄した件数は `log_records_dropped_total` として公開する
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Final
+import threading
+from logging.handlers import QueueHandler
+from typing import Final, Literal, TextIO
 
 import structlog
 
+from app.core.metrics import get_registry
+from app.core.serialization import JsonBackend, get_log_serializer
+
 _ALLOWED_LEVELS: Final[set[str]] = {
     "DEBUG",
     "INFO",
@@ -23,6 +33,12 @@ _ALLOWED_LEVELS: Final[set[str]] = {
 }
 
 
+LOG_RECORDS_DROPPED = get_registry().counter(
+    "log_records_dropped_total",
+    "Log records discarded because the log queue was full.",
+)
+
+
 def _coerce_level(level: str) -> int:
     """
     レベル名をloggingレベルに変換する
@@ -39,20 +55,164 @@ def _coerce_level(level: str) -> int:
     return getattr(logging, upper, logging.INFO)
 
 
-def setup_logging(level: str = "INFO") -> None:
+OverflowPolicy = Literal["drop_oldest", "block"]
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    上限付きキューへ積む QueueHandler
+
+    キュー満杯時の挙動:
+      - drop_oldest: 最古の 1 件を捨てて積む（捨てた件数を `dropped` と
+        `log_records_dropped_total` に数える）
+      - block: 空きが出るまで呼び出し元を待たせる
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue[logging.LogRecord | None], overflow: OverflowPolicy
+    ) -> None:
+        super().__init__(log_queue)
+        self._bounded_queue = log_queue
+        self._overflow = overflow
+        # 厳密さより無ロックを優先した概算カウンタ（満杯時のみ更新される）
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._overflow == "block":
+            self._bounded_queue.put(record)
+            return
+        while True:
+            try:
+                self._bounded_queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self._bounded_queue.get_nowait()
+                    self.dropped += 1
+                    LOG_RECORDS_DROPPED.inc()
+                except queue.Empty:
+                    pass
+
+
+class _BatchWriter:
+    """
+    キューからレコードをまとめて取り出し、1 回の write で書き出すスレッド
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue[logging.LogRecord | None],
+        stream: TextIO,
+        formatter: logging.Formatter,
+        batch_size: int,
+    ) -> None:
+        self._queue = log_queue
+        self._stream = stream
+        self._formatter = formatter
+        self._batch_size = batch_size
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        積まれた分を書き切ってからスレッドを終了する
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        log_queue = self._queue
+        while True:
+            record = log_queue.get()
+            if record is None:
+                return
+            batch = [record]
+            stopping = False
+            while len(batch) < self._batch_size:
+                try:
+                    record = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        lines: list[str] = []
+        for record in batch:
+            try:
+                lines.append(self._formatter.format(record))
+            except Exception:
+                # 1 件の整形失敗でバッチ全体を失わない
+                continue
+        if not lines:
+            return
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except (OSError, ValueError):
+            # stdout が閉じられた後などは出力を諦める（アプリは止めない）
+            pass
+
+
+_queue_handler: _BoundedQueueHandler | None = None
+_writer: _BatchWriter | None = None
+_atexit_registered = False
+
+
+def setup_logging(
+    level: str = "INFO",
+    *,
+    queue_size: int = 10_000,
+    overflow: OverflowPolicy = "drop_oldest",
+    batch_size: int = 256,
+    json_backend: JsonBackend = "auto",
+) -> None:
     """
     構造化ログを初期化する
 
-    標準ログをstdoutへ設定し、structlogでISO/UTCのJSONに整形する。
+    標準ログをキュー経由でstdoutへ設定し、structlogでISO/UTCのJSONに整形する。
     Uvicorn系ロガーは伝播させ、実行時の設定に委ねる。
 
     Args:
         level: ルートロガーのログレベル
+        queue_size: 書き込み待ちレコードの上限
+        overflow: キュー満杯時の挙動（drop_oldest / block）
+        batch_size: 1 回の write でまとめる最大行数
+        json_backend: JSON シリアライザ（auto / orjson / stdlib）
     """
+    global _queue_handler, _writer, _atexit_registered
+
+    # 再初期化時は前回のパイプラインを書き切ってから差し替える
+    shutdown_logging()
+
+    log_queue: queue.Queue[logging.LogRecord | None] = queue.Queue(queue_size)
+    _queue_handler = _BoundedQueueHandler(log_queue, overflow)
+    # 呼び出し側ではメッセージ確定のみ行い、行全体の整形は書き込みスレッドで行う
+    _queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    _writer = _BatchWriter(
+        log_queue,
+        sys.stdout,
+        logging.Formatter(logging.BASIC_FORMAT),
+        batch_size,
+    )
+    _writer.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+
     # 標準ログ設定（重複ハンドラを避ける）
     logging.basicConfig(
         level=_coerce_level(level),
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[_queue_handler],
         force=True,
     )
 
@@ -70,7 +230,9 @@ def setup_logging(level: str = "INFO") -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.EventRenamer("event"),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(
+                serializer=get_log_serializer(json_backend)
+            ),
         ],
         # stdlib互換のファクトリで他ライブラリと協調
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -84,6 +246,42 @@ def setup_logging(level: str = "INFO") -> None:
     ua.disabled = True
 
 
+def shutdown_logging() -> None:
+    """
+    キューに残ったログを書き切り、書き込みスレッドを停止する
+
+    停止後のログは同期的にstdoutへ出力する（終了直前のログを失わないため）。
+    lifespan の終了時に呼び出す。
+    """
+    global _queue_handler, _writer
+
+    handler, writer = _queue_handler, _writer
+    if handler is None or writer is None:
+        return
+    _queue_handler = None
+    _writer = None
+
+    root = logging.getLogger()
+    root.removeHandler(handler)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root.addHandler(stream_handler)
+
+    writer.stop()
+    if handler.dropped:
+        get_logger(__name__).warning("log_records_dropped", count=handler.dropped)
+
+
+def get_dropped_log_count() -> int:
+    """
+    キュー満杯で破棄したログ件数を返す
+
+    Returns:
+        int: 現在のパイプラインで破棄した件数（未初期化なら 0）
+    """
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
 def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
     """
     構造化ロガーを取得する
@@ -0,0 +1,76 @@
+"""
+リクエスト単位のログコンテキスト（structlog contextvars）
+
+- request_id は AccessLogMiddleware がリクエスト開始時に束縛する
+  （受信した `X-Request-ID` が妥当ならそれを使い、なければ生成する）
+- route はルーティング後にしか確定しないため、アプリ共通の依存で束縛する
+- route は include_router の prefix を含むテンプレート（`route_template`）とする
+- 束縛した値は `merge_contextvars` により、そのリクエスト中の全ログへ付与される
+  （DB の slow_query ログなど、リクエストを知らない層のログも含む）
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from typing import Final
+
+from fastapi import Request
+from starlette.types import Scope
+from structlog.contextvars import bind_contextvars
+
+REQUEST_ID_HEADER: Final[bytes] = b"x-request-id"
+
+# ログ汚染を防ぐため、受け入れる外部 ID は英数字と一部記号のみとする
+_VALID_REQUEST_ID: Final[re.Pattern[str]] = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def request_id_from_scope(scope: Scope) -> str:
+    """
+    リクエストヘッダから request_id を取り出す（不正・未指定なら生成する）
+
+    Args:
+        scope: ASGIスコープ
+
+    Returns:
+        str: request_id
+    """
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER:
+            candidate = value.decode("latin-1")
+            if _VALID_REQUEST_ID.fullmatch(candidate):
+                return candidate
+            break
+    return uuid.uuid4().hex
+
+
+def route_template(scope: Scope) -> str | None:
+    """
+    マッチしたルートのテンプレートを include_router の prefix 込みで返す
+
+    FastAPI の include_router はルートを複製せずに包むため、
+    `scope["route"].path` は prefix を含まない（例: `/sample`）。
+    prefix 込みのパスは `scope["fastapi"]` の effective_route_context が
+    持つため、あればそちらを使う。
+
+    Args:
+        scope: ASGIスコープ
+
+    Returns:
+        str | None: ルートテンプレート（未マッチなら None）
+    """
+    route = scope.get("route")
+    if route is None:
+        return None
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    return getattr(context, "path", None) or getattr(route, "path", None)
+
+
+async def bind_route_context(request: Request) -> None:
+    """
+    マッチしたルートテンプレートをログコンテキストへ束縛する（アプリ共通の依存）
+
+    Args:
+        request: リクエスト
+    """
+    bind_contextvars(route=route_template(request.scope) or request.url.path)
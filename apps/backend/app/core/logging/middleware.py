@@ -3,6 +3,16 @@ HTTPアクセスログを構造化JSONで出力するミドルウェア
 
 - 概要: アクセスログをJSON形式で1リクエストごとに出力する
 - Uvicorn標準のアクセスログは抑止し、本ミドルウェアの出力を正とする
+- 純粋なASGIミドルウェアとして実装する
+  （BaseHTTPMiddleware はレスポンスボディを別タスク/メモリストリーム経由で
+  中継するため、リクエストごとのオーバーヘッドとストリーミングの
+  背圧欠如が生じる）
+- 2xx の通常リクエストはルート単位でサンプリングする
+  （非 2xx と閾値超過の遅いリクエストは常に出力し、遅いものは WARNING へ昇格）
+- クエリ文字列はトークンや個人情報を含みうるため、どのレベルでも出力しない
+- `/livez` `/readyz` `/metrics` は既定でサンプリング対象外（正常応答は出力しない）
+- サンプリングに関係なく、全リクエストを HTTP メトリクスへ記録する
+- request_id を structlog contextvars へ束縛し、応答の `X-Request-ID` でも返す
 - 期待フォーマット（1行JSONの例）
   {
     "timestamp":"...",
@@ -19,13 +29,19 @@ HTTPアクセスログを構造化JSONで出力するミドルウェア
 from __future__ import annotations
 
 import time
+from collections.abc import Iterable, Mapping
 from typing import Final
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from structlog.contextvars import bound_contextvars
 
 from app.core.logging.config import get_logger
+from app.core.logging.context import (
+    REQUEST_ID_HEADER,
+    request_id_from_scope,
+    route_template,
+)
+from app.core.metrics.http import HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS
 
 # アクセスログ専用ロガー
 logger = get_logger("access")
@@ -34,46 +50,164 @@ logger = get_logger("access")
 # 既存期待値との互換のためイベント名を固定
 _EVENT_NAME: Final[str] = "uvicorn.access"
 
+_DEFAULT_EXCLUDE_PATHS: Final[tuple[str, ...]] = ("/livez", "/readyz", "/metrics")
+_UNMATCHED_ROUTE: Final[str] = "unmatched"
 
-class AccessLogMiddleware(BaseHTTPMiddleware):
+
+def _sample_interval(rate: float) -> int:
+    """
+    サンプリング率を「N 件に 1 件」の N へ変換する（0 は出力しない）
+
+    乱数ではなく決定的なカウンタで間引くため、判定にロックも乱数生成も要らない。
+    """
+    if rate <= 0:
+        return 0
+    return max(1, round(1 / rate))
+
+
+def _route_key(scope: Scope) -> str:
+    """
+    サンプリングの単位となるルートテンプレート（未マッチ時は実パス）を返す
+    """
+    return route_template(scope) or scope["path"]
+
+
+class AccessLogMiddleware:
     """
     リクエスト/レスポンスごとにJSONのアクセスログを出力する
+
+    - ステータスは `http.response.start` から取得する
+    - レイテンシは最終ボディチャンク（`more_body=False`）送信時点で確定する
+    - レスポンス開始前に例外が発生した場合は 500 として記録し、再送出する
+    - 2xx かつ閾値未満のリクエストのみサンプリングで間引く
+    - 処理全体を request_id を束縛したコンテキスト内で実行する
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        sample_rate: float = 1.0,
+        route_sample_rates: Mapping[str, float] | None = None,
+        slow_ms: float = 0.0,
+        exclude_paths: Iterable[str] = _DEFAULT_EXCLUDE_PATHS,
+    ) -> None:
         """
-        リクエストを処理し、レスポンス確定時にログを出力する
-
         Args:
-            request: 受信したHTTPリクエスト
-            call_next: 次ハンドラを呼び出すコールバック
+            app: 次の ASGI アプリ
+            sample_rate: 2xx の既定サンプリング率（0.0-1.0）
+            route_sample_rates: ルートテンプレートごとのサンプリング率
+            slow_ms: これ以上のレイテンシを WARNING で必ず出力する（0 で無効）
+            exclude_paths: 2xx を出力しないパス
+        """
+        self.app = app
+        self._default_interval = _sample_interval(sample_rate)
+        self._route_intervals = {
+            route: _sample_interval(rate)
+            for route, rate in (route_sample_rates or {}).items()
+        }
+        for path in exclude_paths:
+            self._route_intervals[path] = 0
+        self._slow_ms = slow_ms
+        # ルートごとの通番（イベントループ上でのみ更新するためロック不要）
+        self._counters: dict[str, int] = {}
 
-        Returns:
-            Response: 応答
+    def _sampled(self, scope: Scope) -> bool:
         """
+        2xx の通常リクエストを出力するかを決定的に判定する
+        """
+        key = _route_key(scope)
+        interval = self._route_intervals.get(key, self._default_interval)
+        if interval <= 1:
+            return interval == 1
+        count = self._counters.get(key, 0) + 1
+        self._counters[key] = count
+        return count % interval == 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        リクエストを処理し、レスポンス完了時にログを出力する
+
+        Args:
+            scope: ASGIスコープ
+            receive: 受信チャネル
+            send: 送信チャネル
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_from_scope(scope)
+        with bound_contextvars(request_id=request_id):
+            await self._handle(scope, receive, send, request_id)
+
+    async def _handle(
+        self, scope: Scope, receive: Receive, send: Send, request_id: str
+    ) -> None:
         started = time.perf_counter()
-        client = request.client.host if request.client else "-"
-        method = request.method
-        path = request.url.path
         status = 500
+        logged = False
+        method: str = scope["method"]
+        in_flight_labels = (method,)
+        HTTP_IN_FLIGHT.inc(in_flight_labels)
+
+        def log_access() -> None:
+            nonlocal logged
+            logged = True
+            elapsed = time.perf_counter() - started
+            elapsed_ms = elapsed * 1000.0
+
+            route = route_template(scope) or _UNMATCHED_ROUTE
+            metric_labels = (method, route, str(status))
+            HTTP_REQUESTS.inc(metric_labels)
+            HTTP_REQUEST_DURATION.observe(metric_labels, elapsed)
+
+            slow = 0 < self._slow_ms <= elapsed_ms
+            if 200 <= status < 300 and not slow and not self._sampled(scope):
+                return
+
+            client = scope.get("client")
+            fields = {
+                "client_addr": client[0] if client else "-",
+                "path": scope["path"],
+                "status_code": status,
+                "method": method,
+                "latency_ms": round(elapsed_ms, 2),
+            }
+            if slow:
+                # 調査に必要な付帯情報を添えて WARNING へ昇格する。
+                logger.warning(
+                    _EVENT_NAME,
+                    **fields,
+                    slow=True,
+                    slow_threshold_ms=self._slow_ms,
+                    route=_route_key(scope),
+                )
+            else:
+                logger.info(_EVENT_NAME, **fields)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                status = message["status"]
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                    ],
+                }
+            await send(message)
+            if message_type == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                log_access()
 
         try:
-            response = await call_next(request)
-            status = response.status_code
-        except Exception:
-            # 例外時は500として記録し、再送出する
-            raise
+            await self.app(scope, receive, send_wrapper)
         finally:
-            elapsed_ms = (time.perf_counter() - started) * 1000.0
-            logger.info(
-                _EVENT_NAME,
-                client_addr=client,
-                path=path,
-                status_code=status,
-                method=method,
-                latency_ms=round(elapsed_ms, 2),
-            )
-
-        return response
+            HTTP_IN_FLIGHT.dec(in_flight_labels)
+            # 例外や切断で最終チャンクまで到達しなかった場合も 1 行は残す。
+            if not logged:
+                log_access()
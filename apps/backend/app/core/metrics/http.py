@@ -0,0 +1,26 @@
+"""
+HTTP リクエストの標準メトリクス
+
+AccessLogMiddleware から記録する。ルートラベルはルートテンプレートを使い、
+未マッチ（404 など）は `unmatched` に丸めて系列数の増加を防ぐ。
+"""
+
+from __future__ import annotations
+
+from app.core.metrics.registry import get_registry
+
+HTTP_REQUESTS = get_registry().counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = get_registry().histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds by method, route and status.",
+    ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = get_registry().gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed by method.",
+    ("method",),
+)
@@ -0,0 +1,158 @@
+"""
+Gunicorn の複数ワーカー間でメトリクスを集約するためのファイル共有
+
+- 各ワーカーは自プロセスのスナップショットを `<dir>/metrics_<pid>.json` へ
+  定期的に書き出す（一時ファイル + rename で原子的に置き換える。
+  定期書き出しとスクレイプが同時に走るため、一時ファイルは書き込みごとに別名）
+- スクレイプを受けたワーカーは、全ファイルを読み込んで合算して返す
+  （自プロセス分の書き出しに失敗しても、メモリ上の値で応答する）
+- counter / histogram は終了済みワーカー分も合算する（単調増加を保つため）
+- gauge は稼働中ワーカー分のみ合算する
+- ディレクトリはコンテナ起動ごとに空にすること（emptyDir などを想定）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from app.core.logging.config import get_logger
+from app.core.metrics.registry import MetricsRegistry
+
+logger = get_logger(__name__)
+
+_FILE_PREFIX = "metrics_"
+
+
+def _snapshot_path(directory: Path, pid: int) -> Path:
+    return directory / f"{_FILE_PREFIX}{pid}.json"
+
+
+def write_snapshot(directory: str, registry: MetricsRegistry) -> None:
+    """
+    自プロセスのスナップショットを書き出す
+
+    Args:
+        directory: 共有ディレクトリ
+        registry: 書き出すレジストリ
+    """
+    base = Path(directory)
+    base.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", prefix=f".{_FILE_PREFIX}{pid}.", dir=base)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(tmp, _snapshot_path(base, pid))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_into(merged: dict[str, Any], snapshot: dict[str, Any], alive: bool) -> None:
+    for name, entry in snapshot.items():
+        if entry["type"] == "gauge" and not alive:
+            continue
+        target = merged.get(name)
+        if target is None:
+            merged[name] = {**entry, "values": dict(entry["values"])}
+            continue
+        values = target["values"]
+        for key, value in entry["values"].items():
+            current = values.get(key)
+            if current is None:
+                values[key] = value
+            elif entry["type"] == "histogram":
+                values[key] = [a + b for a, b in zip(current, value, strict=True)]
+            else:
+                values[key] = current + value
+
+
+def collect_merged(directory: str, registry: MetricsRegistry) -> dict[str, Any]:
+    """
+    自プロセス分を書き出した上で、全ワーカー分を合算したスナップショットを返す
+
+    Args:
+        directory: 共有ディレクトリ
+        registry: 自プロセスのレジストリ
+
+    Returns:
+        dict[str, Any]: 合算済みスナップショット
+    """
+    own_pid: int | None = None
+    merged: dict[str, Any] = {}
+    try:
+        write_snapshot(directory, registry)
+    except OSError:
+        # 共有ディレクトリの不調でスクレイプ自体は失敗させない。
+        # 自プロセス分はメモリ上の値を使い、古いファイルは読まない。
+        logger.warning("metrics_snapshot_write_failed", directory=directory)
+        own_pid = os.getpid()
+        _merge_into(merged, registry.snapshot(), alive=True)
+    for path in sorted(Path(directory).glob(f"{_FILE_PREFIX}*.json")):
+        try:
+            pid = int(path.stem.removeprefix(_FILE_PREFIX))
+            if pid == own_pid:
+                continue
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            # 書き込み途中や不正なファイルは次回のスクレイプに任せる
+            continue
+        _merge_into(merged, snapshot, alive=_pid_alive(pid))
+    return merged
+
+
+class SnapshotFlusher:
+    """
+    一定間隔で自プロセスのスナップショットを書き出すバックグラウンドタスク
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+
+    def start(
+        self, directory: str, registry: MetricsRegistry, interval_sec: float
+    ) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(
+            self._run(directory, registry, interval_sec), name="metrics-flusher"
+        )
+
+    async def stop(self, directory: str, registry: MetricsRegistry) -> None:
+        """
+        タスクを停止し、最終値を書き出す
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        await asyncio.to_thread(write_snapshot, directory, registry)
+
+    async def _run(
+        self, directory: str, registry: MetricsRegistry, interval_sec: float
+    ) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(write_snapshot, directory, registry)
+            except OSError:
+                logger.exception("metrics_flush_failed", directory=directory)
+            await asyncio.sleep(interval_sec)
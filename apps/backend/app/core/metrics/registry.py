@@ -0,0 +1,304 @@
+"""
+プロセス内メトリクスレジストリ（Prometheus / OpenMetrics テキスト形式）
+
+- Counter / Histogram / Gauge を提供する
+- 記録はスレッドごとのシャード（dict）へ書き込み、ロックを取らない
+  （シャード作成時のみロック。集計時に全シャードを合算する）
+- スナップショット（JSON 化可能な dict）を経由して描画するため、
+  複数ワーカーのスナップショットを合算して描画することもできる
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any, Final, Literal
+
+MetricKind = Literal["counter", "histogram", "gauge"]
+Labels = tuple[str, ...]
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+# レイテンシ用の既定バケット（秒）
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Metric(ABC):
+    """
+    メトリクス共通部（スレッド別シャードの管理）
+
+    シャードの合算方法は種類ごとに異なるため、`values` は各サブクラスで実装する。
+    """
+
+    kind: MetricKind
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._shards: list[dict[Labels, Any]] = []
+        self._local = threading.local()
+
+    def _shard(self) -> dict[Labels, Any]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _shard_copies(self) -> list[dict[Labels, Any]]:
+        # dict.copy は GIL 下で原子的に行われるため、書き込み中でも安全に読める
+        with self._lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+
+    @abstractmethod
+    def values(self) -> dict[Labels, Any]:
+        """
+        全シャードを合算した値をラベル組ごとに返す
+        """
+
+
+class Counter(_Metric):
+    """
+    単調増加カウンタ
+    """
+
+    kind: MetricKind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def values(self) -> dict[Labels, Any]:
+        merged: dict[Labels, float] = {}
+        for shard in self._shard_copies():
+            for labels, value in shard.items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+
+class Gauge(_Metric):
+    """
+    増減する値（inc/dec の差分をシャードで合算）または収集時に評価する値
+    """
+
+    kind: MetricKind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        super().__init__(name, documentation, labelnames)
+        self._function: Callable[[], float | Mapping[Labels, float]] | None = None
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set_function(self, fn: Callable[[], float | Mapping[Labels, float]]) -> None:
+        """
+        収集時に `fn()` を評価して値とする（ラベルなしなら float を返す）
+        """
+        self._function = fn
+
+    def values(self) -> dict[Labels, Any]:
+        if self._function is not None:
+            value = self._function()
+            if isinstance(value, Mapping):
+                return dict(value)
+            return {(): float(value)}
+        merged: dict[Labels, float] = {}
+        for shard in self._shard_copies():
+            for labels, value in shard.items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+
+class Histogram(_Metric):
+    """
+    固定バケットのヒストグラム
+
+    シャードにはバケットごとの件数（非累積、末尾が +Inf）と合計値を持つ。
+    """
+
+    kind: MetricKind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._width = len(self.buckets) + 2
+
+    def observe(self, labels: Labels, value: float) -> None:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            row = shard[labels] = [0.0] * self._width
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def values(self) -> dict[Labels, Any]:
+        merged: dict[Labels, list[float]] = {}
+        for shard in self._shard_copies():
+            for labels, row in shard.items():
+                acc = merged.get(labels)
+                if acc is None:
+                    merged[labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        acc[i] += value
+        return merged
+
+
+class MetricsRegistry:
+    """
+    メトリクスの登録と、スナップショット/テキスト形式への変換を行う
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind:
+                    raise ValueError(f"metric {metric.name} already registered")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        現在値を JSON 化可能な dict として返す
+
+        Returns:
+            dict[str, Any]: メトリクス名 → {type, help, labelnames, buckets?, values}
+                values はラベル値の JSON 配列文字列 → 値（histogram は配列）
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot: dict[str, Any] = {}
+        for metric in metrics:
+            entry: dict[str, Any] = {
+                "type": metric.kind,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "values": {
+                    json.dumps(list(labels)): value
+                    for labels, value in metric.values().items()
+                },
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            snapshot[metric.name] = entry
+        return snapshot
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def render_snapshot(snapshot: Mapping[str, Any]) -> str:
+    """
+    スナップショットを Prometheus テキスト形式（0.0.4）へ変換する
+
+    Args:
+        snapshot: `MetricsRegistry.snapshot()` 形式（複数プロセス合算後も可）
+
+    Returns:
+        str: 公開用テキスト
+    """
+    lines: list[str] = []
+    for name in sorted(snapshot):
+        entry = snapshot[name]
+        labelnames: list[str] = entry["labelnames"]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        for key in sorted(entry["values"]):
+            pairs = list(zip(labelnames, json.loads(key), strict=True))
+            value = entry["values"][key]
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                continue
+            cumulative = 0.0
+            bounds = [*entry["buckets"], math.inf]
+            for bound, count in zip(bounds, value[:-1], strict=True):
+                cumulative += count
+                labels = _format_labels([*pairs, ("le", _format_value(bound))])
+                lines.append(f"{name}_bucket{labels} {_format_value(cumulative)}")
+            lines.append(
+                f"{name}_sum{_format_labels(pairs)} {_format_value(value[-1])}"
+            )
+            lines.append(
+                f"{name}_count{_format_labels(pairs)} {_format_value(cumulative)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """
+    プロセス共有のレジストリを返す
+    """
+    return _registry
@@ -0,0 +1,202 @@
+"""
+JWT 署名アルゴリズムの許可リストと、鍵ごとのアルゴリズム固定。
+
+- 対応するのは RS256 / ES256 / EdDSA（Ed25519）のみ
+- アルゴリズムは鍵の種類から決め、鍵ごとに 1 つに固定する
+  （トークンヘッダの alg が鍵のアルゴリズムと異なれば検証しない）
+- JWK に alg の指定があり、鍵の種類と食い違う場合はその鍵を使わない
+- python-jose は EdDSA に対応していないため、cryptography による
+  Ed25519 の鍵クラスを `jwk.register_key` で登録する（本モジュールの読み込み時）
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+from jose.utils import base64url_decode, base64url_encode
+
+RS256: Final[str] = "RS256"
+ES256: Final[str] = "ES256"
+EDDSA: Final[str] = "EdDSA"
+SUPPORTED_ALGORITHMS: Final[tuple[str, ...]] = (RS256, ES256, EDDSA)
+
+# JWK の (kty, crv) から決まるアルゴリズム
+_JWK_ALGORITHMS: Final[Mapping[tuple[str | None, str | None], str]] = {
+    ("RSA", None): RS256,
+    ("EC", "P-256"): ES256,
+    ("OKP", "Ed25519"): EDDSA,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationKey:
+    """
+    アルゴリズムを固定した検証鍵。
+
+    Args:
+        key: python-jose の鍵オブジェクト
+        algorithm: この鍵で受け入れる唯一のアルゴリズム
+    """
+
+    key: Key
+    algorithm: str
+
+
+class Ed25519Key(Key):
+    """
+    EdDSA（Ed25519）の python-jose 鍵クラス。
+
+    PEM、OKP 形式の JWK、cryptography の鍵オブジェクトを受け付ける。
+    秘密鍵の場合は署名もできる（テスト・ベンチマーク用）。
+    """
+
+    def __init__(self, key: Any, algorithm: str) -> None:
+        if algorithm != EDDSA:
+            raise JWKError(f"{algorithm} is not supported by Ed25519 keys")
+        self._algorithm = algorithm
+        if isinstance(key, Mapping):
+            key = self._from_jwk(key)
+        elif isinstance(key, str | bytes):
+            key = _load_pem(key if isinstance(key, bytes) else key.encode())
+        if not isinstance(key, ed25519.Ed25519PublicKey | ed25519.Ed25519PrivateKey):
+            raise JWKError("Ed25519 key is required")
+        self._prepared_key = key
+
+    @staticmethod
+    def _from_jwk(data: Mapping[str, Any]) -> ed25519.Ed25519PublicKey:
+        if data.get("kty") != "OKP" or data.get("crv") != "Ed25519":
+            raise JWKError("OKP Ed25519 JWK is required")
+        try:
+            raw = base64url_decode(str(data["x"]).encode())
+            return ed25519.Ed25519PublicKey.from_public_bytes(raw)
+        except (KeyError, ValueError) as exc:
+            raise JWKError("Ed25519 JWK is malformed") from exc
+
+    def _public(self) -> ed25519.Ed25519PublicKey:
+        key = self._prepared_key
+        if isinstance(key, ed25519.Ed25519PrivateKey):
+            return key.public_key()
+        return key
+
+    def sign(self, msg: bytes) -> bytes:
+        key = self._prepared_key
+        if not isinstance(key, ed25519.Ed25519PrivateKey):
+            raise JWKError("Ed25519 public key cannot sign")
+        return key.sign(msg)
+
+    def verify(self, msg: bytes, sig: bytes) -> bool:
+        try:
+            self._public().verify(sig, msg)
+        except InvalidSignature:
+            return False
+        return True
+
+    def public_key(self) -> Ed25519Key:
+        return Ed25519Key(self._public(), self._algorithm)
+
+    def to_pem(self) -> bytes:
+        return self._public().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+    def to_dict(self) -> dict[str, str]:
+        raw = self._public().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        return {
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "alg": self._algorithm,
+            "x": base64url_encode(raw).decode(),
+        }
+
+
+jwk.register_key(EDDSA, Ed25519Key)
+
+
+def _load_pem(data: bytes) -> Any:
+    try:
+        if data.lstrip().startswith(b"-----BEGIN CERTIFICATE-----"):
+            return x509.load_pem_x509_certificate(data).public_key()
+        try:
+            return serialization.load_pem_public_key(data)
+        except ValueError:
+            return serialization.load_pem_private_key(data, password=None)
+    except (ValueError, TypeError) as exc:
+        raise JWKError("PEM key is malformed") from exc
+
+
+def _algorithm_for(public_key: Any) -> str | None:
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return RS256
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return ES256
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return EDDSA
+    return None
+
+
+def _pin(algorithm: str | None, allowed: Collection[str]) -> str:
+    if algorithm is None:
+        raise JWKError("key type is not supported (RSA, EC P-256 or Ed25519)")
+    if algorithm not in allowed:
+        raise JWKError(f"{algorithm} is not in the allowed algorithms")
+    return algorithm
+
+
+def key_from_pem(pem: str, allowed: Collection[str]) -> VerificationKey:
+    """
+    PEM（公開鍵または証明書）から、アルゴリズムを固定した検証鍵を作る。
+
+    Args:
+        pem: PEM 文字列
+        allowed: 許可するアルゴリズム
+
+    Returns:
+        VerificationKey: 検証鍵
+
+    Raises:
+        JWKError: 解析できない、または許可されていない鍵の場合
+    """
+    loaded = _load_pem(pem.encode())
+    if hasattr(loaded, "private_bytes"):
+        # 秘密鍵が渡されても、保持するのは公開鍵だけにする
+        loaded = loaded.public_key()
+    algorithm = _pin(_algorithm_for(loaded), allowed)
+    return VerificationKey(jwk.construct(loaded, algorithm), algorithm)
+
+
+def key_from_jwk(data: Mapping[str, Any], allowed: Collection[str]) -> VerificationKey:
+    """
+    JWK から、アルゴリズムを固定した検証鍵を作る。
+
+    Args:
+        data: JWK（dict）
+        allowed: 許可するアルゴリズム
+
+    Returns:
+        VerificationKey: 検証鍵
+
+    Raises:
+        JWKError: 解析できない、alg が鍵の種類と食い違う、
+            または許可されていない鍵の場合
+    """
+    kty = data.get("kty")
+    derived = _JWK_ALGORITHMS.get((kty, None if kty == "RSA" else data.get("crv")))
+    declared = data.get("alg")
+    if declared is not None and declared != derived:
+        raise JWKError(f"alg {declared} does not match the key type")
+    algorithm = _pin(derived, allowed)
+    return VerificationKey(jwk.construct(dict(data), algorithm), algorithm)
@@ -1,21 +1,44 @@
 """
 API保護で使うJWT認証関数。
+
+- 検証鍵は初回利用時（通常は起動時の `validate_public_key`）に一度だけ解析し、
+  鍵オブジェクトとしてキャッシュする（リクエストごとに PEM を解析しない）
+- 検証済みトークンは ApiTokenPrincipal としてキャッシュし、同じトークンの
+  再利用時は署名検証を省略する（寿命はトークンの exp を超えない）
+- キャッシュミス時の署名検証は、設定により専用スレッドプールで実行する
+- JWT_JWKS_SOURCE を指定した場合は、JWKS から kid で検証鍵を引く
+  （鍵の取得はバックグラウンドで行い、リクエスト処理中は未知の kid のときだけ）
+- 署名アルゴリズムは JWT_ALGORITHMS の許可リストに限り、鍵の種類から決めた
+  1 つに鍵ごとに固定する（トークンヘッダの alg が異なれば拒否する）
 """
 
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Final
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JOSEError, JWTError, jwt
+from jose import JOSEError, JWTError, jws, jwt
 
+from app.core.security.algorithms import VerificationKey, key_from_pem
+from app.core.security.jwks import JWKS_KEYS, JwksKeyStore
+from app.core.security.offload import (
+    VERIFY_IN_FLIGHT,
+    VERIFY_QUEUE_DEPTH,
+    VerificationOffloader,
+)
+from app.core.security.token_cache import (
+    TOKEN_CACHE_ENTRIES,
+    VerifiedTokenCache,
+    token_digest,
+)
 from app.core.settings import get_settings
 
 bearer_scheme = HTTPBearer(auto_error=False)
-JWT_ALGORITHM = "RS256"
 
 
 @dataclass(frozen=True, slots=True)
@@ -39,25 +62,203 @@ def unauthorized(detail: str) -> HTTPException:
     )
 
 
-def _to_datetime(value: Any) -> datetime:
-    if not isinstance(value, (int, float)):
+# クレーム名 -> (ApiTokenPrincipal のフィールド位置, 受け付ける型, 型不一致で拒否するか)
+# 拒否しないクレームは、型が合わなければ None として扱う
+_CLAIMS: Final[Mapping[str, tuple[int, type | tuple[type, ...], bool]]] = {
+    "sub": (0, str, True),
+    "email": (1, str, False),
+    "name": (2, str, False),
+    "email_verified": (3, bool, False),
+    "active_organization_id": (4, str, False),
+    "organization_role": (5, str, False),
+    "exp": (6, (int, float), True),
+    "iss": (7, str, False),
+    "aud": (8, (str, list), True),
+}
+_SUBJECT: Final[int] = 0
+_EXPIRES_AT: Final[int] = 6
+_PRINCIPAL_FIELDS: Final[int] = 9
+
+
+def _principal_from_claims(payload: Mapping[str, Any]) -> ApiTokenPrincipal:
+    """
+    検証済みペイロードを 1 回走査し、ApiTokenPrincipal を組み立てる。
+
+    sub / exp / aud の型が不正なら、その時点で 401 を送出する。
+    """
+    values: list[Any] = [None] * _PRINCIPAL_FIELDS
+    for claim, value in payload.items():
+        spec = _CLAIMS.get(claim)
+        if spec is None:
+            continue
+        index, types, strict = spec
+        if isinstance(value, types):
+            values[index] = value
+        elif strict and value is not None:
+            raise unauthorized("Invalid token payload")
+
+    subject = values[_SUBJECT]
+    expires_at = values[_EXPIRES_AT]
+    if subject is None or not subject.strip() or expires_at is None:
         raise unauthorized("Invalid token payload")
-    return datetime.fromtimestamp(value, tz=UTC)
+    values[_EXPIRES_AT] = datetime.fromtimestamp(expires_at, tz=UTC)
+    return ApiTokenPrincipal(*values)
 
 
-def _decode_api_token(token: str) -> dict[str, Any]:
+def _public_key_pem() -> str:
     settings = get_settings()
     if not settings.jwt_public_key:
         raise RuntimeError("JWT_PUBLIC_KEY is not set")
-    public_key = settings.jwt_public_key.replace("\\n", "\n").strip()
+    return settings.jwt_public_key.replace("\\n", "\n").strip()
+
+
+@lru_cache(maxsize=1)
+def _verification_key() -> VerificationKey:
+    """
+    検証鍵を解析し、アルゴリズムを固定した鍵オブジェクトとしてキャッシュする。
+
+    解析に失敗した場合（許可リストにない鍵の種類を含む）は例外を送出し、
+    キャッシュしない。
+    """
+    try:
+        return key_from_pem(_public_key_pem(), get_settings().jwt_algorithms)
+    except JOSEError as exc:
+        raise RuntimeError("JWT verification key is invalid") from exc
+
+
+def validate_public_key() -> None:
+    """
+    JWT 検証鍵が設定済みで、解析可能であることを確認する。
+
+    起動時に呼び、鍵の設定不備をリクエスト到達前に検出する。
+    解析済みの鍵はそのままキャッシュされ、以降の検証で再利用される。
+    """
+    _verification_key()
+
+
+@lru_cache(maxsize=1)
+def get_jwks_store() -> JwksKeyStore | None:
+    """
+    JWT_JWKS_SOURCE 指定時だけ JWKS の鍵ストアを生成する（単一インスタンス）。
+    """
+    settings = get_settings()
+    if not settings.jwt_jwks_source:
+        return None
+    store = JwksKeyStore(
+        settings.jwt_jwks_source,
+        allowed_algorithms=settings.jwt_algorithms,
+        min_refetch_sec=settings.jwt_jwks_min_refetch_sec,
+        timeout_sec=settings.jwt_jwks_timeout_sec,
+    )
+    JWKS_KEYS.set_function(lambda: float(len(store)))
+    return store
+
+
+async def load_verification_keys(
+    on_loaded: Callable[[], None] | None = None,
+) -> None:
+    """
+    検証鍵を読み込む（起動時に呼ぶ）。
+
+    JWKS 指定時は初回取得を行い、その成否にかかわらず定期再取得を開始する
+    （初回に失敗しても、後続の取得で回復できるようにする）。
+    未指定時は JWT_PUBLIC_KEY を解析する。
+
+    Args:
+        on_loaded: JWKS の鍵を読み込むたびに呼ぶ関数
+            （初回失敗後の回復も含む。JWT_PUBLIC_KEY では呼ばない）
+
+    Raises:
+        RuntimeError: 検証鍵を読み込めない場合
+    """
+    store = get_jwks_store()
+    if store is None:
+        validate_public_key()
+        return
+    store.set_on_loaded(on_loaded)
+    try:
+        await store.refresh("startup")
+    except Exception as exc:
+        raise RuntimeError("JWKS could not be loaded") from exc
+    finally:
+        store.start(get_settings().jwt_jwks_refresh_sec)
+
+
+async def stop_key_refresh() -> None:
+    """
+    JWKS の定期再取得を停止する（未使用なら何もしない）。
+    """
+    if get_jwks_store.cache_info().currsize == 0:
+        return
+    store = get_jwks_store()
+    if store is not None:
+        await store.stop()
+
+
+@lru_cache(maxsize=1)
+def get_token_cache() -> VerifiedTokenCache[ApiTokenPrincipal]:
+    """
+    設定に従って検証済みトークンのキャッシュを生成する（単一インスタンス）。
+    """
+    settings = get_settings()
+    cache: VerifiedTokenCache[ApiTokenPrincipal] = VerifiedTokenCache(
+        max_entries=settings.jwt_cache_max_entries,
+        ttl_sec=settings.jwt_cache_ttl_sec,
+    )
+    TOKEN_CACHE_ENTRIES.set_function(lambda: float(len(cache)))
+    return cache
+
+
+@lru_cache(maxsize=1)
+def get_verify_offloader() -> VerificationOffloader | None:
+    """
+    JWT_VERIFY_MODE=thread のときだけ検証用スレッドプールを生成する。
+    """
+    settings = get_settings()
+    if settings.jwt_verify_mode != "thread":
+        return None
+    offloader = VerificationOffloader(settings.jwt_verify_max_workers)
+    VERIFY_QUEUE_DEPTH.set_function(lambda: float(offloader.waiting))
+    VERIFY_IN_FLIGHT.set_function(lambda: float(offloader.running))
+    return offloader
+
+
+def shutdown_verify_offloader() -> None:
+    """
+    検証用スレッドプールを停止する（未生成なら何もしない）。
+    """
+    if get_verify_offloader.cache_info().currsize == 0:
+        return
+    offloader = get_verify_offloader()
+    if offloader is not None:
+        offloader.shutdown()
+    get_verify_offloader.cache_clear()
+
+
+async def _resolve_key(token: str) -> VerificationKey:
+    store = get_jwks_store()
+    if store is None:
+        return _verification_key()
+    try:
+        kid = jws.get_unverified_header(token).get("kid")
+    except JOSEError as exc:
+        raise unauthorized("Invalid or expired token") from exc
+    key = await store.resolve(kid if isinstance(kid, str) else None)
+    if key is None:
+        raise unauthorized("Unknown signing key")
+    return key
+
+
+def _decode_api_token(token: str, key: VerificationKey) -> dict[str, Any]:
+    settings = get_settings()
 
     options = {"verify_aud": bool(settings.jwt_audience)}
 
     try:
         payload = jwt.decode(
             token,
-            public_key,
-            algorithms=[JWT_ALGORITHM],
+            key.key,
+            algorithms=[key.algorithm],
             issuer=settings.jwt_issuer,
             audience=settings.jwt_audience,
             options=options,
@@ -73,6 +274,18 @@ def _decode_api_token(token: str) -> dict[str, Any]:
     return payload
 
 
+def _verify_principal(token: str, key: VerificationKey) -> ApiTokenPrincipal:
+    return _principal_from_claims(_decode_api_token(token, key))
+
+
+async def _verify(token: str) -> ApiTokenPrincipal:
+    key = await _resolve_key(token)
+    offloader = get_verify_offloader()
+    if offloader is None:
+        return _verify_principal(token, key)
+    return await offloader.run(_verify_principal, token, key)
+
+
 async def get_current_principal(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
 ) -> ApiTokenPrincipal:
@@ -82,40 +295,14 @@ async def get_current_principal(
     if (credentials.scheme or "").lower() != "bearer":
         raise unauthorized("Invalid authentication scheme")
 
-    payload = _decode_api_token(credentials.credentials)
+    token = credentials.credentials
+    cache = get_token_cache()
+    if not cache.enabled:
+        return await _verify(token)
 
-    subject = payload.get("sub")
-    if not isinstance(subject, str) or not subject.strip():
-        raise unauthorized("Invalid token payload")
-
-    expires_at = _to_datetime(payload.get("exp"))
-
-    audience = payload.get("aud")
-    if audience is not None and not isinstance(audience, (str, list)):
-        raise unauthorized("Invalid token payload")
-
-    return ApiTokenPrincipal(
-        user_id=subject,
-        user_email=payload.get("email")
-        if isinstance(payload.get("email"), str)
-        else None,
-        user_name=payload.get("name") if isinstance(payload.get("name"), str) else None,
-        email_verified=(
-            payload.get("email_verified")
-            if isinstance(payload.get("email_verified"), bool)
-            else None
-        ),
-        active_organization_id=(
-            payload.get("active_organization_id")
-            if isinstance(payload.get("active_organization_id"), str)
-            else None
-        ),
-        organization_role=(
-            payload.get("organization_role")
-            if isinstance(payload.get("organization_role"), str)
-            else None
-        ),
-        expires_at=expires_at,
-        issuer=payload.get("iss") if isinstance(payload.get("iss"), str) else None,
-        audience=audience,
-    )
+    key = token_digest(token)
+    principal = cache.get(key)
+    if principal is None:
+        principal = await _verify(token)
+        cache.put(key, principal, not_after=principal.expires_at.timestamp())
+    return principal
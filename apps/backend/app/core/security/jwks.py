@@ -0,0 +1,306 @@
+"""
+JWKS による JWT 検証鍵の解決。
+
+- JWT_JWKS_SOURCE にファイルパス、または http(s) URL を指定する
+- 鍵は kid をキーにした dict で保持し、検証時は O(1) で引く
+  （更新時は dict ごと差し替え、参照中の dict は変更しない）
+- バックグラウンドで定期的に再取得する
+  - HTTP: ETag / Last-Modified による条件付き取得（304 なら解析しない）
+  - ファイル: 更新時刻が変わったときだけ読み直す
+- リクエスト処理中に取得するのは未知の kid を受けたときだけで、
+  最小間隔で制限し、同時に来た要求は 1 回の取得にまとめる
+- 取得に失敗しても、手元の鍵で検証を続ける
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from typing import Final
+
+from jose import JOSEError
+
+from app.core.logging.config import get_logger
+from app.core.metrics import get_registry
+from app.core.security.algorithms import VerificationKey, key_from_jwk
+
+logger = get_logger(__name__)
+
+_HTTP_SCHEMES: Final[tuple[str, ...]] = ("http://", "https://")
+
+JWKS_REFRESHES = get_registry().counter(
+    "auth_jwks_refreshes_total",
+    "JWKS fetches by trigger and result.",
+    ("trigger", "result"),
+)
+JWKS_KEYS = get_registry().gauge(
+    "auth_jwks_keys",
+    "Signing keys currently loaded from the JWKS source.",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class JwksFetch:
+    """
+    JWKS の取得結果。
+
+    Args:
+        document: 取得した JWKS（未変更なら None）
+        etag: 次回の If-None-Match に使う値
+        last_modified: 次回の If-Modified-Since に使う値
+            （ファイルの場合は更新時刻）
+    """
+
+    document: bytes | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def parse_jwks(
+    document: bytes, allowed_algorithms: Collection[str]
+) -> dict[str, VerificationKey]:
+    """
+    JWKS を解析し、kid をキーにした鍵の dict を返す。
+
+    署名用でない鍵（use が sig 以外）、kid のない鍵、許可されていない
+    アルゴリズムの鍵は読み飛ばす。
+
+    Args:
+        document: JWKS（JSON）
+        allowed_algorithms: 許可するアルゴリズム
+
+    Returns:
+        dict[str, VerificationKey]: kid -> アルゴリズムを固定した検証鍵
+
+    Raises:
+        ValueError: JWKS として解釈できない、または使える鍵がない場合
+    """
+    try:
+        entries = json.loads(document)["keys"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("JWKS document is malformed") from exc
+    if not isinstance(entries, list):
+        raise ValueError("JWKS document is malformed")
+
+    keys: dict[str, VerificationKey] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        kid = entry.get("kid")
+        if not isinstance(kid, str) or entry.get("use", "sig") != "sig":
+            continue
+        try:
+            keys[kid] = key_from_jwk(entry, allowed_algorithms)
+        except JOSEError as exc:
+            logger.warning("jwks_key_skipped", kid=kid, reason=str(exc))
+    if not keys:
+        # 空の鍵集合で差し替えると全トークンが拒否されるため、失敗として扱う
+        raise ValueError("JWKS document has no usable signing keys")
+    return keys
+
+
+def fetch_jwks(
+    source: str,
+    etag: str | None,
+    last_modified: str | None,
+    timeout_sec: float,
+) -> JwksFetch:
+    """
+    JWKS をファイルまたは URL から取得する（同期 I/O）。
+
+    Args:
+        source: ファイルパス、または http(s) URL
+        etag: 前回取得時の ETag
+        last_modified: 前回取得時の Last-Modified（ファイルは更新時刻）
+        timeout_sec: HTTP のタイムアウト（秒）
+
+    Returns:
+        JwksFetch: 取得結果（未変更なら document は None）
+    """
+    if not source.startswith(_HTTP_SCHEMES):
+        mtime = str(os.stat(source).st_mtime_ns)
+        if mtime == last_modified:
+            return JwksFetch(None, etag, last_modified)
+        with open(source, "rb") as file:
+            return JwksFetch(file.read(), None, mtime)
+
+    request = urllib.request.Request(source, headers={"Accept": "application/json"})
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout_sec) as response:
+            return JwksFetch(
+                response.read(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return JwksFetch(None, etag, last_modified)
+        raise
+
+
+class JwksKeyStore:
+    """
+    JWKS から読み込んだ検証鍵を kid で引けるように保持する。
+
+    Args:
+        source: ファイルパス、または http(s) URL
+        allowed_algorithms: 許可するアルゴリズム
+        min_refetch_sec: 未知の kid による再取得の最小間隔（秒）
+        timeout_sec: HTTP のタイムアウト（秒）
+        clock: 単調増加する現在時刻（秒）を返す関数
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        allowed_algorithms: Collection[str],
+        min_refetch_sec: float,
+        timeout_sec: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._source = source
+        self._allowed_algorithms = tuple(allowed_algorithms)
+        self._min_refetch_sec = min_refetch_sec
+        self._timeout_sec = timeout_sec
+        self._clock = clock
+        self._keys: dict[str, VerificationKey] = {}
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_attempt = -math.inf
+        self._inflight: asyncio.Task[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._on_loaded: Callable[[], None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set_on_loaded(self, callback: Callable[[], None] | None) -> None:
+        """
+        鍵を読み込むたびに呼ぶ関数を設定する（初回取得の失敗後の回復検知に使う）。
+
+        Args:
+            callback: 鍵の差し替え後に呼ぶ関数（None で解除）
+        """
+        self._on_loaded = callback
+
+    def get(self, kid: str | None) -> VerificationKey | None:
+        """
+        手元の鍵だけを引く（取得は行わない）。
+
+        kid のないトークンは、鍵が 1 つだけの場合に限りその鍵を返す。
+        """
+        keys = self._keys
+        if kid is None:
+            return next(iter(keys.values())) if len(keys) == 1 else None
+        return keys.get(kid)
+
+    async def resolve(self, kid: str | None) -> VerificationKey | None:
+        """
+        kid に対応する鍵を返す（未知なら最小間隔を守って再取得する）。
+
+        Args:
+            kid: トークンヘッダの kid
+
+        Returns:
+            VerificationKey | None: 鍵（再取得後も見つからなければ None）
+        """
+        key = self.get(kid)
+        if key is not None:
+            return key
+        inflight = self._inflight
+        if inflight is None and (
+            self._clock() - self._last_attempt < self._min_refetch_sec
+        ):
+            JWKS_REFRESHES.inc(("unknown_kid", "rate_limited"))
+            return None
+        try:
+            await self.refresh("unknown_kid")
+        except Exception:
+            logger.warning("jwks_refresh_failed", trigger="unknown_kid", exc_info=True)
+        return self.get(kid)
+
+    async def refresh(self, trigger: str = "scheduled") -> None:
+        """
+        JWKS を取得する（実行中の取得があれば、その完了を待つ）。
+
+        Raises:
+            Exception: 取得・解析に失敗した場合（手元の鍵は維持する）
+        """
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._refresh(trigger))
+            self._inflight.add_done_callback(self._clear_inflight)
+        await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, task: asyncio.Task[None]) -> None:
+        if self._inflight is task:
+            self._inflight = None
+
+    async def _refresh(self, trigger: str) -> None:
+        self._last_attempt = self._clock()
+        try:
+            fetched = await asyncio.to_thread(
+                fetch_jwks,
+                self._source,
+                self._etag,
+                self._last_modified,
+                self._timeout_sec,
+            )
+            if fetched.document is None:
+                JWKS_REFRESHES.inc((trigger, "not_modified"))
+                return
+            keys = parse_jwks(fetched.document, self._allowed_algorithms)
+        except Exception:
+            JWKS_REFRESHES.inc((trigger, "error"))
+            raise
+        self._keys = keys
+        self._etag = fetched.etag
+        self._last_modified = fetched.last_modified
+        JWKS_REFRESHES.inc((trigger, "updated"))
+        logger.info("jwks_loaded", trigger=trigger, kids=sorted(keys))
+        if self._on_loaded is not None:
+            self._on_loaded()
+
+    def start(self, interval_sec: float) -> None:
+        """
+        定期再取得を開始する（二重起動しない）。
+
+        Args:
+            interval_sec: 再取得の間隔（秒）
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval_sec))
+
+    async def stop(self) -> None:
+        """
+        定期再取得を停止する。
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, interval_sec: float) -> None:
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                await self.refresh("scheduled")
+            except Exception:
+                logger.warning(
+                    "jwks_refresh_failed", trigger="scheduled", exc_info=True
+                )
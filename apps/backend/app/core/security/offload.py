@@ -0,0 +1,132 @@
+"""
+JWT 署名検証のスレッドプールへのオフロード。
+
+- RS256 などの署名検証は CPU 処理で、イベントループ上で実行すると
+  バースト時に全リクエストが検証待ちで直列化する
+- cryptography は検証中に GIL を解放するため、専用のスレッドプールで
+  並列に実行できる
+- 同時実行数はワーカー数で制限し、枠待ちの件数（キュー深さ）と
+  待ち時間をメトリクスで公開する
+- 専用プールを使い、同期エンドポイント用の既定スレッドプールと
+  枠を奪い合わないようにする
+- 呼び出し元がキャンセルされても、枠はワーカーでの実行が終わるまで解放しない
+  （切断が続いても同時実行数が上限を超えないようにする）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Final, TypeVar, TypeVarTuple
+
+from app.core.metrics import get_registry
+
+R = TypeVar("R")
+Ts = TypeVarTuple("Ts")
+
+_WAIT_BUCKETS: Final[tuple[float, ...]] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+)
+
+VERIFY_QUEUE_DEPTH = get_registry().gauge(
+    "auth_verify_queue_depth",
+    "Token verifications waiting for a worker slot.",
+)
+VERIFY_IN_FLIGHT = get_registry().gauge(
+    "auth_verify_in_flight",
+    "Token verifications currently running on the worker pool.",
+)
+VERIFY_QUEUE_WAIT = get_registry().histogram(
+    "auth_verify_queue_wait_seconds",
+    "Time spent waiting for a verification worker slot.",
+    (),
+    _WAIT_BUCKETS,
+)
+
+
+class VerificationOffloader:
+    """
+    署名検証を同時実行数の上限付きでスレッドプールへ送る。
+
+    Args:
+        max_workers: ワーカースレッド数（= 同時実行数の上限）
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="jwt-verify"
+        )
+        self._max_workers = max_workers
+        self._slots: asyncio.Semaphore | None = None
+        self._waiting = 0
+        self._running = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    async def run(self, fn: Callable[[*Ts], R], *args: *Ts) -> R:
+        """
+        空き枠を待ってから、ワーカースレッドで fn(*args) を実行する。
+
+        Args:
+            fn: 実行する同期関数
+            args: fn へ渡す引数
+
+        Returns:
+            R: fn の戻り値（例外はそのまま送出される）
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_workers)
+        slots = self._slots
+
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+        VERIFY_QUEUE_WAIT.observe((), time.perf_counter() - started)
+
+        self._running += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release(slots)
+            raise
+        loop = asyncio.get_running_loop()
+
+        def on_done(_: Future[R]) -> None:
+            # 完了はワーカースレッドから通知されるため、解放はループへ渡す。
+            # 終了処理でループが閉じていれば解放は不要。
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._release, slots)
+
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, slots: asyncio.Semaphore) -> None:
+        self._running -= 1
+        slots.release()
+
+    def shutdown(self) -> None:
+        """
+        ワーカースレッドを停止する（未開始の処理は取り消す）。
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,127 @@
+"""
+検証済みトークンのキャッシュ。
+
+- フロントエンドは有効期限 5 分の API トークンを発行し、同じトークンを
+  複数のリクエストで使い回す。検証済みの結果（ApiTokenPrincipal）を
+  トークンのダイジェストをキーに保持し、署名検証を省略する
+- エントリの寿命は TTL とトークンの `exp` の早い方（期限切れは即座に拒否する）
+- 件数上限を超えたら最も古く使われたエントリから追い出す（LRU）
+- 検証に失敗したトークンはキャッシュしない
+- イベントループ上からのみ使う前提でロックは持たない
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Final, Generic, TypeVar
+
+from app.core.metrics import get_registry
+
+T = TypeVar("T")
+
+_DIGEST_SIZE: Final[int] = 16
+
+TOKEN_CACHE_LOOKUPS = get_registry().counter(
+    "auth_token_cache_lookups_total",
+    "Verified-token cache lookups by result (hit or miss).",
+    ("result",),
+)
+TOKEN_CACHE_EVICTIONS = get_registry().counter(
+    "auth_token_cache_evictions_total",
+    "Verified-token cache evictions by reason (capacity or expired).",
+    ("reason",),
+)
+TOKEN_CACHE_ENTRIES = get_registry().gauge(
+    "auth_token_cache_entries",
+    "Entries currently held in the verified-token cache.",
+)
+
+
+def token_digest(token: str) -> bytes:
+    """
+    トークン文字列からキャッシュキーを作る（トークン本体は保持しない）。
+
+    Args:
+        token: Bearer トークン
+
+    Returns:
+        bytes: 16 バイトのダイジェスト
+    """
+    return hashlib.blake2b(token.encode(), digest_size=_DIGEST_SIZE).digest()
+
+
+class VerifiedTokenCache(Generic[T]):
+    """
+    件数上限と寿命付きの LRU キャッシュ。
+
+    Args:
+        max_entries: 最大件数（0 でキャッシュ無効）
+        ttl_sec: エントリの最大寿命（秒）
+        clock: 現在時刻（UNIX 秒）を返す関数
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_sec: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_sec = ttl_sec
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[float, T]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> T | None:
+        """
+        有効なエントリを返す（期限切れは削除して None を返す）。
+
+        Args:
+            key: token_digest で作ったキー
+
+        Returns:
+            T | None: キャッシュ済みの値
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            TOKEN_CACHE_LOOKUPS.inc(("miss",))
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            TOKEN_CACHE_EVICTIONS.inc(("expired",))
+            TOKEN_CACHE_LOOKUPS.inc(("miss",))
+            return None
+        self._entries.move_to_end(key)
+        TOKEN_CACHE_LOOKUPS.inc(("hit",))
+        return value
+
+    def put(self, key: bytes, value: T, not_after: float) -> None:
+        """
+        エントリを追加する（寿命は TTL と not_after の早い方）。
+
+        Args:
+            key: token_digest で作ったキー
+            value: キャッシュする値
+            not_after: この時刻（UNIX 秒）以降は無効（トークンの exp）
+        """
+        if not self.enabled:
+            return
+        expires_at = min(self._clock() + self._ttl_sec, not_after)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            TOKEN_CACHE_EVICTIONS.inc(("capacity",))
+
+    def clear(self) -> None:
+        self._entries.clear()
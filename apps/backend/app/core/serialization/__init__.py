@@ -0,0 +1,13 @@
+from app.core.serialization.json_codec import (
+    JsonBackend,
+    get_log_serializer,
+    get_response_class,
+    resolve_json_backend,
+)
+
+__all__ = [
+    "JsonBackend",
+    "get_log_serializer",
+    "get_response_class",
+    "resolve_json_backend",
+]
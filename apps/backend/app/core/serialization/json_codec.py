@@ -0,0 +1,95 @@
+"""
+JSON シリアライザの切り替え（stdlib / orjson）
+
+- orjson はオプション依存（`fast-json` extra）。未導入時は stdlib にフォールバックする
+- structlog のレンダラと FastAPI の既定レスポンスクラスで同じバックエンドを使う
+- datetime は stdlib と同じ扱いに揃える
+  （orjson の独自 ISO 変換は使わず、ログでは repr、レスポンスでは型エラー）
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any, Final, Literal
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - extra 未導入環境
+    orjson = None
+
+JsonBackend = Literal["auto", "orjson", "stdlib"]
+
+_ORJSON_MISSING: Final[str] = "orjson is not installed (install the fast-json extra)"
+
+# datetime は default ハンドラへ回し、キーは stdlib と同様に文字列化する
+_ORJSON_OPTIONS: Final[int] = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+
+def resolve_json_backend(preferred: JsonBackend) -> Literal["orjson", "stdlib"]:
+    """
+    設定値から実際に使うバックエンドを決める
+
+    Args:
+        preferred: 設定値（auto は orjson が導入済みなら orjson）
+
+    Returns:
+        Literal["orjson", "stdlib"]: 利用するバックエンド
+    """
+    if preferred == "stdlib" or orjson is None:
+        return "stdlib"
+    return "orjson"
+
+
+def _orjson_log_dumps(obj: Any, **kw: Any) -> str:
+    # structlog は `default=` にフォールバック関数を渡す（stdlib と同じ関数を使う）
+    if orjson is None:
+        raise RuntimeError(_ORJSON_MISSING)
+    return orjson.dumps(obj, default=kw.get("default"), option=_ORJSON_OPTIONS).decode()
+
+
+def get_log_serializer(backend: JsonBackend) -> Callable[..., str]:
+    """
+    structlog の JSONRenderer に渡すシリアライザを返す
+
+    Args:
+        backend: 設定値
+
+    Returns:
+        Callable[..., str]: `json.dumps` 互換のシリアライザ
+    """
+    if resolve_json_backend(backend) == "orjson":
+        return _orjson_log_dumps
+    return json.dumps
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjson でボディを生成する JSONResponse
+
+    出力は Starlette の JSONResponse（区切り文字なし・非 ASCII そのまま）と同一。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            raise RuntimeError(_ORJSON_MISSING)
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def get_response_class(backend: JsonBackend) -> type[JSONResponse]:
+    """
+    FastAPI の `default_response_class` に使うレスポンスクラスを返す
+
+    Args:
+        backend: 設定値
+
+    Returns:
+        type[JSONResponse]: orjson 版または Starlette 標準の JSONResponse
+    """
+    if resolve_json_backend(backend) == "orjson":
+        return ORJSONResponse
+    return JSONResponse
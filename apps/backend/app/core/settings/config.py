@@ -64,6 +64,64 @@ class AppSettings(BaseSettings):
         validation_alias="API_LOG_LEVEL",
     )
 
+    # ログ書き込みキュー（stdout への書き込みを別スレッドでまとめて行う）
+    api_log_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        validation_alias="API_LOG_QUEUE_SIZE",
+    )
+    api_log_overflow: Literal["drop_oldest", "block"] = Field(
+        default="drop_oldest",
+        validation_alias="API_LOG_OVERFLOW",
+    )
+    api_log_batch_size: int = Field(
+        default=256,
+        ge=1,
+        validation_alias="API_LOG_BATCH_SIZE",
+    )
+
+    # アクセスログのサンプリング（非 2xx と遅いリクエストは常に出力）
+    access_log_sample_rate: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        validation_alias="ACCESS_LOG_SAMPLE_RATE",
+    )
+    # ルートテンプレートごとの率（JSON 例: {"/backend/v1/sample": 0.1}）
+    access_log_route_sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        validation_alias="ACCESS_LOG_ROUTE_SAMPLE_RATES",
+    )
+    # これ以上のレイテンシは WARNING で必ず出力（0 で無効）
+    access_log_slow_ms: float = Field(
+        default=1000.0,
+        ge=0,
+        validation_alias="ACCESS_LOG_SLOW_MS",
+    )
+    # 正常応答を出力しないパス（JSON 配列）
+    access_log_exclude_paths: list[str] = Field(
+        default_factory=lambda: ["/livez", "/readyz", "/metrics"],
+        validation_alias="ACCESS_LOG_EXCLUDE_PATHS",
+    )
+
+    # ---- Metrics ----
+    # 設定時は Gunicorn の全ワーカー分をこのディレクトリ経由で集約する
+    metrics_multiproc_dir: str | None = Field(
+        default=None,
+        validation_alias="METRICS_MULTIPROC_DIR",
+    )
+    metrics_flush_interval_sec: float = Field(
+        default=5.0,
+        gt=0,
+        validation_alias="METRICS_FLUSH_INTERVAL_SEC",
+    )
+
+    # JSON シリアライザ（auto は orjson 導入済みなら orjson を使う）
+    json_backend: Literal["auto", "orjson", "stdlib"] = Field(
+        default="auto",
+        validation_alias="JSON_BACKEND",
+    )
+
     service_name: str = Field(
         default="3pull-api",
         validation_alias="SERVICE_NAME",
@@ -75,12 +133,163 @@ class AppSettings(BaseSettings):
         validation_alias="API_PORT",
     )
 
+    # ---- Shutdown drain ----
+    # SIGTERM からサーバの受付停止までの猶予（エンドポイント除外の伝播待ち）
+    api_drain_delay_sec: float = Field(
+        default=5.0,
+        ge=0,
+        validation_alias="API_DRAIN_DELAY_SEC",
+    )
+    # 終了時に処理中リクエストの完了を待つ上限
+    api_drain_timeout_sec: float = Field(
+        default=20.0,
+        ge=0,
+        validation_alias="API_DRAIN_TIMEOUT_SEC",
+    )
+
     # ---- Databases ----
     database_url: str | None = Field(
         default=None,
         validation_alias="DATABASE_URL",
     )
 
+    # 読み取りレプリカ（JSON 配列。未設定なら読み取りもプライマリへ）
+    database_replica_urls: list[str] = Field(
+        default_factory=list,
+        validation_alias="DATABASE_REPLICA_URLS",
+    )
+    db_replica_selection: Literal["round_robin", "least_loaded"] = Field(
+        default="round_robin",
+        validation_alias="DB_REPLICA_SELECTION",
+    )
+    # 接続失敗したレプリカを振り分け対象から外す秒数
+    db_replica_eject_sec: float = Field(
+        default=30.0,
+        ge=0,
+        validation_alias="DB_REPLICA_EJECT_SEC",
+    )
+
+    # コネクションプール（ワーカー数 × (pool_size + max_overflow) が
+    # Postgres 側の接続上限に収まるように設定する）
+    db_pool_size: int = Field(
+        default=5,
+        ge=1,
+        validation_alias="DB_POOL_SIZE",
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        validation_alias="DB_MAX_OVERFLOW",
+    )
+    db_pool_timeout_sec: float = Field(
+        default=30.0,
+        gt=0,
+        validation_alias="DB_POOL_TIMEOUT_SEC",
+    )
+    # 接続を作り直すまでの秒数（-1 で無効。サーバ側のアイドル切断より短くする）
+    db_pool_recycle_sec: int = Field(
+        default=1800,
+        ge=-1,
+        validation_alias="DB_POOL_RECYCLE_SEC",
+    )
+    # 接続の死活確認
+    #   idle: 返却から DB_POOL_IDLE_PING_SEC 以上経った接続のみ ping する
+    #   pre_ping: チェックアウトのたびに ping する（往復が 1 回増える）
+    #   none: 確認しない（切断はクエリ失敗時に検知してプールを無効化する）
+    db_pool_liveness: Literal["idle", "pre_ping", "none"] = Field(
+        default="idle",
+        validation_alias="DB_POOL_LIVENESS",
+    )
+    db_pool_idle_ping_sec: float = Field(
+        default=30.0,
+        ge=0,
+        validation_alias="DB_POOL_IDLE_PING_SEC",
+    )
+    # リクエスト単位の DB 期限（ミリ秒。0 で無効）
+    # サーバ側 statement_timeout と、期限 + 猶予のクライアント側タイムアウトで強制する
+    db_statement_timeout_ms: int = Field(
+        default=5000,
+        ge=0,
+        validation_alias="DB_STATEMENT_TIMEOUT_MS",
+    )
+    db_deadline_grace_ms: int = Field(
+        default=250,
+        ge=0,
+        validation_alias="DB_DEADLINE_GRACE_MS",
+    )
+
+    # これ以上のステートメントを slow_query として出力する（0 で無効）
+    db_slow_query_ms: float = Field(
+        default=500.0,
+        ge=0,
+        validation_alias="DB_SLOW_QUERY_MS",
+    )
+
+    # PgBouncer（transaction プーリング）互換モード
+    # prepared statement を無効化し、既定で NullPool を使う
+    db_pgbouncer_mode: bool = Field(
+        default=False,
+        validation_alias="DB_PGBOUNCER_MODE",
+    )
+    # false なら DB_POOL_SIZE / DB_MAX_OVERFLOW の小さなクライアント側プールを使う
+    db_pgbouncer_null_pool: bool = Field(
+        default=True,
+        validation_alias="DB_PGBOUNCER_NULL_POOL",
+    )
+    # 起動時に事前確立する接続数（0 で無効。DB_POOL_SIZE が上限）
+    db_pool_warmup_connections: int = Field(
+        default=2,
+        ge=0,
+        validation_alias="DB_POOL_WARMUP_CONNECTIONS",
+    )
+    db_pool_warmup_timeout_sec: float = Field(
+        default=10.0,
+        gt=0,
+        validation_alias="DB_POOL_WARMUP_TIMEOUT_SEC",
+    )
+    # fail: 起動を中止する / degrade: 起動を継続し、プローブ成功まで not ready
+    db_pool_warmup_policy: Literal["fail", "degrade"] = Field(
+        default="degrade",
+        validation_alias="DB_POOL_WARMUP_POLICY",
+    )
+
+    # ---- Health ----
+    health_check_timeout_sec: float = Field(
+        default=1.0,
+        gt=0,
+        validation_alias="HEALTH_CHECK_TIMEOUT_SEC",
+    )
+    health_deadline_sec: float = Field(
+        default=2.0,
+        gt=0,
+        validation_alias="HEALTH_DEADLINE_SEC",
+    )
+    health_cache_ttl_sec: float = Field(
+        default=2.0,
+        ge=0,
+        validation_alias="HEALTH_CACHE_TTL_SEC",
+    )
+    # 0 でバックグラウンドプローブを無効化（/healthz 時に都度チェックし、
+    # readiness は依存先を判定しない）
+    health_probe_interval_sec: float = Field(
+        default=5.0,
+        ge=0,
+        validation_alias="HEALTH_PROBE_INTERVAL_SEC",
+    )
+    health_history_size: int = Field(
+        default=120,
+        ge=1,
+        validation_alias="HEALTH_HISTORY_SIZE",
+    )
+
+    # ---- Readiness ----
+    # 最新プローブがこの秒数より古ければ not ready（プローブ停止の検知）
+    readiness_max_probe_age_sec: float = Field(
+        default=15.0,
+        gt=0,
+        validation_alias="READINESS_MAX_PROBE_AGE_SEC",
+    )
+
     # ---- API JWT Auth ----
     jwt_public_key: str | None = Field(
         default=None,
@@ -94,6 +303,60 @@ class AppSettings(BaseSettings):
         default=None,
         validation_alias="JWT_AUDIENCE",
     )
+    # 受け入れる署名アルゴリズム（JSON 配列。RS256 / ES256 / EdDSA）
+    # 鍵の種類からアルゴリズムを決め、許可リストにない鍵は使わない
+    jwt_algorithms: list[Literal["RS256", "ES256", "EdDSA"]] = Field(
+        default_factory=lambda: ["RS256"],
+        min_length=1,
+        validation_alias="JWT_ALGORITHMS",
+    )
+    # JWKS の取得元（ファイルパス、または http(s) URL）
+    # 指定時は JWT_PUBLIC_KEY より優先し、トークンの kid で検証鍵を引く
+    jwt_jwks_source: str | None = Field(
+        default=None,
+        validation_alias="JWT_JWKS_SOURCE",
+    )
+    # JWKS の定期再取得の間隔（秒）
+    jwt_jwks_refresh_sec: float = Field(
+        default=300.0,
+        gt=0,
+        validation_alias="JWT_JWKS_REFRESH_SEC",
+    )
+    # 未知の kid による再取得の最小間隔（秒）
+    jwt_jwks_min_refetch_sec: float = Field(
+        default=30.0,
+        ge=0,
+        validation_alias="JWT_JWKS_MIN_REFETCH_SEC",
+    )
+    jwt_jwks_timeout_sec: float = Field(
+        default=5.0,
+        gt=0,
+        validation_alias="JWT_JWKS_TIMEOUT_SEC",
+    )
+    # 検証済みトークンのキャッシュ件数上限（0 で無効）
+    jwt_cache_max_entries: int = Field(
+        default=10000,
+        ge=0,
+        validation_alias="JWT_CACHE_MAX_ENTRIES",
+    )
+    # キャッシュエントリの最大寿命（秒）。トークンの exp を超えることはない
+    jwt_cache_ttl_sec: float = Field(
+        default=300.0,
+        gt=0,
+        validation_alias="JWT_CACHE_TTL_SEC",
+    )
+    # 署名検証（キャッシュミス時）の実行場所
+    #   inline: イベントループ上で実行する
+    #   thread: 専用スレッドプールで実行する（同時実行数は JWT_VERIFY_MAX_WORKERS）
+    jwt_verify_mode: Literal["inline", "thread"] = Field(
+        default="inline",
+        validation_alias="JWT_VERIFY_MODE",
+    )
+    jwt_verify_max_workers: int = Field(
+        default=4,
+        ge=1,
+        validation_alias="JWT_VERIFY_MAX_WORKERS",
+    )
 
     model_config = SettingsConfigDict(
         case_sensitive=False,
@@ -6,17 +6,24 @@ FastAPIアプリのブートストラップ
 - 公開ルーターは `/backend/<api_version>` 配下に集約（例：/backend/v1）
 - 内部プローブ（/livez, /readyz）はアプリ直下にマウント（外部公開から除外）
 - アクセスログは AccessLogMiddleware によりJSONで出力
+- DrainMiddleware で処理中リクエストを追跡し、ドレイン中は keep-alive を畳む
+- DB 期限超過・接続枯渇は共通の例外ハンドラで 504 / 503 に変換
+- 既定レスポンスクラスは JSON_BACKEND 設定に従う（orjson 未導入時は stdlib）
 """
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 
+from app.api.errors import register_exception_handlers
 from app.api.internal.probes import router as probes_router
 from app.api.v1.routers.health import router as health_router
 from app.api.v1.routers.sample import router as sample_router
+from app.core.lifecycle.drain import DrainMiddleware
 from app.core.lifecycle.startup import lifespan
+from app.core.logging.context import bind_route_context
 from app.core.logging.middleware import AccessLogMiddleware
+from app.core.serialization import get_response_class
 from app.core.settings import get_settings
 
 
@@ -31,19 +38,36 @@ def create_app() -> FastAPI:
         title=settings.service_name,
         version=settings.api_version,
         lifespan=lifespan,
+        default_response_class=get_response_class(settings.json_backend),
     )
 
+    # DB 期限超過（504）/ 接続枯渇（503）の応答変換
+    register_exception_handlers(application)
+
     # 構造化アクセスログ（Uvicornアクセスログは無効化想定）
-    application.add_middleware(AccessLogMiddleware)
+    application.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.access_log_sample_rate,
+        route_sample_rates=settings.access_log_route_sample_rates,
+        slow_ms=settings.access_log_slow_ms,
+        exclude_paths=settings.access_log_exclude_paths,
+    )
+    # ドレイン制御（最外周でアクセスログを含む全処理を追跡する）
+    application.add_middleware(DrainMiddleware)
 
     # 公開APIは /backend/<api_version> に集約（例：/backend/v1）
+    # ルートテンプレートをログコンテキストへ束縛する（slow_query などに付与）。
+    # 内部プローブは I/O なしで応答させるため対象外とする。
+    api_dependencies = [Depends(bind_route_context)]
     application.include_router(
         health_router,
         prefix=f"/backend/{application.version}",
+        dependencies=api_dependencies,
     )
     application.include_router(
         sample_router,
         prefix=f"/backend/{application.version}",
+        dependencies=api_dependencies,
     )
 
     # 内部専用プローブ（公開ルーティングから除外）
@@ -3,21 +3,51 @@
 
 - API バージョンに依存しないヘルス判定ロジックを担当する
 - 依存先として Postgres の TCP 到達性と SQL 実行可否を確認する
+- 依存先チェックはレジストリ化し、全体期限付きで並行実行する
+  （応答時間は各チェックの合計ではなく最大値になる）
+- 結果はプロセス内で TTL キャッシュし、同時呼び出しは 1 回の更新に合流させる
+  （監視エージェントや App Gateway の同時ポーリングで DB 負荷を増やさない）
+- バックグラウンドプローブ稼働中は、リクエスト経路で I/O を行わず最新結果を返す
+- 直近の結果はリングバッファに保持し、依存先ごとの p50/p95/p99 を提供する
+- DB コネクションプールの利用状況（I/O なしで読める現在値）を併せて返す
 """
 
 from __future__ import annotations
 
+import asyncio
+import math
 import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine, Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 from urllib.parse import urlsplit
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.adapters.network import tcp_ping
+from app.adapters.network import async_tcp_ping
+from app.adapters.postgres.pool_metrics import pool_status
 from app.core.settings import get_settings
 
+CheckResult = tuple[bool, int, str | None]
+CheckFn = Callable[[float], Awaitable[CheckResult]]
+
+
+@dataclass(frozen=True, slots=True)
+class DependencyChecker:
+    """
+    依存先 1 件分のチェック定義。
+
+    `check` はタイムアウト秒を受け取り (ok, latency_ms, error) を返す。
+    未設定などで実行しない依存先は `check=None` とし、skipped として報告する。
+    """
+
+    name: str
+    target: str
+    check: CheckFn | None
+
 
 def _host_port_from_url(url: str | None, default_port: int) -> tuple[str, int] | None:
     if not url:
@@ -35,77 +65,360 @@ def _host_port_from_url(url: str | None, default_port: int) -> tuple[str, int] |
     return parsed.hostname, port
 
 
-async def _postgres_sql_check(db_session: AsyncSession) -> tuple[bool, int, str | None]:
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
+async def _postgres_sql_check(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> CheckResult:
     """
     Postgres に対して `SELECT 1` を実行して、SQL レベルの接続性を確認する。
+
+    タイムアウトでキャンセルされても後始末が閉じるよう、専用セッションで実行する。
     """
     started = time.perf_counter()
     try:
-        result = await db_session.execute(text("SELECT 1"))
-        value = result.scalar_one_or_none()
-        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        async with session_factory() as db_session:
+            result = await db_session.execute(text("SELECT 1"))
+            value = result.scalar_one_or_none()
         if value == 1:
-            return True, elapsed_ms, None
-        return False, elapsed_ms, "unexpected result"
+            return True, _elapsed_ms(started), None
+        return False, _elapsed_ms(started), "unexpected result"
     except Exception as exc:
-        elapsed_ms = int((time.perf_counter() - started) * 1000)
-        return False, elapsed_ms, str(exc)
+        return False, _elapsed_ms(started), str(exc)
 
 
-async def build_health_payload(db_session: AsyncSession) -> dict[str, Any]:
+def build_dependency_checkers(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> list[DependencyChecker]:
     """
-    ヘルスチェック応答の元データを生成する。
+    設定から依存先チェックのレジストリを構築する。
+
+    依存先（Redis / Cosmos / Storage など）を増やす場合はここへ追加する。
     """
     s = get_settings()
-    dependencies: list[dict[str, object]] = []
-
     pg = _host_port_from_url(s.database_url, 5432)
-    if pg:
-        ok, ms, err = tcp_ping(pg[0], pg[1])
-        dependencies.append(
-            {
-                "name": "postgres_tcp",
-                "target": f"{pg[0]}:{pg[1]}",
-                "status": "ok" if ok else "fail",
-                "latency_ms": ms,
-                "error": err,
-            }
-        )
-
-        sql_ok, sql_ms, sql_err = await _postgres_sql_check(db_session)
-        dependencies.append(
-            {
-                "name": "postgres_sql",
-                "target": "SELECT 1",
-                "status": "ok" if sql_ok else "fail",
-                "latency_ms": sql_ms,
-                "error": sql_err,
-            }
-        )
-    else:
-        dependencies.append(
-            {
-                "name": "postgres_tcp",
-                "target": "(not configured)",
-                "status": "skipped",
-            }
-        )
-        dependencies.append(
-            {
-                "name": "postgres_sql",
-                "target": "SELECT 1",
-                "status": "skipped",
-            }
-        )
+    if not pg:
+        return [
+            DependencyChecker("postgres_tcp", "(not configured)", None),
+            DependencyChecker("postgres_sql", "SELECT 1", None),
+        ]
+
+    host, port = pg
+
+    async def postgres_tcp(timeout: float) -> CheckResult:
+        return await async_tcp_ping(host, port, timeout=timeout)
+
+    async def postgres_sql(timeout: float) -> CheckResult:
+        return await _postgres_sql_check(session_factory)
+
+    return [
+        DependencyChecker("postgres_tcp", f"{host}:{port}", postgres_tcp),
+        DependencyChecker("postgres_sql", "SELECT 1", postgres_sql),
+    ]
+
+
+async def _run_checker(checker: DependencyChecker, timeout: float) -> dict[str, object]:
+    """
+    単一チェックをタイムアウト付きで実行し、応答用の dict に変換する。
+    """
+    if checker.check is None:
+        return {"name": checker.name, "target": checker.target, "status": "skipped"}
+
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            ok, ms, err = await checker.check(timeout)
+    except TimeoutError:
+        ok, ms, err = False, _elapsed_ms(started), "timeout"
+    except Exception as exc:
+        # 1 件の想定外エラーで応答全体を失敗させない。
+        ok, ms, err = False, _elapsed_ms(started), str(exc) or type(exc).__name__
+
+    return {
+        "name": checker.name,
+        "target": checker.target,
+        "status": "ok" if ok else "fail",
+        "latency_ms": ms,
+        "error": err,
+    }
+
+
+async def run_dependency_checks(
+    checkers: Sequence[DependencyChecker],
+    *,
+    check_timeout: float,
+    deadline: float,
+) -> list[dict[str, object]]:
+    """
+    依存先チェックを並行実行し、レジストリ順に結果を返す。
+
+    引数:
+        checkers: 実行するチェックの一覧
+        check_timeout: チェック 1 件あたりのタイムアウト秒
+        deadline: 全体の期限秒。超過したチェックはキャンセルし timeout とする
+
+    戻り値:
+        list[dict[str, object]]: `HealthDependencyCheck` 相当の dict 一覧
+    """
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_run_checker(checker, check_timeout))
+        for checker in checkers
+    ]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            # キャンセル完了まで待ち、後始末（セッションのクローズ等）を保証する。
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    results: list[dict[str, object]] = []
+    for checker, task in zip(checkers, tasks, strict=True):
+        if task.cancelled():
+            results.append(
+                {
+                    "name": checker.name,
+                    "target": checker.target,
+                    "status": "fail",
+                    "latency_ms": _elapsed_ms(started),
+                    "error": "timeout",
+                }
+            )
+        else:
+            results.append(task.result())
+    return results
+
+
+@dataclass(frozen=True, slots=True)
+class HealthSnapshot:
+    """
+    ある時点の依存先チェック結果。
+    """
+
+    status: str
+    dependencies: list[dict[str, object]]
+    cached_at: datetime
+    monotonic_at: float
+
+
+class LatencyWindow:
+    """
+    依存先 1 件分の直近レイテンシ窓と、その p50/p95/p99。
+
+    百分位は記録時に再計算して保持し、読み出しを O(1) にする。
+    """
+
+    __slots__ = ("_samples", "p50", "p95", "p99")
+
+    def __init__(self, size: int) -> None:
+        self._samples: deque[int] = deque(maxlen=size)
+        self.p50 = 0
+        self.p95 = 0
+        self.p99 = 0
+
+    def add(self, latency_ms: int) -> None:
+        self._samples.append(latency_ms)
+        ordered = sorted(self._samples)
+        self.p50 = _nearest_rank(ordered, 50)
+        self.p95 = _nearest_rank(ordered, 95)
+        self.p99 = _nearest_rank(ordered, 99)
+
+
+def _nearest_rank(ordered: Sequence[int], percentile: int) -> int:
+    """
+    ソート済み系列から nearest-rank 法で百分位値を返す。
+    """
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+class HealthHistory:
+    """
+    直近スナップショットのリングバッファ。
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._snapshots: deque[HealthSnapshot] = deque(maxlen=size)
+        self._latencies: dict[str, LatencyWindow] = {}
+
+    def record(self, snapshot: HealthSnapshot) -> None:
+        """
+        スナップショットを追加し、依存先ごとのレイテンシ窓を更新する。
+        """
+        self._snapshots.append(snapshot)
+        for dep in snapshot.dependencies:
+            latency_ms = dep.get("latency_ms")
+            if not isinstance(latency_ms, int):
+                continue
+            name = str(dep["name"])
+            window = self._latencies.get(name)
+            if window is None:
+                window = self._latencies[name] = LatencyWindow(self._size)
+            window.add(latency_ms)
+
+    def snapshots(self) -> list[HealthSnapshot]:
+        """
+        保持しているスナップショットを古い順に返す。
+        """
+        return list(self._snapshots)
+
+    def percentiles(self, name: str) -> dict[str, int] | None:
+        """
+        依存先の直近 p50/p95/p99 を返す（記録なしなら None）。
+        """
+        window = self._latencies.get(name)
+        if window is None:
+            return None
+        return {"p50_ms": window.p50, "p95_ms": window.p95, "p99_ms": window.p99}
+
+
+class HealthSnapshotCache:
+    """
+    ヘルススナップショットの TTL キャッシュ（single-flight）。
+
+    - TTL 内はキャッシュを返し、依存先への I/O を行わない
+    - 期限切れ時に同時に来た呼び出しは、実行中の 1 回の更新を共有して待つ
+    - 呼び出し元がキャンセルされても、更新自体は他の待機者のために継続する
+    - バックグラウンド更新中は TTL に関わらず保持中の結果を返す
+    """
+
+    def __init__(self, history_size: int = 120) -> None:
+        self._snapshot: HealthSnapshot | None = None
+        self._inflight: asyncio.Task[HealthSnapshot] | None = None
+        self._background = False
+        self.history = HealthHistory(history_size)
+
+    def peek(self) -> HealthSnapshot | None:
+        """
+        I/O なしで最新スナップショットを返す（未取得なら None）。
+        """
+        return self._snapshot
+
+    def store(self, snapshot: HealthSnapshot) -> None:
+        """
+        スナップショットを最新として保持し、履歴へ記録する。
+
+        readiness への反映はバックグラウンドプローブだけが行う。
+        """
+        self._snapshot = snapshot
+        self.history.record(snapshot)
+
+    def set_background(self, active: bool) -> None:
+        """
+        バックグラウンド更新の有無を切り替える。
+        """
+        self._background = active
+
+    def clear(self) -> None:
+        """
+        キャッシュを破棄する（主にテスト用）。
+        """
+        self._snapshot = None
+        self._inflight = None
+        self._background = False
+        self.history = HealthHistory(self.history._size)
+
+    async def get(
+        self,
+        refresh: Callable[[], Coroutine[Any, Any, HealthSnapshot]],
+        ttl_sec: float,
+    ) -> HealthSnapshot:
+        """
+        TTL 内ならキャッシュを、期限切れなら単一の更新結果を返す。
+
+        引数:
+            refresh: スナップショットを取り直すコルーチン関数
+            ttl_sec: キャッシュの有効秒数（0 なら毎回更新。ただし合流は行う）
+
+        戻り値:
+            HealthSnapshot: 最新スナップショット
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and (
+            self._background or time.monotonic() - snapshot.monotonic_at < ttl_sec
+        ):
+            return snapshot
+
+        task = self._inflight
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(refresh())
+            self._inflight = task
+            task.add_done_callback(self._on_refreshed)
+        return await asyncio.shield(task)
+
+    def _on_refreshed(self, task: asyncio.Task[HealthSnapshot]) -> None:
+        if self._inflight is task:
+            self._inflight = None
+        if not task.cancelled() and task.exception() is None:
+            self.store(task.result())
+
+
+_snapshot_cache = HealthSnapshotCache(get_settings().health_history_size)
+
+
+def get_snapshot_cache() -> HealthSnapshotCache:
+    """
+    プロセス共有のスナップショットキャッシュを返す。
+    """
+    return _snapshot_cache
+
+
+async def collect_health_snapshot(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> HealthSnapshot:
+    """
+    依存先チェックを実行し、新しいスナップショットを生成する。
+    """
+    s = get_settings()
+    dependencies = await run_dependency_checks(
+        build_dependency_checkers(session_factory),
+        check_timeout=s.health_check_timeout_sec,
+        deadline=s.health_deadline_sec,
+    )
 
     overall_status = (
         "fail" if any(dep.get("status") == "fail" for dep in dependencies) else "ok"
     )
+    return HealthSnapshot(
+        status=overall_status,
+        dependencies=dependencies,
+        cached_at=datetime.now(tz=UTC),
+        monotonic_at=time.monotonic(),
+    )
+
+
+async def build_health_payload(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> dict[str, Any]:
+    """
+    ヘルスチェック応答の元データを生成する。
+
+    依存先の結果はキャッシュ済みスナップショットを使い、鮮度は
+    `cached_at` / `age_ms` として返す。
+    """
+    s = get_settings()
+    snapshot = await _snapshot_cache.get(
+        lambda: collect_health_snapshot(session_factory),
+        ttl_sec=s.health_cache_ttl_sec,
+    )
+
+    history = _snapshot_cache.history
+    dependencies: list[dict[str, object]] = []
+    for dep in snapshot.dependencies:
+        trend = history.percentiles(str(dep["name"]))
+        dependencies.append({**dep, **trend} if trend else dep)
 
     return {
-        "status": overall_status,
+        "status": snapshot.status,
         "app": s.service_name,
         "now": datetime.now(tz=UTC),
         "version": s.api_version,
         "dependencies": dependencies,
+        "cached_at": snapshot.cached_at,
+        "age_ms": int((time.monotonic() - snapshot.monotonic_at) * 1000),
+        "pools": pool_status(),
     }
@@ -0,0 +1,107 @@
+"""
+依存先ヘルスチェックのバックグラウンドプローブ。
+
+- lifespan で起動し、一定間隔で全依存先をチェックする
+- 結果はスナップショットキャッシュ（リングバッファ付き）へ格納する
+- readiness（依存先の成否・プール接続の確認）を更新するのはこのプローブだけ
+- これにより `/readyz` と `/backend/v1/healthz` はリクエスト経路で I/O を行わない
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.lifecycle.readiness import get_readiness
+from app.core.logging.config import get_logger
+from app.services.health import (
+    HealthSnapshot,
+    collect_health_snapshot,
+    get_snapshot_cache,
+)
+
+logger = get_logger(__name__)
+
+
+class HealthProber:
+    """
+    一定間隔で依存先をチェックするバックグラウンドタスク。
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_sec: float,
+    ) -> None:
+        """
+        プローブを開始する（起動済みなら何もしない）。
+
+        引数:
+            session_factory: SQL チェックに使うセッションファクトリ
+            interval_sec: チェック間隔秒
+        """
+        if self.running:
+            return
+        self._task = asyncio.create_task(
+            self._run(session_factory, interval_sec), name="health-prober"
+        )
+        get_snapshot_cache().set_background(True)
+
+    async def stop(self) -> None:
+        """
+        プローブを停止し、タスクの終了まで待つ。
+        """
+        task, self._task = self._task, None
+        get_snapshot_cache().set_background(False)
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_sec: float,
+    ) -> None:
+        while True:
+            try:
+                self._on_refreshed(await collect_health_snapshot(session_factory))
+            except Exception:
+                # 1 回の失敗でプローブ自体を止めない（次周期で再試行）。
+                logger.exception("health_probe_failed")
+            await asyncio.sleep(interval_sec)
+
+    def _on_refreshed(self, snapshot: HealthSnapshot) -> None:
+        """
+        結果をキャッシュへ格納し、readiness へ反映する。
+        """
+        get_snapshot_cache().store(snapshot)
+
+        readiness = get_readiness()
+        readiness.record_probe(snapshot.status == "ok")
+        if any(
+            dep["name"] == "postgres_sql" and dep["status"] == "ok"
+            for dep in snapshot.dependencies
+        ):
+            # SQL が通った時点でプールに実接続が 1 本以上ある。
+            readiness.pool_warmed = True
+
+
+_prober = HealthProber()
+
+
+def get_health_prober() -> HealthProber:
+    """
+    プロセス共有のヘルスプローブを返す。
+    """
+    return _prober
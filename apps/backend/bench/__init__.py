@@ -0,0 +1,5 @@
+"""
+バックエンドのマイクロベンチマーク群。
+
+`apps/backend` をカレントにして `uv run python -m bench.<name>` で実行する。
+"""
@@ -0,0 +1,121 @@
+"""
+AccessLogMiddleware のマイクロベンチマーク。
+
+BaseHTTPMiddleware ベースの旧実装と、純粋 ASGI の現実装で
+1 リクエストあたりのオーバーヘッド（requests/sec）を比較する。
+
+- ネットワークやサーバを介さず、ASGI アプリを直接呼び出す
+- ログは /dev/null へ出力し、出力先の I/O コストを除外する
+
+実行:
+    uv run python -m bench.access_log [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Callable
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+from app.core.logging.config import get_logger, setup_logging
+from app.core.logging.middleware import AccessLogMiddleware
+
+logger = get_logger("access")
+
+
+class LegacyAccessLogMiddleware(BaseHTTPMiddleware):
+    """
+    比較用の旧実装（BaseHTTPMiddleware ベース）。
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        started = time.perf_counter()
+        client = request.client.host if request.client else "-"
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            logger.info(
+                "uvicorn.access",
+                client_addr=client,
+                path=request.url.path,
+                status_code=status,
+                method=request.method,
+                latency_ms=round((time.perf_counter() - started) * 1000.0, 2),
+            )
+        return response
+
+
+async def _endpoint(request: Request) -> Response:
+    return PlainTextResponse("ok")
+
+
+def _build(middleware: Callable[[ASGIApp], ASGIApp]) -> ASGIApp:
+    return middleware(Starlette(routes=[Route("/bench", _endpoint)]))
+
+
+async def _run(app: ASGIApp, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bench",
+        "raw_path": b"/bench",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        return None
+
+    # ウォームアップ（初回のルート解決やロガー生成を計測から外す）
+    for _ in range(min(requests // 10, 1000)):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    setup_logging("INFO")
+    root = logging.getLogger()
+    root.handlers = [logging.StreamHandler(open(os.devnull, "w"))]
+
+    variants: dict[str, Callable[[ASGIApp], ASGIApp]] = {
+        "BaseHTTPMiddleware (legacy)": LegacyAccessLogMiddleware,
+        "pure ASGI": AccessLogMiddleware,
+    }
+    print(f"{'variant':<30}{'req/s':>12}")
+    for name, middleware in variants.items():
+        rps = asyncio.run(_run(_build(middleware), args.requests))
+        print(f"{name:<30}{rps:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+JWT 署名アルゴリズムごとの検証コストのマイクロベンチマーク。
+
+RS256（RSA-2048）/ ES256（P-256）/ EdDSA（Ed25519）について、
+アプリと同じ検証経路（`_decode_api_token`）の 1 秒あたりの検証数と、
+参考としてトークン発行側の 1 秒あたりの署名数を比較する。
+
+- 鍵ペアとトークンはベンチマーク内で生成する
+- 検証済みトークンのキャッシュは通さず、毎回署名検証を行う
+- RSA は公開指数が小さいため検証は安く、署名が高い
+  （検証側の CPU だけで見ると RS256 が最も安いことが多い）
+
+実行:
+    uv run python -m bench.jwt_algorithms [--verifications 3000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jose import jwk, jwt
+
+from app.core.security import auth
+from app.core.security.algorithms import SUPPORTED_ALGORITHMS, key_from_pem
+
+
+def _private_key(algorithm: str) -> Any:
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def _measure(algorithm: str, verifications: int) -> tuple[float, float, int]:
+    private = _private_key(algorithm)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    key = key_from_pem(public_pem, SUPPORTED_ALGORITHMS)
+    claims = {"sub": "bench-user", "exp": int(time.time()) + 3600}
+    signing_key = jwk.construct(private_pem, algorithm)
+    token = jwt.encode(claims, signing_key, algorithm=algorithm)
+
+    signatures = max(verifications // 10, 1)
+    started = time.perf_counter()
+    for _ in range(signatures):
+        jwt.encode(claims, signing_key, algorithm=algorithm)
+    sign_rate = signatures / (time.perf_counter() - started)
+
+    # ウォームアップ
+    for _ in range(min(verifications // 10, 100)):
+        auth._decode_api_token(token, key)
+
+    started = time.perf_counter()
+    for _ in range(verifications):
+        auth._decode_api_token(token, key)
+    verify_rate = verifications / (time.perf_counter() - started)
+    return verify_rate, sign_rate, len(token)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verifications", type=int, default=3_000)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<12}{'verifications/s':>18}{'signatures/s':>15}{'bytes':>8}")
+    for algorithm in SUPPORTED_ALGORITHMS:
+        verify_rate, sign_rate, size = _measure(algorithm, args.verifications)
+        print(f"{algorithm:<12}{verify_rate:>18,.0f}{sign_rate:>15,.0f}{size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+ApiTokenPrincipal 組み立てのマイクロベンチマーク。
+
+クレームごとに `payload.get` と型検査を繰り返す旧実装と、テーブル駆動で
+ペイロードを 1 回だけ走査する現実装で、1 回あたりの処理時間と
+メモリ確保量（tracemalloc の確保ブロック数・ピークバイト数）を比較する。
+
+- 署名検証は含めず、検証済みペイロードからの組み立てだけを測る
+- `--max-blocks` を指定すると、現実装の 1 回あたり確保ブロック数が
+  それを超えたときに終了コード 1 で失敗する（確保数の固定用）
+
+実行:
+    uv run python -m bench.jwt_claims [--calls 200000] [--max-blocks 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from app.core.security import auth
+
+_PAYLOAD: dict[str, Any] = {
+    "sub": "bench-user",
+    "exp": 1_900_000_000,
+    "iat": 1_899_999_700,
+    "iss": "3pull-web",
+    "aud": "3pull-api",
+    "email": "bench@example.com",
+    "name": "Bench User",
+    "email_verified": True,
+    "active_organization_id": "org-1",
+    "organization_role": "owner",
+}
+
+
+def _legacy(payload: dict[str, Any]) -> auth.ApiTokenPrincipal:
+    """
+    比較用の旧実装（クレームごとに get と isinstance を繰り返す）。
+    """
+    subject = payload.get("sub")
+    if not isinstance(subject, str) or not subject.strip():
+        raise auth.unauthorized("Invalid token payload")
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)):
+        raise auth.unauthorized("Invalid token payload")
+    expires_at = datetime.fromtimestamp(exp, tz=UTC)
+    audience = payload.get("aud")
+    if audience is not None and not isinstance(audience, (str, list)):
+        raise auth.unauthorized("Invalid token payload")
+    return auth.ApiTokenPrincipal(
+        user_id=subject,
+        user_email=payload.get("email")
+        if isinstance(payload.get("email"), str)
+        else None,
+        user_name=payload.get("name") if isinstance(payload.get("name"), str) else None,
+        email_verified=(
+            payload.get("email_verified")
+            if isinstance(payload.get("email_verified"), bool)
+            else None
+        ),
+        active_organization_id=(
+            payload.get("active_organization_id")
+            if isinstance(payload.get("active_organization_id"), str)
+            else None
+        ),
+        organization_role=(
+            payload.get("organization_role")
+            if isinstance(payload.get("organization_role"), str)
+            else None
+        ),
+        expires_at=expires_at,
+        issuer=payload.get("iss") if isinstance(payload.get("iss"), str) else None,
+        audience=audience,
+    )
+
+
+def _time_per_call(fn: Callable[[dict[str, Any]], Any], calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn(_PAYLOAD)
+    return (time.perf_counter() - started) / calls
+
+
+def _allocations_per_call(
+    fn: Callable[[dict[str, Any]], Any], calls: int
+) -> tuple[float, int]:
+    """
+    1 回あたりの確保ブロック数（結果を保持した状態）とピークバイト数を返す。
+    """
+    results: list[Any] = [None] * calls
+    fn(_PAYLOAD)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(calls):
+        results[i] = fn(_PAYLOAD)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    fn(_PAYLOAD)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return blocks / calls, peak - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--max-blocks", type=float, default=None)
+    args = parser.parse_args()
+
+    variants: dict[str, Callable[[dict[str, Any]], Any]] = {
+        "get + isinstance (legacy)": _legacy,
+        "table-driven single pass": auth._principal_from_claims,
+    }
+    print(f"{'variant':<28}{'ns/call':>10}{'blocks/call':>14}{'peak bytes':>12}")
+    blocks = 0.0
+    for name, fn in variants.items():
+        per_call = _time_per_call(fn, args.calls)
+        blocks, peak = _allocations_per_call(fn, min(args.calls, 10_000))
+        print(f"{name:<28}{per_call * 1e9:>10,.0f}{blocks:>14.2f}{peak:>12,}")
+
+    if args.max_blocks is not None and round(blocks, 2) > args.max_blocks:
+        print(f"allocation budget exceeded: {blocks:.2f} > {args.max_blocks}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+JWT 検証のオフロード比較ベンチマーク（同時実行時のレイテンシ）。
+
+イベントループ上で検証する inline と、専用スレッドプールで検証する thread で、
+/backend/v1/sample へ一定の到着率でリクエストを送ったときの
+p50 / p99 レイテンシと、イベントループの遅延（loop lag）を比較する。
+
+- ネットワークやサーバを介さず、ASGI アプリを直接呼び出す
+- 検証済みトークンのキャッシュは無効にし、毎回署名検証を行う
+- 複数のトークンを順に使う（RSA-2048 / RS256）
+- ルーター読み込みのため DATABASE_URL が必要（接続は発生しない）
+
+実行:
+    DATABASE_URL=postgresql+psycopg://u:p@127.0.0.1:1/db \\
+        uv run python -m bench.jwt_offload [--rate 1000] [--duration 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Any
+
+from fastapi import FastAPI
+from jose import jwt
+from starlette.types import ASGIApp, Message
+
+from app.api.v1.routers.sample import router as sample_router
+from app.core.security import auth
+from app.core.settings import get_settings
+from bench.jwt_verify import _keys
+
+_PATH = "/backend/v1/sample"
+
+
+def _configure(mode: str, workers: int) -> ASGIApp:
+    os.environ["JWT_CACHE_MAX_ENTRIES"] = "0"
+    os.environ["JWT_VERIFY_MODE"] = mode
+    os.environ["JWT_VERIFY_MAX_WORKERS"] = str(workers)
+    get_settings.cache_clear()
+    auth.get_token_cache.cache_clear()
+    auth.shutdown_verify_offloader()
+
+    application = FastAPI()
+    application.include_router(sample_router, prefix="/backend/v1")
+    return application
+
+
+def _scope(token: str) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": _PATH,
+        "raw_path": _PATH.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Message) -> None:
+    if message["type"] == "http.response.start" and message["status"] != 200:
+        raise RuntimeError(f"unexpected status: {message['status']}")
+
+
+async def _request(app: ASGIApp, token: str, scheduled: float) -> float:
+    await app(_scope(token), _receive, _send)
+    return time.perf_counter() - scheduled
+
+
+async def _loop_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    # 1ms ごとに起床し、予定からの遅れ（イベントループの詰まり）を記録する
+    while not stop.is_set():
+        expected = time.perf_counter() + 0.001
+        await asyncio.sleep(0.001)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(
+    app: ASGIApp, tokens: list[str], rate: float, duration: float
+) -> tuple[list[float], list[float]]:
+    """
+    一定の到着率でリクエストを発行する（オープンループ）。
+
+    レイテンシは予定到着時刻から応答完了までを測るため、
+    イベントループが詰まって発行が遅れた時間も含まれる。
+    """
+    # ウォームアップ（鍵の解析やスレッド生成を計測から外す）
+    await asyncio.gather(*(_request(app, t, time.perf_counter()) for t in tokens))
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    lag_task = asyncio.create_task(_loop_lag(stop, lags))
+    interval = 1.0 / rate
+    started = time.perf_counter()
+    tasks: list[asyncio.Task[float]] = []
+    for i in range(int(rate * duration)):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        token = tokens[i % len(tokens)]
+        tasks.append(asyncio.create_task(_request(app, token, scheduled)))
+    latencies = list(await asyncio.gather(*tasks))
+    stop.set()
+    await lag_task
+    return latencies, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=1000.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--tokens", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    private_pem, public_pem = _keys()
+    os.environ["JWT_PUBLIC_KEY"] = public_pem.replace("\n", "\\n")
+    expires = int(time.time()) + 3600
+    tokens = [
+        jwt.encode(
+            {"sub": f"bench-user-{i}", "exp": expires},
+            private_pem,
+            algorithm="RS256",
+        )
+        for i in range(args.tokens)
+    ]
+
+    print(f"offered load: {args.rate:,.0f} req/s for {args.duration:.1f}s")
+    print(f"{'mode':<24}{'p50 ms':>10}{'p99 ms':>10}{'loop lag p99 ms':>18}")
+    for mode in ("inline", "thread"):
+        app = _configure(mode, args.workers)
+        latencies, lags = asyncio.run(_run(app, tokens, args.rate, args.duration))
+        cuts = statistics.quantiles(latencies, n=100)
+        lag_p99 = statistics.quantiles(lags, n=100)[98] if len(lags) > 1 else 0.0
+        label = mode if mode == "inline" else f"thread ({args.workers} workers)"
+        print(
+            f"{label:<24}{cuts[49] * 1000:>10.2f}{cuts[98] * 1000:>10.2f}"
+            f"{lag_p99 * 1000:>18.2f}"
+        )
+    auth.shutdown_verify_offloader()
+
+
+if __name__ == "__main__":
+    main()
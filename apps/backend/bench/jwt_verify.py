@@ -0,0 +1,171 @@
+"""
+JWT 検証のマイクロベンチマーク（/backend/v1/sample 経由）。
+
+リクエストごとに PEM を解析する旧実装、解析済みの鍵オブジェクトを
+再利用する実装、検証済みトークンのキャッシュを有効にした実装で、
+1 秒あたりの処理数（requests/sec）を比較する。
+
+- ネットワークやサーバを介さず、ASGI アプリを直接呼び出す
+- 鍵ペアとトークンはベンチマーク内で生成する（RSA-2048 / RS256）
+- 毎回同じトークンを使う（キャッシュ無効の計測では JWT_CACHE_MAX_ENTRIES=0）
+- ルーター読み込みのため DATABASE_URL が必要（接続は発生しない）
+
+実行:
+    DATABASE_URL=postgresql+psycopg://u:p@127.0.0.1:1/db \\
+        uv run python -m bench.jwt_verify [--requests 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Message
+
+from app.api.v1.routers.sample import router as sample_router
+from app.core.security import auth
+from app.core.settings import get_settings
+
+_PATH = "/backend/v1/sample"
+
+
+def _keys() -> tuple[str, str]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+async def _legacy_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(auth.bearer_scheme),
+) -> auth.ApiTokenPrincipal:
+    """
+    比較用の旧実装（リクエストごとに PEM 文字列を渡して解析させる）。
+    """
+    if credentials is None:
+        raise auth.unauthorized("Missing Authorization credentials")
+    settings = get_settings()
+    try:
+        payload: dict[str, Any] = jwt.decode(
+            credentials.credentials,
+            auth._public_key_pem(),
+            algorithms=["RS256"],
+            issuer=settings.jwt_issuer,
+            audience=settings.jwt_audience,
+            options={"verify_aud": bool(settings.jwt_audience)},
+        )
+    except JWTError as exc:
+        raise auth.unauthorized("Invalid or expired token") from exc
+    return auth.ApiTokenPrincipal(
+        user_id=payload["sub"],
+        user_email=None,
+        user_name=None,
+        email_verified=None,
+        active_organization_id=None,
+        organization_role=None,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=UTC),
+        issuer=None,
+        audience=None,
+    )
+
+
+def _build(legacy: bool, cache_entries: int) -> ASGIApp:
+    os.environ["JWT_CACHE_MAX_ENTRIES"] = str(cache_entries)
+    get_settings.cache_clear()
+    auth.get_token_cache.cache_clear()
+
+    application = FastAPI()
+    application.include_router(sample_router, prefix="/backend/v1")
+    if legacy:
+        application.dependency_overrides[auth.get_current_principal] = _legacy_principal
+    return application
+
+
+async def _run(app: ASGIApp, token: str, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": _PATH,
+        "raw_path": _PATH.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    statuses: list[int] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # ウォームアップ（初回のルート解決や鍵の解析を計測から外す）
+    for _ in range(min(requests // 10, 200)):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - started
+
+    if set(statuses) != {200}:
+        raise RuntimeError(f"unexpected statuses: {sorted(set(statuses))}")
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    private_pem, public_pem = _keys()
+    os.environ["JWT_PUBLIC_KEY"] = public_pem.replace("\n", "\\n")
+    get_settings.cache_clear()
+    token = jwt.encode(
+        {"sub": "bench-user", "exp": int(time.time()) + 3600},
+        private_pem,
+        algorithm="RS256",
+    )
+
+    variants = {
+        "PEM per request (legacy)": (True, 0),
+        "cached key object": (False, 0),
+        "verified-token cache": (False, 10_000),
+    }
+    print(f"{'variant':<30}{'req/s':>12}")
+    for name, (legacy, cache_entries) in variants.items():
+        app = _build(legacy, cache_entries)
+        rps = asyncio.run(_run(app, token, args.requests))
+        print(f"{name:<30}{rps:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
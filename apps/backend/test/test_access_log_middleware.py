@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+from structlog.contextvars import get_contextvars
+from structlog.testing import capture_logs
+
+from app.core.logging.context import bind_route_context
+from app.core.logging.middleware import AccessLogMiddleware
+from app.core.metrics.http import HTTP_REQUESTS
+
+
+def _scope(path: str = "/backend/v1/sample") -> Scope:
+    # ASGI サーバが渡す最小限の HTTP スコープ。
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "client": ("10.0.0.1", 50000),
+        "headers": [],
+    }
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _streaming_app(scope: Scope, receive: Receive, send: Send) -> None:
+    # 2 チャンクに分けて返し、最終チャンクでのみログが出ることを確かめる。
+    await send({"type": "http.response.start", "status": 201, "headers": []})
+    await send({"type": "http.response.body", "body": b"a", "more_body": True})
+    await send({"type": "http.response.body", "body": b"b", "more_body": False})
+
+
+async def test_access_log_records_status_and_fields_once() -> None:
+    # 旧実装と同じ JSON フィールド・イベント名で、1 リクエスト 1 行だけ出力する。
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    with capture_logs() as logs:
+        await AccessLogMiddleware(_streaming_app)(_scope(), _receive, send)
+
+    assert len(sent) == 3
+    assert len(logs) == 1
+    entry = logs[0]
+    assert entry["event"] == "uvicorn.access"
+    assert entry["status_code"] == 201
+    assert entry["client_addr"] == "10.0.0.1"
+    assert entry["path"] == "/backend/v1/sample"
+    assert entry["method"] == "GET"
+    assert isinstance(entry["latency_ms"], float)
+
+
+async def test_access_log_records_500_when_app_raises() -> None:
+    # レスポンス開始前の例外は 500 として記録し、例外自体は上位へ再送出する。
+    async def failing_app(scope: Scope, receive: Receive, send: Send) -> None:
+        raise RuntimeError("boom")
+
+    async def send(message: Message) -> None:
+        return None
+
+    with capture_logs() as logs, pytest.raises(RuntimeError):
+        await AccessLogMiddleware(failing_app)(_scope(), _receive, send)
+
+    assert [entry["status_code"] for entry in logs] == [500]
+
+
+async def _ok_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _noop_send(message: Message) -> None:
+    return None
+
+
+async def test_access_log_samples_2xx_by_route_rate() -> None:
+    # 率 0.25 は「4 件に 1 件」出力する。乱数ではなく通番で決まるため件数は厳密。
+    middleware = AccessLogMiddleware(
+        _ok_app, route_sample_rates={"/backend/v1/sample": 0.25}
+    )
+
+    with capture_logs() as logs:
+        for _ in range(8):
+            await middleware(_scope(), _receive, _noop_send)
+
+    assert len(logs) == 2
+
+
+async def test_access_log_excludes_probe_paths_by_default() -> None:
+    # /readyz の正常応答は既定で出力しない（kubelet のポーリングでログが埋まるため）。
+    with capture_logs() as logs:
+        await AccessLogMiddleware(_ok_app)(_scope("/readyz"), _receive, _noop_send)
+
+    assert logs == []
+
+
+async def test_access_log_always_logs_non_2xx_even_when_sampled_out() -> None:
+    # サンプリング率 0 でもエラー応答は必ず出力する（障害調査の材料を失わない）。
+    async def unavailable_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 503, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    with capture_logs() as logs:
+        await AccessLogMiddleware(unavailable_app, sample_rate=0.0)(
+            _scope(), _receive, _noop_send
+        )
+
+    assert [entry["status_code"] for entry in logs] == [503]
+
+
+async def test_access_log_promotes_slow_requests_to_warning() -> None:
+    # 閾値を超えた 2xx はサンプリング対象外でも WARNING として必ず出力する。
+    async def slow_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await asyncio.sleep(0.02)
+        await _ok_app(scope, receive, send)
+
+    scope = {**_scope(), "query_string": b"token=secret"}
+    with capture_logs() as logs:
+        await AccessLogMiddleware(slow_app, sample_rate=0.0, slow_ms=10)(
+            scope, _receive, _noop_send
+        )
+
+    assert len(logs) == 1
+    assert logs[0]["log_level"] == "warning"
+    assert logs[0]["slow"] is True
+    assert logs[0]["slow_threshold_ms"] == 10
+    # クエリ文字列（トークン等を含みうる）は WARNING にも載せない。
+    assert "secret" not in repr(logs[0])
+
+
+async def test_request_id_is_bound_and_echoed() -> None:
+    # 受信した X-Request-ID をコンテキストへ束縛し、応答ヘッダでも返す。
+    # 不正な値は採用せず新たに生成する。
+    seen: list[object] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(get_contextvars().get("request_id"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    middleware = AccessLogMiddleware(app)
+    valid = {**_scope(), "headers": [(b"x-request-id", b"abc-123")]}
+    invalid = {**_scope(), "headers": [(b"x-request-id", b"bad id\n")]}
+    await middleware(valid, _receive, send)
+    await middleware(invalid, _receive, send)
+
+    assert seen[0] == "abc-123"
+    assert isinstance(seen[1], str) and seen[1] != "bad id\n"
+    assert (b"x-request-id", b"abc-123") in sent[0]["headers"]
+    assert get_contextvars().get("request_id") is None
+
+
+def test_route_key_includes_include_router_prefix() -> None:
+    # include_router(prefix=...) 配下のルートも、設定例どおり prefix 込みの
+    # テンプレートでサンプリング率を引き、メトリクスのラベルにも使う。
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/backend/v9")
+    app.add_middleware(
+        AccessLogMiddleware,
+        route_sample_rates={"/backend/v9/items/{item_id}": 0.0},
+    )
+    labels = ("GET", "/backend/v9/items/{item_id}", "200")
+    before = HTTP_REQUESTS.values().get(labels, 0.0)
+
+    with capture_logs() as logs:
+        response = TestClient(app).get("/backend/v9/items/1")
+
+    assert response.status_code == 200
+    assert logs == []
+    assert HTTP_REQUESTS.values()[labels] == before + 1
+
+
+def test_route_context_is_bound_only_on_api_routers() -> None:
+    # 公開 API のルーターでだけ prefix 込みのテンプレートを束縛し、
+    # 内部プローブには依存解決のコストをかけない。
+    seen: dict[str, object] = {}
+    api = APIRouter()
+    probes = APIRouter()
+
+    @api.get("/items/{item_id}")
+    async def item(item_id: int) -> None:
+        seen["api"] = get_contextvars().get("route")
+
+    @probes.get("/livez")
+    async def livez() -> None:
+        seen["probe"] = get_contextvars().get("route")
+
+    app = FastAPI()
+    app.include_router(
+        api, prefix="/backend/v9", dependencies=[Depends(bind_route_context)]
+    )
+    app.include_router(probes)
+    client = TestClient(app)
+
+    client.get("/backend/v9/items/1")
+    client.get("/livez")
+
+    assert seen == {"api": "/backend/v9/items/{item_id}", "probe": None}
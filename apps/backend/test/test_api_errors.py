@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.adapters.postgres.errors import DatabaseDeadlineExceeded, DatabaseUnavailable
+from app.api.errors import register_exception_handlers
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/slow/{item_id}")
+    async def slow(item_id: int) -> None:
+        raise DatabaseDeadlineExceeded(200, "server")
+
+    @app.get("/starved")
+    async def starved() -> None:
+        raise DatabaseUnavailable("QueuePool limit reached")
+
+    return TestClient(app)
+
+
+def test_deadline_exceeded_maps_to_504() -> None:
+    # DB 期限超過は上流タイムアウトとして 504 を返す。
+    response = _client().get("/slow/1")
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "database deadline exceeded"}
+
+
+def test_pool_exhaustion_maps_to_503_with_retry_after() -> None:
+    # 接続枯渇は一時的な受付不可として 503 と Retry-After を返す。
+    response = _client().get("/starved")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from app.core.security import auth
+from app.core.security.algorithms import VerificationKey
+from app.core.settings import get_settings
+
+
+def _rsa_keys() -> tuple[str, str]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+_PRIVATE_PEM, _PUBLIC_PEM = _rsa_keys()
+
+
+def _token(**claims: Any) -> str:
+    payload = {"sub": "user-1", "exp": int(time.time()) + 300, **claims}
+    return jwt.encode(payload, _PRIVATE_PEM, algorithm="RS256")
+
+
+def _reset_caches() -> None:
+    get_settings.cache_clear()
+    auth._verification_key.cache_clear()
+    auth.get_token_cache.cache_clear()
+    auth.shutdown_verify_offloader()
+
+
+@pytest.fixture(autouse=True)
+def _jwt_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # 環境変数形式（\n エスケープ）の PEM を設定する。
+    monkeypatch.setenv("JWT_PUBLIC_KEY", _PUBLIC_PEM.replace("\n", "\\n"))
+    _reset_caches()
+    yield
+    _reset_caches()
+
+
+def test_verification_key_is_parsed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 鍵の解析は初回のみで、以降の検証はキャッシュ済みの鍵オブジェクトを使う。
+    calls = 0
+    construct = jwk.construct
+
+    def counting_construct(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        return construct(*args, **kwargs)
+
+    tokens = [_token() for _ in range(3)]
+    monkeypatch.setattr(jwk, "construct", counting_construct)
+
+    auth.validate_public_key()
+    for token in tokens:
+        key = auth._verification_key()
+        assert auth._decode_api_token(token, key)["sub"] == "user-1"
+
+    assert calls == 1
+
+
+def test_invalid_key_fails_validation_and_is_not_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 不正な鍵は起動時に検出し、失敗結果はキャッシュしない。
+    monkeypatch.setenv("JWT_PUBLIC_KEY", "not a key")
+    _reset_caches()
+
+    with pytest.raises(RuntimeError, match="invalid"):
+        auth.validate_public_key()
+
+    monkeypatch.setenv("JWT_PUBLIC_KEY", _PUBLIC_PEM)
+    get_settings.cache_clear()
+    auth.validate_public_key()
+
+
+def _bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_repeated_token_skips_signature_verification(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 同じトークンの 2 回目以降は検証済みの結果を返し、署名検証を行わない。
+    calls = 0
+    decode = auth._decode_api_token
+
+    def counting_decode(token: str, key: VerificationKey) -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        return decode(token, key)
+
+    monkeypatch.setattr(auth, "_decode_api_token", counting_decode)
+    token = _token(email="a@example.com")
+
+    first = await auth.get_current_principal(_bearer(token))
+    second = await auth.get_current_principal(_bearer(token))
+
+    assert first is second
+    assert first.user_email == "a@example.com"
+    assert calls == 1
+
+
+async def test_cached_token_is_reverified_after_exp(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # キャッシュ済みでも exp を過ぎたら結果を返さず、再検証（= 期限切れで 401）へ回す。
+    token = _token(exp=int(time.time()) + 60)
+    await auth.get_current_principal(_bearer(token))
+
+    def expired(token: str, key: VerificationKey) -> dict[str, Any]:
+        raise auth.unauthorized("Invalid or expired token")
+
+    later = time.time() + 60
+    monkeypatch.setattr(auth.get_token_cache(), "_clock", lambda: later)
+    monkeypatch.setattr(auth, "_decode_api_token", expired)
+
+    with pytest.raises(HTTPException) as caught:
+        await auth.get_current_principal(_bearer(token))
+    assert caught.value.status_code == 401
+
+
+async def test_thread_mode_verifies_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # thread モードでは署名検証を専用スレッドで行う。
+    monkeypatch.setenv("JWT_VERIFY_MODE", "thread")
+    _reset_caches()
+    threads: list[str] = []
+    decode = auth._decode_api_token
+
+    def recording_decode(token: str, key: VerificationKey) -> dict[str, Any]:
+        threads.append(threading.current_thread().name)
+        return decode(token, key)
+
+    monkeypatch.setattr(auth, "_decode_api_token", recording_decode)
+
+    principal = await auth.get_current_principal(_bearer(_token()))
+
+    assert principal.user_id == "user-1"
+    assert threads[0].startswith("jwt-verify")
+
+
+def test_claim_table_matches_principal_fields() -> None:
+    # テーブルのフィールド位置は ApiTokenPrincipal の定義順と一致する。
+    names = [field.name for field in dataclasses.fields(auth.ApiTokenPrincipal)]
+    positions = {index for index, _, _ in auth._CLAIMS.values()}
+
+    assert positions == set(range(len(names)))
+    assert names[auth._CLAIMS["exp"][0]] == "expires_at"
+    assert names[auth._CLAIMS["aud"][0]] == "audience"
+
+
+def test_principal_from_claims_in_one_pass() -> None:
+    # 型が合わない任意クレームは None、不正な必須クレームは 401 とする。
+    principal = auth._principal_from_claims(
+        {
+            "sub": "user-1",
+            "exp": 1_700_000_000,
+            "email": "a@example.com",
+            "name": 42,
+            "email_verified": True,
+            "organization_role": "owner",
+            "iss": "3pull-web",
+            "aud": ["3pull-api"],
+            "iat": 1_699_999_000,
+        }
+    )
+
+    assert principal.user_id == "user-1"
+    assert principal.user_email == "a@example.com"
+    assert principal.user_name is None
+    assert principal.email_verified is True
+    assert principal.active_organization_id is None
+    assert principal.expires_at.timestamp() == 1_700_000_000
+    assert principal.audience == ["3pull-api"]
+
+    for claims in (
+        {"exp": 1},
+        {"sub": " ", "exp": 1},
+        {"sub": "user-1"},
+        {"sub": "user-1", "exp": "soon"},
+        {"sub": "user-1", "exp": 1, "aud": 3},
+    ):
+        with pytest.raises(HTTPException) as caught:
+            auth._principal_from_claims(claims)
+        assert caught.value.status_code == 401
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from app.services.health import _host_port_from_url
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services.health import (
+    DependencyChecker,
+    HealthHistory,
+    HealthSnapshot,
+    HealthSnapshotCache,
+    _host_port_from_url,
+    run_dependency_checks,
+)
 
 
 def test_host_port_from_url_uses_explicit_port() -> None:
@@ -27,3 +40,140 @@ def test_host_port_from_url_returns_none_on_missing_host() -> None:
 def test_host_port_from_url_returns_none_on_invalid_port() -> None:
     # ポート範囲外 (0-65535 以外) の URL は不正値として扱い、None を返すことを確認する。
     assert _host_port_from_url("postgresql://localhost:99999/app", 5432) is None
+
+
+def _sleeping_checker(name: str, delay: float) -> DependencyChecker:
+    # 指定秒だけ待ってから成功を返す、I/O を伴わない疑似チェック。
+    async def check(timeout: float) -> tuple[bool, int, str | None]:
+        await asyncio.sleep(delay)
+        return True, int(delay * 1000), None
+
+    return DependencyChecker(name, f"{name}:0", check)
+
+
+async def test_run_dependency_checks_runs_checks_concurrently() -> None:
+    # 0.2 秒のチェック 3 件が直列なら 0.6 秒かかる。
+    # 並行実行されていれば合計ではなく最大値（約 0.2 秒）で返ることを確認する。
+    checkers = [_sleeping_checker(f"dep{i}", 0.2) for i in range(3)]
+
+    started = time.perf_counter()
+    results = await run_dependency_checks(checkers, check_timeout=1.0, deadline=1.0)
+    elapsed = time.perf_counter() - started
+
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert elapsed < 0.45
+
+
+async def test_run_dependency_checks_reports_timeout_for_slow_check() -> None:
+    # 期限を超えたチェックは応答を待たせず、fail / timeout として報告する。
+    # 速いチェックの結果は失われず、レジストリ順も維持されることも確認する。
+    checkers = [_sleeping_checker("fast", 0.0), _sleeping_checker("slow", 5.0)]
+
+    results = await run_dependency_checks(checkers, check_timeout=0.1, deadline=1.0)
+
+    assert [r["name"] for r in results] == ["fast", "slow"]
+    assert results[0]["status"] == "ok"
+    assert results[1]["status"] == "fail"
+    assert results[1]["error"] == "timeout"
+
+
+async def test_run_dependency_checks_cancels_checks_past_overall_deadline() -> None:
+    # 個別タイムアウトより全体期限が短い場合も、期限で打ち切って timeout とする。
+    checkers = [_sleeping_checker("slow", 5.0)]
+
+    results = await run_dependency_checks(checkers, check_timeout=10.0, deadline=0.1)
+
+    assert results[0]["status"] == "fail"
+    assert results[0]["error"] == "timeout"
+
+
+async def test_run_dependency_checks_marks_unconfigured_as_skipped() -> None:
+    # check=None の依存先は実行せず skipped として返す（未設定時の従来挙動）。
+    checkers = [DependencyChecker("postgres_tcp", "(not configured)", None)]
+
+    results = await run_dependency_checks(checkers, check_timeout=1.0, deadline=1.0)
+
+    assert results == [
+        {"name": "postgres_tcp", "target": "(not configured)", "status": "skipped"}
+    ]
+
+
+def _snapshot(status: str = "ok") -> HealthSnapshot:
+    return HealthSnapshot(
+        status=status,
+        dependencies=[],
+        cached_at=datetime.now(tz=UTC),
+        monotonic_at=time.monotonic(),
+    )
+
+
+async def test_snapshot_cache_coalesces_concurrent_refreshes() -> None:
+    # 同時に 10 件の呼び出しが来ても、依存先チェックは 1 回だけ実行されることを
+    # 確認する。
+    # 監視系の同時ポーリングで DB 負荷が倍増しないための中核仕様。
+    cache = HealthSnapshotCache()
+    calls = 0
+
+    async def refresh() -> HealthSnapshot:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _snapshot()
+
+    results = await asyncio.gather(*(cache.get(refresh, ttl_sec=10) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+
+async def test_snapshot_cache_refreshes_after_ttl_expires() -> None:
+    # TTL 内は再取得せず、TTL 0（キャッシュ無効）なら毎回取り直すことを確認する。
+    cache = HealthSnapshotCache()
+    calls = 0
+
+    async def refresh() -> HealthSnapshot:
+        nonlocal calls
+        calls += 1
+        return _snapshot()
+
+    await cache.get(refresh, ttl_sec=10)
+    await cache.get(refresh, ttl_sec=10)
+    assert calls == 1
+
+    await cache.get(refresh, ttl_sec=0)
+    assert calls == 2
+
+
+async def test_snapshot_cache_does_not_store_failed_refresh() -> None:
+    # 更新が例外で終わった場合は待機者へ伝播し、壊れた結果をキャッシュしない。
+    cache = HealthSnapshotCache()
+
+    async def refresh() -> HealthSnapshot:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await cache.get(refresh, ttl_sec=10)
+
+    assert cache.peek() is None
+
+
+def test_health_history_tracks_rolling_percentiles() -> None:
+    # 1..100ms の 100 サンプルでは nearest-rank 法で p50=50, p95=95, p99=99 になる。
+    # リングバッファの上限（100）を超えた古いサンプルが窓から外れることも確認する。
+    history = HealthHistory(100)
+    for latency in [1000, *range(1, 101)]:
+        snapshot = HealthSnapshot(
+            status="ok",
+            dependencies=[{"name": "postgres_tcp", "latency_ms": latency}],
+            cached_at=datetime.now(tz=UTC),
+            monotonic_at=time.monotonic(),
+        )
+        history.record(snapshot)
+
+    assert history.percentiles("postgres_tcp") == {
+        "p50_ms": 50,
+        "p95_ms": 95,
+        "p99_ms": 99,
+    }
+    assert len(history.snapshots()) == 100
+    assert history.percentiles("unknown") is None
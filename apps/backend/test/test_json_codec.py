@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+import structlog
+from fastapi.responses import JSONResponse
+
+from app.api.v1.schemas.sample import SampleResponse
+from app.core.serialization import (
+    get_log_serializer,
+    get_response_class,
+    resolve_json_backend,
+)
+
+
+def test_stdlib_backend_keeps_default_serializers() -> None:
+    # stdlib 指定時は orjson の有無に関わらず従来のシリアライザを使う。
+    assert resolve_json_backend("stdlib") == "stdlib"
+    assert get_log_serializer("stdlib") is json.dumps
+    assert get_response_class("stdlib") is JSONResponse
+
+
+def test_orjson_response_matches_stdlib_body_for_datetimes() -> None:
+    # generatedAt（datetime）を含む応答が stdlib 版とバイト単位で一致する。
+    # 非 ASCII のクエリも含め、クライアントから見た差分が出ないことが要件。
+    pytest.importorskip("orjson")
+    payload = SampleResponse.model_validate(
+        {"query": "ぞっど", "items": [], "generated_at": datetime.now(tz=UTC)}
+    ).model_dump(mode="json", by_alias=True)
+
+    fast = get_response_class("orjson")(payload)
+
+    assert fast.body == JSONResponse(payload).body
+
+
+def test_orjson_log_renderer_matches_stdlib_for_datetimes() -> None:
+    # ログ中の datetime は stdlib と同じく repr へフォールバックする。
+    # orjson 独自の ISO 変換に切り替わると、既存のログ検索クエリが壊れるため。
+    pytest.importorskip("orjson")
+    event = {"event": "x", "at": datetime(2026, 1, 1, tzinfo=UTC), 1: "int-key"}
+    stdlib = structlog.processors.JSONRenderer()
+    fast = structlog.processors.JSONRenderer(serializer=get_log_serializer("orjson"))
+
+    rendered = fast(None, "info", dict(event))
+
+    assert isinstance(rendered, str)
+    assert json.loads(rendered) == json.loads(stdlib(None, "info", dict(event)))
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwk, jwt
+
+from app.core.security import auth, jwks
+from app.core.security.jwks import JwksKeyStore, fetch_jwks
+from app.core.settings import get_settings
+
+
+def _signing_key(kid: str) -> tuple[str, dict[str, Any]]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    return private_pem, {**public_jwk, "kid": kid, "use": "sig"}
+
+
+_OLD_PRIVATE, _OLD_JWK = _signing_key("old")
+_NEW_PRIVATE, _NEW_JWK = _signing_key("new")
+
+
+def _write_jwks(path: Path, *keys: dict[str, Any]) -> None:
+    path.write_text(json.dumps({"keys": list(keys)}))
+
+
+def _store(path: Path, min_refetch_sec: float = 0.0) -> JwksKeyStore:
+    return JwksKeyStore(
+        str(path),
+        allowed_algorithms=["RS256"],
+        min_refetch_sec=min_refetch_sec,
+        timeout_sec=1.0,
+    )
+
+
+def _counting_fetch(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    def counting(source: str, *args: Any) -> Any:
+        calls.append(source)
+        return fetch_jwks(source, *args)
+
+    monkeypatch.setattr(jwks, "fetch_jwks", counting)
+    return calls
+
+
+async def test_unknown_kid_refetches_rotated_keys(tmp_path: Path) -> None:
+    # 鍵のローテーション後、未知の kid を受けたら再取得して新しい鍵で検証できる。
+    path = tmp_path / "jwks.json"
+    _write_jwks(path, _OLD_JWK)
+    store = _store(path)
+    await store.refresh("startup")
+
+    assert store.get("old") is not None
+    assert store.get(None) is store.get("old")
+
+    _write_jwks(path, _OLD_JWK, _NEW_JWK)
+    assert await store.resolve("new") is not None
+    assert await store.resolve("missing") is None
+
+
+async def test_unknown_kid_refetch_is_rate_limited_and_single_flight(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 同時に来た未知の kid は 1 回の取得にまとめ、最小間隔内は再取得しない。
+    path = tmp_path / "jwks.json"
+    _write_jwks(path, _OLD_JWK)
+    calls = _counting_fetch(monkeypatch)
+    store = _store(path, min_refetch_sec=60.0)
+
+    results = await asyncio.gather(*(store.resolve("old") for _ in range(10)))
+    assert all(key is not None for key in results)
+    assert len(calls) == 1
+
+    assert await store.resolve("unknown") is None
+    assert len(calls) == 1
+
+
+async def test_unchanged_file_is_not_parsed_again(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 更新時刻が変わらなければ解析せず、手元の鍵をそのまま使う。
+    path = tmp_path / "jwks.json"
+    _write_jwks(path, _OLD_JWK)
+    store = _store(path)
+    await store.refresh()
+    before = store.get("old")
+
+    monkeypatch.setattr(jwks, "parse_jwks", None)
+    await store.refresh()
+
+    assert store.get("old") is before
+
+
+async def test_failed_refresh_keeps_current_keys(tmp_path: Path) -> None:
+    # 取得・解析に失敗しても、手元の鍵で検証を続ける。
+    path = tmp_path / "jwks.json"
+    _write_jwks(path, _OLD_JWK)
+    store = _store(path)
+    await store.refresh()
+
+    path.write_text("{not json")
+    with pytest.raises(ValueError):
+        await store.refresh()
+
+    assert store.get("old") is not None
+
+
+class _JwksHandler(BaseHTTPRequestHandler):
+    body = json.dumps({"keys": [_OLD_JWK]}).encode()
+    requests: list[str | None] = []
+
+    def do_GET(self) -> None:
+        etag = self.headers.get("If-None-Match")
+        self.requests.append(etag)
+        if etag == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def jwks_url() -> Iterator[str]:
+    server = HTTPServer(("127.0.0.1", 0), _JwksHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _JwksHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_port}/jwks.json"
+    server.shutdown()
+    server.server_close()
+
+
+async def test_http_refresh_uses_etag(jwks_url: str) -> None:
+    # 2 回目以降は If-None-Match を送り、304 なら鍵を維持する。
+    store = JwksKeyStore(
+        jwks_url, allowed_algorithms=["RS256"], min_refetch_sec=0.0, timeout_sec=1.0
+    )
+
+    await store.refresh()
+    await store.refresh()
+
+    assert _JwksHandler.requests == [None, '"v1"']
+    assert store.get("old") is not None
+
+
+async def test_principal_is_verified_with_key_selected_by_kid(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # JWKS 指定時は、トークンヘッダの kid で選んだ鍵で検証する。
+    path = tmp_path / "jwks.json"
+    _write_jwks(path, _OLD_JWK, _NEW_JWK)
+    monkeypatch.setenv("JWT_JWKS_SOURCE", str(path))
+    monkeypatch.setenv("JWT_CACHE_MAX_ENTRIES", "0")
+    get_settings.cache_clear()
+    auth.get_jwks_store.cache_clear()
+    auth.get_token_cache.cache_clear()
+    try:
+        await auth.load_verification_keys()
+        token = jwt.encode(
+            {"sub": "user-1", "exp": int(time.time()) + 60},
+            _NEW_PRIVATE,
+            algorithm="RS256",
+            headers={"kid": "new"},
+        )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        principal = await auth.get_current_principal(credentials)
+
+        assert principal.user_id == "user-1"
+    finally:
+        await auth.stop_key_refresh()
+        get_settings.cache_clear()
+        auth.get_jwks_store.cache_clear()
+        auth.get_token_cache.cache_clear()
+
+
+async def test_failed_startup_fetch_recovers_on_scheduled_refresh(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 初回取得に失敗しても定期再取得は開始し、鍵を読み込めた時点で通知する。
+    path = tmp_path / "jwks.json"
+    monkeypatch.setenv("JWT_JWKS_SOURCE", str(path))
+    monkeypatch.setenv("JWT_JWKS_REFRESH_SEC", "0.01")
+    get_settings.cache_clear()
+    auth.get_jwks_store.cache_clear()
+    loaded = asyncio.Event()
+    try:
+        with pytest.raises(RuntimeError):
+            await auth.load_verification_keys(on_loaded=loaded.set)
+        store = auth.get_jwks_store()
+        assert store is not None
+        assert len(store) == 0
+
+        _write_jwks(path, _OLD_JWK)
+        await asyncio.wait_for(loaded.wait(), timeout=2.0)
+
+        assert store.get("old") is not None
+    finally:
+        await auth.stop_key_refresh()
+        get_settings.cache_clear()
+        auth.get_jwks_store.cache_clear()
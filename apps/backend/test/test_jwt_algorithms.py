@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from typing import Any
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from fastapi import HTTPException
+from jose import jwt
+from jose.exceptions import JWKError
+from jose.utils import base64url_encode
+
+from app.core.security import auth
+from app.core.security.algorithms import (
+    SUPPORTED_ALGORITHMS,
+    key_from_jwk,
+    key_from_pem,
+)
+
+_PRIVATE_KEYS: dict[str, Any] = {
+    "RS256": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+}
+
+
+def _pems(algorithm: str) -> tuple[str, str]:
+    private = _PRIVATE_KEYS[algorithm]
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _token(private_pem: str, algorithm: str) -> str:
+    claims = {"sub": "user-1", "exp": int(time.time()) + 60}
+    return jwt.encode(claims, private_pem, algorithm=algorithm)
+
+
+@pytest.mark.parametrize("algorithm", SUPPORTED_ALGORITHMS)
+def test_each_supported_algorithm_verifies(algorithm: str) -> None:
+    # 鍵の種類からアルゴリズムを決め、その鍵で署名されたトークンを検証できる。
+    private_pem, public_pem = _pems(algorithm)
+    key = key_from_pem(public_pem, SUPPORTED_ALGORITHMS)
+
+    payload = auth._decode_api_token(_token(private_pem, algorithm), key)
+
+    assert key.algorithm == algorithm
+    assert payload["sub"] == "user-1"
+
+
+def test_token_alg_must_match_the_key_algorithm() -> None:
+    # 別アルゴリズムの署名や、公開鍵を HMAC 鍵に流用したトークンは拒否する。
+    _, rsa_public = _pems("RS256")
+    es_private, _ = _pems("ES256")
+    key = key_from_pem(rsa_public, SUPPORTED_ALGORITHMS)
+    header = base64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+    claims = base64url_encode(b'{"sub":"user-1"}')
+    mac = hmac.new(rsa_public.encode(), header + b"." + claims, hashlib.sha256)
+    forged = b".".join([header, claims, base64url_encode(mac.digest())]).decode()
+
+    for token in (_token(es_private, "ES256"), forged):
+        with pytest.raises(HTTPException) as caught:
+            auth._decode_api_token(token, key)
+        assert caught.value.status_code == 401
+
+
+def test_key_types_outside_the_allow_list_are_rejected() -> None:
+    # 許可リストにない鍵、alg が鍵の種類と食い違う JWK は使わない。
+    _, ed_public = _pems("EdDSA")
+    with pytest.raises(JWKError):
+        key_from_pem(ed_public, ["RS256"])
+
+    ed_jwk = key_from_pem(ed_public, SUPPORTED_ALGORITHMS).key.to_dict()
+    assert key_from_jwk(ed_jwk, ["EdDSA"]).algorithm == "EdDSA"
+    with pytest.raises(JWKError):
+        key_from_jwk({**ed_jwk, "alg": "RS256"}, SUPPORTED_ALGORITHMS)
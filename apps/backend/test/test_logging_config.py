@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import io
+import logging
+import queue
+
+from app.core.logging.config import (
+    LOG_RECORDS_DROPPED,
+    _BatchWriter,
+    _BoundedQueueHandler,
+)
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("app", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_bounded_queue_handler_drops_oldest_and_counts() -> None:
+    # 満杯時は最古のレコードを捨てて新しいレコードを残し、破棄件数を数える。
+    # stdout が詰まってもリクエスト処理を止めないための既定ポリシー。
+    # 破棄件数はメトリクスとしても公開し、運用側がログ欠落を検知できる。
+    before = LOG_RECORDS_DROPPED.values().get((), 0.0)
+    log_queue: queue.Queue[logging.LogRecord | None] = queue.Queue(2)
+    handler = _BoundedQueueHandler(log_queue, "drop_oldest")
+
+    for message in ("first", "second", "third"):
+        handler.handle(_record(message))
+
+    remaining = [log_queue.get_nowait() for _ in range(2)]
+    assert [r.getMessage() for r in remaining if r is not None] == ["second", "third"]
+    assert handler.dropped == 1
+    assert LOG_RECORDS_DROPPED.values()[()] == before + 1
+
+
+def test_batch_writer_flushes_pending_records_on_stop() -> None:
+    # 停止時にキューへ残ったレコードを書き切ることを確認する（終了時のログ欠落防止）。
+    # 書き込みは 1 バッチ 1 回の write にまとめられ、行順も維持される。
+    log_queue: queue.Queue[logging.LogRecord | None] = queue.Queue(10)
+    stream = io.StringIO()
+    writer = _BatchWriter(log_queue, stream, logging.Formatter("%(message)s"), 100)
+    for message in ("a", "b", "c"):
+        log_queue.put(_record(message))
+
+    writer.start()
+    writer.stop()
+
+    assert stream.getvalue() == "a\nb\nc\n"
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.metrics import MetricsRegistry, multiprocess, render_snapshot
+from app.core.metrics.multiprocess import collect_merged, write_snapshot
+
+
+def test_counter_merges_per_thread_shards() -> None:
+    # 記録はスレッドごとのシャードへ無ロックで行い、収集時に合算する。
+    # 4 スレッド × 1000 回の加算が欠落なく集計されることを確認する。
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.values() == {("a",): 4000.0}
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    # バケットは累積値で出力し、境界値ちょうどの観測は当該バケットに含める（le）。
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), (0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+
+    text = render_snapshot(registry.snapshot())
+
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/x"} 4' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_collect_merged_sums_workers_and_drops_dead_gauges(tmp_path: Path) -> None:
+    # 別ワーカーのスナップショットファイルと自プロセス分を合算する。
+    # 終了済みワーカー（存在しない PID）の counter は単調性のため残し、
+    # gauge（処理中件数など）は現在値として無意味なので除外する。
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc(amount=2)
+    registry.gauge("in_flight", "In flight.").inc(amount=1)
+
+    other = MetricsRegistry()
+    other.counter("requests_total", "Requests.").inc(amount=3)
+    other.gauge("in_flight", "In flight.").inc(amount=5)
+    dead_pid = 2**22 + 1
+    (tmp_path / f"metrics_{dead_pid}.json").write_text(json.dumps(other.snapshot()))
+
+    merged = collect_merged(str(tmp_path), registry)
+
+    assert merged["requests_total"]["values"] == {"[]": 5.0}
+    assert merged["in_flight"]["values"] == {"[]": 1.0}
+
+
+def test_concurrent_snapshot_writes_do_not_collide(tmp_path: Path) -> None:
+    # 定期書き出しとスクレイプが同時に書いても、一時ファイルを奪い合わない。
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc()
+    errors: list[BaseException] = []
+
+    def work() -> None:
+        try:
+            for _ in range(200):
+                write_snapshot(str(tmp_path), registry)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_collect_merged_survives_failed_own_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 自プロセス分の書き出しに失敗しても、メモリ上の値でスクレイプに応答する。
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.").inc(amount=2)
+
+    def failing_write(directory: str, registry: MetricsRegistry) -> None:
+        raise FileNotFoundError(directory)
+
+    monkeypatch.setattr(multiprocess, "write_snapshot", failing_write)
+    merged = collect_merged(str(tmp_path), registry)
+
+    assert merged["requests_total"]["values"] == {"[]": 2.0}
@@ -0,0 +1,73 @@
+"""
+PgBouncer（transaction プーリング）互換モードの結合テスト。
+
+`PGBOUNCER_TEST_URL` が設定されている場合のみ実行する。
+環境は docker/pgbouncer.compose.yml を参照。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.adapters.postgres.engine import (
+    create_engine,
+    create_session_factory,
+    engine_options,
+)
+from app.adapters.postgres.unit_of_work import read_only_bind, session_scope
+from app.core.settings.config import AppSettings
+
+PGBOUNCER_TEST_URL = os.environ.get("PGBOUNCER_TEST_URL")
+
+requires_pgbouncer = pytest.mark.skipif(
+    not PGBOUNCER_TEST_URL, reason="PGBOUNCER_TEST_URL is not set"
+)
+
+
+def _settings(**env: object) -> AppSettings:
+    return AppSettings(DB_PGBOUNCER_MODE=True, **env)  # type: ignore[call-arg]
+
+
+def test_pgbouncer_mode_disables_prepared_statements_and_pooling() -> None:
+    # 互換モードでは prepared statement を無効化し、既定で NullPool を使う。
+    options = engine_options(_settings())
+
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+    small_pool = engine_options(_settings(DB_PGBOUNCER_NULL_POOL=False, DB_POOL_SIZE=2))
+    assert small_pool["pool_size"] == 2
+
+
+@requires_pgbouncer
+@pytest.mark.parametrize("null_pool", [True, False])
+async def test_repeated_statements_survive_server_connection_swaps(
+    null_pool: bool,
+) -> None:
+    # psycopg の既定（5 回目以降に prepare）では、トランザクションごとに
+    # サーバ接続が替わると "prepared statement does not exist" で失敗する。
+    # 並行に同一 SQL を繰り返しても失敗しないことを確認する。
+    assert PGBOUNCER_TEST_URL is not None
+    settings = _settings(DB_PGBOUNCER_NULL_POOL=null_pool, DB_POOL_SIZE=2)
+    engine = create_engine(PGBOUNCER_TEST_URL, f"pgbouncer_{null_pool}", settings)
+    factories = [
+        create_session_factory(engine),
+        create_session_factory(read_only_bind(engine)),
+    ]
+
+    async def worker(index: int) -> None:
+        factory = factories[index % 2]
+        for i in range(20):
+            async with session_scope(factory, read_only=index % 2 == 1) as session:
+                value = await session.scalar(text("SELECT CAST(:v AS int)"), {"v": i})
+                assert value == i
+
+    try:
+        await asyncio.gather(*(worker(n) for n in range(8)))
+    finally:
+        await engine.dispose()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.adapters.postgres.liveness import install_idle_ping
+
+
+def _engine_with_ping(result: Exception | None) -> tuple[Any, list[object]]:
+    engine = create_async_engine("postgresql+psycopg://u:p@127.0.0.1:1/db")
+    install_idle_ping(engine, "test_liveness", idle_sec=30.0)
+    pinged: list[object] = []
+
+    def do_ping(dbapi_connection: object) -> bool:
+        pinged.append(dbapi_connection)
+        if result is not None:
+            raise result
+        return True
+
+    engine.sync_engine.dialect.do_ping = do_ping  # type: ignore[method-assign]
+    return engine, pinged
+
+
+def test_recently_returned_connection_is_not_pinged() -> None:
+    # 閾値未満のアイドルでは往復を追加しない。
+    engine, pinged = _engine_with_ping(None)
+    record = SimpleNamespace(info={"returned_at": time.monotonic()})
+
+    engine.pool.dispatch.checkout(object(), record, None)
+
+    assert pinged == []
+
+
+def test_idle_connection_ping_failure_invalidates_pool() -> None:
+    # 閾値超過の接続は ping し、失敗時はプール全体の無効化を要求する。
+    engine, pinged = _engine_with_ping(OSError("server closed the connection"))
+    conn = object()
+    record = SimpleNamespace(info={"returned_at": time.monotonic() - 60})
+
+    with pytest.raises(exc.InvalidatePoolError):
+        engine.pool.dispatch.checkout(conn, record, None)
+
+    assert pinged == [conn]
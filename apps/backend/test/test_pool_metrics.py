@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.util.concurrency import greenlet_spawn
+
+from app.adapters.postgres.pool_metrics import (
+    POOL_CHECKOUT_TIMEOUTS,
+    POOL_CHECKOUT_WAIT,
+    POOL_CONNECTIONS,
+    POOL_LIMIT,
+    InstrumentedAsyncPool,
+    instrument_pool,
+    pool_status,
+)
+
+
+class _FakeConnection:
+    def close(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+def _connect() -> Any:
+    return _FakeConnection()
+
+
+async def test_pool_records_wait_and_timeout() -> None:
+    # 上限到達時のタイムアウトも待ち時間として記録し、件数を別途数える。
+    # dispose() 後に作り直されたプールにもラベルが引き継がれること。
+    pool = InstrumentedAsyncPool(_connect, pool_size=1, max_overflow=0, timeout=0.01)
+    pool.metrics_label = "test_wait"
+    labels = ("test_wait",)
+
+    def exhaust() -> None:
+        held = pool.connect()
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        held.close()
+
+    await greenlet_spawn(exhaust)
+
+    assert POOL_CHECKOUT_TIMEOUTS.values()[labels] == 1.0
+    wait = POOL_CHECKOUT_WAIT.values()[labels]
+    assert sum(wait[:-1]) == 2.0
+    assert wait[-1] >= 0.01
+    recreated = pool.recreate()
+    assert isinstance(recreated, InstrumentedAsyncPool)
+    assert recreated.metrics_label == "test_wait"
+
+
+def test_pool_status_and_gauges_read_configured_pool() -> None:
+    # 接続前でも設定値（size / 上限）と現在値（0 件）を I/O なしで返す。
+    engine = create_async_engine(
+        "postgresql+psycopg://u:p@127.0.0.1:1/db",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=3,
+        max_overflow=2,
+        pool_timeout=7,
+    )
+    instrument_pool(engine, "test_status", max_overflow=2)
+
+    status = next(s for s in pool_status() if s["name"] == "test_status")
+
+    assert status == {
+        "name": "test_status",
+        "pool_class": "InstrumentedAsyncPool",
+        "size": 3,
+        "in_use": 0,
+        "idle": 0,
+        "overflow": 0,
+        "max_overflow": 2,
+        "timeout_sec": 7,
+    }
+    assert POOL_LIMIT.values()[("test_status",)] == 5.0
+    assert POOL_CONNECTIONS.values()[("test_status", "in_use")] == 0.0
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.adapters.postgres.warmup import warm_pool
+
+
+async def test_warm_pool_bounds_by_pool_size_and_reports_failure() -> None:
+    # 接続できない DB では成功数 0 とエラーを返す（例外は送出しない）。
+    # 要求本数は pool_size で頭打ちになる。
+    engine = create_async_engine("postgresql+psycopg://u:p@127.0.0.1:1/db", pool_size=2)
+    try:
+        result = await warm_pool(engine, connections=5, timeout_sec=5.0)
+    finally:
+        await engine.dispose()
+
+    assert result.requested == 2
+    assert result.warmed == 0
+    assert not result.ok
+    assert result.error is not None
+
+
+async def test_warm_pool_disabled_with_zero_connections() -> None:
+    # 0 本指定では接続を試みずに成功扱いで返す。
+    engine = create_async_engine("postgresql+psycopg://u:p@127.0.0.1:1/db")
+    result = await warm_pool(engine, connections=0, timeout_sec=1.0)
+
+    assert result.ok
+    assert result.requested == 0
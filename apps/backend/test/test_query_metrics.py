@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from structlog.testing import capture_logs
+
+from app.adapters.postgres.query_metrics import (
+    QUERY_DURATION,
+    QUERY_ROWS,
+    fingerprint,
+    instrument_queries,
+)
+
+
+def test_fingerprint_normalizes_literals_and_in_lists() -> None:
+    # リテラル・プレースホルダ・IN リストの長さが違っても同じ指紋に集約する。
+    a = fingerprint(
+        "SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND name = 'x'"
+    )
+    b = fingerprint("SELECT *  FROM t\n WHERE id IN (%(id_1_1)s) AND name = 'o''k'")
+    c = fingerprint("SELECT * FROM t WHERE id = 42 /* comment */")
+
+    assert a[0] == b[0]
+    assert a[1] == "SELECT"
+    assert a[2] == "SELECT * FROM t WHERE id IN (...) AND name = ?"
+    assert c[2] == "SELECT * FROM t WHERE id = ?"
+    assert fingerprint("SELECT x::int FROM t1")[2] == "SELECT x::int FROM t1"
+
+
+def test_cursor_events_record_metrics_and_slow_query() -> None:
+    # 閾値以上のステートメントは slow_query として指紋付きで出力する。
+    engine = create_async_engine("postgresql+psycopg://u:p@127.0.0.1:1/db")
+    instrument_queries(engine, slow_ms=0.000001)
+    dispatch = engine.sync_engine.dispatch
+    conn = SimpleNamespace(info={})
+    cursor = SimpleNamespace(rowcount=3)
+    statement = "UPDATE items SET done = %(done)s WHERE owner = %(owner)s"
+
+    with capture_logs() as logs:
+        dispatch.before_cursor_execute(conn, cursor, statement, {}, None, False)
+        dispatch.after_cursor_execute(conn, cursor, statement, {}, None, False)
+
+    query_id, operation, normalized = fingerprint(statement)
+    assert QUERY_ROWS.values()[(query_id, operation)] >= 3
+    assert (query_id, operation) in QUERY_DURATION.values()
+    slow = [entry for entry in logs if entry["event"] == "slow_query"]
+    assert slow[0]["fingerprint"] == normalized
+    assert slow[0]["rows"] == 3
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+import app.core.lifecycle.readiness as readiness
+from app.core.lifecycle.readiness import ReadinessState
+from app.services import health_prober
+from app.services.health import HealthSnapshot, HealthSnapshotCache
+from app.services.health_prober import HealthProber
+
+
+def _ready_state() -> ReadinessState:
+    # すべての条件を満たした状態（プローブ鮮度判定つき）から各ケースを崩して検証する。
+    state = ReadinessState()
+    state.jwt_key_ready = True
+    state.pool_warmed = True
+    state.max_probe_age_sec = 15.0
+    state.record_probe(True)
+    return state
+
+
+def test_not_ready_reason_is_none_when_all_conditions_hold() -> None:
+    # 全条件成立時のみ受け入れ可能（None）になることを確認する。
+    assert _ready_state().not_ready_reason() is None
+
+
+def test_not_ready_reason_reports_cold_start() -> None:
+    # 起動直後（鍵未解析・プール未接続・プローブ未実行）は受け入れない。
+    # 鍵の不備が最優先で報告されることも確認する。
+    assert ReadinessState().not_ready_reason() == "jwt_key_invalid"
+
+
+def test_not_ready_reason_prioritizes_draining() -> None:
+    # ドレイン中は他の条件に関わらず即座に not ready とし、新規流入を止める。
+    state = _ready_state()
+    state.draining = True
+    assert state.not_ready_reason() == "draining"
+
+
+def test_not_ready_reason_reports_stale_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    # プローブが停止して結果が古くなった場合は、古い成功結果を信用しない。
+    state = _ready_state()
+    later = readiness.time.monotonic() + 60
+    monkeypatch.setattr(readiness.time, "monotonic", lambda: later)
+    assert state.not_ready_reason() == "probe_stale"
+
+
+def test_not_ready_reason_reports_failed_dependency() -> None:
+    # 直近プローブが失敗していれば、依存先到達不能として受け入れない。
+    state = _ready_state()
+    state.record_probe(False)
+    assert state.not_ready_reason() == "dependency_unavailable"
+
+
+def test_dependencies_are_ignored_when_prober_is_disabled() -> None:
+    # プローブ無効時は依存先の状態が更新されないため、起動時点の失敗や
+    # 未接続のプールで not ready に固定しない（ドレインと鍵の判定は残る）。
+    state = _ready_state()
+    state.max_probe_age_sec = 0.0
+    state.pool_warmed = False
+    state.record_probe(False)
+    state.track_dependencies = False
+
+    assert state.not_ready_reason() is None
+    state.draining = True
+    assert state.not_ready_reason() == "draining"
+
+
+def test_only_the_prober_updates_readiness(monkeypatch: pytest.MonkeyPatch) -> None:
+    # キャッシュへの格納（/healthz の更新など）では readiness を変えず、
+    # バックグラウンドプローブの結果だけを反映する。
+    state = ReadinessState()
+    cache = HealthSnapshotCache()
+    monkeypatch.setattr(health_prober, "get_readiness", lambda: state)
+    monkeypatch.setattr(health_prober, "get_snapshot_cache", lambda: cache)
+    snapshot = HealthSnapshot(
+        status="fail",
+        dependencies=[{"name": "postgres_sql", "status": "ok"}],
+        cached_at=datetime.now(tz=UTC),
+        monotonic_at=time.monotonic(),
+    )
+
+    cache.store(snapshot)
+    assert not state.pool_warmed
+
+    HealthProber()._on_refreshed(snapshot)
+    assert cache.peek() is snapshot
+    assert state.pool_warmed
+    state.jwt_key_ready = True
+    assert state.not_ready_reason() == "dependency_unavailable"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import cast
+
+import pytest
+from psycopg.errors import QueryCanceled
+from sqlalchemy import exc, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.adapters.postgres.replicas import (
+    PRIMARY,
+    Replica,
+    ReplicaSet,
+    is_connection_failure,
+)
+
+_URL = "postgresql+psycopg://u:p@127.0.0.1:1/db"
+
+
+def _replica_set(count: int, **kwargs: object) -> ReplicaSet:
+    replicas = []
+    for i in range(count):
+        engine = create_async_engine(_URL)
+        replicas.append(
+            Replica(
+                name=f"r{i}",
+                engine=engine,
+                session_factory=async_sessionmaker(bind=engine, class_=AsyncSession),
+            )
+        )
+    primary = async_sessionmaker(bind=create_async_engine(_URL), class_=AsyncSession)
+    return ReplicaSet(replicas, primary, **kwargs)  # type: ignore[arg-type]
+
+
+def _connection_error() -> exc.OperationalError:
+    return exc.OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+
+def test_round_robin_rotates_and_falls_back_to_primary() -> None:
+    # 順番に振り分け、レプリカがなければプライマリを返す。
+    replica_set = _replica_set(2)
+
+    names = [replica_set.select()[0] for _ in range(4)]
+
+    assert names == ["r0", "r1", "r0", "r1"]
+    assert _replica_set(0).select()[0] == PRIMARY
+
+
+def test_connection_failure_ejects_replica_until_cooldown() -> None:
+    # 接続失敗したレプリカは除外され、全除外時はプライマリへフォールバックする。
+    replica_set = _replica_set(2, eject_sec=60.0)
+
+    replica_set.report_failure("r0", _connection_error())
+    assert {replica_set.select()[0] for _ in range(3)} == {"r1"}
+
+    replica_set.report_failure("r1", _connection_error())
+    assert replica_set.select()[0] == PRIMARY
+
+    # クールダウン経過後は振り分け対象へ戻る。
+    for replica in replica_set.replicas:
+        replica.ejected_until = 0.0
+    assert {replica_set.select()[0] for _ in range(2)} == {"r0", "r1"}
+
+
+async def test_connect_failure_on_replica_engine_ejects_it() -> None:
+    # レプリカ自身の接続が確立できなければ、エンジンのイベント経由で除外する。
+    replica_set = _replica_set(2, eject_sec=60.0)
+    replica = replica_set.replicas[0]
+
+    with pytest.raises(exc.OperationalError):
+        async with replica.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    assert {replica_set.select()[0] for _ in range(3)} == {"r1"}
+
+
+def _context(
+    error: exc.StatementError, *, connected: bool, disconnect: bool = False
+) -> ExceptionContext:
+    return cast(
+        ExceptionContext,
+        SimpleNamespace(
+            is_disconnect=disconnect,
+            connection=object() if connected else None,
+            sqlalchemy_exception=error,
+        ),
+    )
+
+
+def test_only_connect_failures_and_disconnects_count() -> None:
+    # 接続不可・接続断だけを除外の対象とし、確立済み接続上の文の取消
+    # （statement_timeout）や SQL エラーでは健全なレプリカを外さない。
+    refused = exc.OperationalError("SELECT 1", {}, Exception("connection refused"))
+    canceled = exc.OperationalError("SELECT 1", {}, QueryCanceled("canceled"))
+    closed = exc.OperationalError("SELECT 1", {}, Exception("server closed"))
+    syntax = exc.ProgrammingError("SELECT x", {}, Exception("syntax error"))
+
+    assert is_connection_failure(_context(refused, connected=False))
+    assert is_connection_failure(_context(closed, connected=True, disconnect=True))
+    assert not is_connection_failure(_context(canceled, connected=True))
+    assert not is_connection_failure(_context(syntax, connected=True))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+
+from app.adapters.network import async_tcp_ping
+
+
+def _unused_port() -> int:
+    # 一度 bind して解放したポートは、直後であれば未待受として扱える。
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_async_tcp_ping_returns_ok_for_listening_port() -> None:
+    # ループバックで待ち受けるサーバーへ接続できた場合は ok とし、
+    # 同期版 tcp_ping と同じ (ok, latency_ms, error) 形式で返すことを確認する。
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        ok, latency_ms, error = await async_tcp_ping("127.0.0.1", port)
+
+    assert ok is True
+    assert isinstance(latency_ms, int)
+    assert error is None
+
+
+async def test_async_tcp_ping_returns_error_for_closed_port() -> None:
+    # 未待受ポートは例外を送出せず、失敗として理由付きで返すことを確認する。
+    ok, _, error = await async_tcp_ping("127.0.0.1", _unused_port())
+
+    assert ok is False
+    assert error
+
+
+async def test_async_tcp_ping_rejects_invalid_timeout() -> None:
+    # タイムアウト 0 以下は設定ミスなので、同期版と同様に ValueError とする。
+    with pytest.raises(ValueError):
+        await async_tcp_ping("127.0.0.1", 5432, timeout=0)
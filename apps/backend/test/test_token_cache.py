@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from app.core.security.token_cache import VerifiedTokenCache, token_digest
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_at_token_exp_before_ttl() -> None:
+    # 寿命は TTL とトークンの exp の早い方で、exp ちょうどで無効になる。
+    clock = _Clock(1000.0)
+    cache: VerifiedTokenCache[str] = VerifiedTokenCache(10, ttl_sec=300, clock=clock)
+    key = token_digest("token-a")
+
+    cache.put(key, "principal", not_after=1010.0)
+    clock.now = 1009.9
+    assert cache.get(key) == "principal"
+    clock.now = 1010.0
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    # 上限超過時は最も古く使われたエントリを追い出す。
+    cache: VerifiedTokenCache[str] = VerifiedTokenCache(
+        2, ttl_sec=300, clock=_Clock(0.0)
+    )
+    a, b, c = (token_digest(t) for t in ("a", "b", "c"))
+
+    cache.put(a, "A", not_after=100.0)
+    cache.put(b, "B", not_after=100.0)
+    assert cache.get(a) == "A"
+    cache.put(c, "C", not_after=100.0)
+
+    assert cache.get(b) is None
+    assert cache.get(a) == "A"
+    assert cache.get(c) == "C"
+
+
+def test_zero_capacity_disables_cache() -> None:
+    cache: VerifiedTokenCache[str] = VerifiedTokenCache(0, ttl_sec=300)
+
+    cache.put(token_digest("a"), "A", not_after=float("inf"))
+
+    assert not cache.enabled
+    assert len(cache) == 0
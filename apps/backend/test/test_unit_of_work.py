@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+from typing import cast
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.adapters.postgres.engine import create_session_factory
+from app.adapters.postgres.errors import DatabaseDeadlineExceeded
+from app.adapters.postgres.unit_of_work import (
+    DbDeadline,
+    DeadlineSyncSession,
+    _set_local_statement_timeout,
+    read_only_bind,
+    session_scope,
+)
+
+# 接続を試みれば即失敗する URL（接続が発生しないことの確認に使う）
+_UNREACHABLE_URL = "postgresql+psycopg://u:p@127.0.0.1:1/db"
+
+
+async def test_scope_without_statements_never_connects() -> None:
+    # DB に触れないリクエストでは接続も BEGIN / COMMIT も発生しない。
+    engine = create_async_engine(_UNREACHABLE_URL)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession)
+
+    async with session_scope(factory) as session:
+        assert not session.in_transaction()
+
+    assert engine.pool.checkedout() == 0  # type: ignore[attr-defined]
+    await engine.dispose()
+
+
+async def test_scope_propagates_handler_errors() -> None:
+    # 例外はそのまま上位へ伝播する（未開始なら rollback も発生しない）。
+    engine = create_async_engine(_UNREACHABLE_URL)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession)
+
+    with pytest.raises(ValueError):
+        async with session_scope(factory, read_only=True):
+            raise ValueError("handler failed")
+    await engine.dispose()
+
+
+def test_read_only_bind_uses_autocommit_on_shared_pool() -> None:
+    # 読み取り専用バインドは同じプールを AUTOCOMMIT で使う。
+    engine = create_async_engine(_UNREACHABLE_URL)
+
+    bind = read_only_bind(engine)
+
+    assert bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    assert bind.pool is engine.pool
+
+
+def test_set_local_listener_is_scoped_to_app_sessions() -> None:
+    # SET LOCAL はアプリのセッションにだけ適用し、基底 Session
+    # （スクリプトや他ライブラリのセッション）には登録しない。
+    session = create_session_factory(create_async_engine(_UNREACHABLE_URL))()
+
+    assert isinstance(session.sync_session, DeadlineSyncSession)
+    assert event.contains(
+        DeadlineSyncSession, "after_begin", _set_local_statement_timeout
+    )
+    assert not event.contains(Session, "after_begin", _set_local_statement_timeout)
+
+
+async def test_client_deadline_raises_deadline_exceeded() -> None:
+    # サーバが応答しない場合もクライアント側の期限で打ち切り、期限超過へ変換する。
+    async def silent(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.read()
+
+    server = await asyncio.start_server(silent, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    engine = create_async_engine(f"postgresql+psycopg://u:p@127.0.0.1:{port}/db")
+    factory = create_session_factory(engine)
+    try:
+        with pytest.raises(DatabaseDeadlineExceeded) as caught:
+            async with session_scope(
+                factory, deadline=DbDeadline(timeout_ms=50, grace_ms=0)
+            ) as session:
+                await session.execute(text("SELECT 1"))
+    finally:
+        server.close()
+        await engine.dispose()
+
+    assert caught.value.source == "client"
+    assert caught.value.timeout_ms == 50
+
+
+async def test_zero_deadline_disables_server_default_and_client_timeout() -> None:
+    # 0 の上書きは接続既定値を SET LOCAL で 0 に戻し、クライアント側期限も設けない。
+    factory = create_session_factory(create_async_engine(_UNREACHABLE_URL))
+    deadline = DbDeadline(timeout_ms=0, grace_ms=100, server_default_ms=30000)
+
+    executed: list[str] = []
+
+    class _Connection:
+        def get_execution_options(self) -> dict[str, object]:
+            return {}
+
+        def exec_driver_sql(self, statement: str) -> None:
+            executed.append(statement)
+
+    async with session_scope(factory, deadline=deadline) as session:
+        info = dict(session.info)
+        _set_local_statement_timeout(
+            session.sync_session,
+            cast(SessionTransaction, None),
+            cast(Connection, _Connection()),
+        )
+
+    assert info == {"db_timeout_ms": 0, "db_set_local_timeout": True}
+    assert executed == ["SET LOCAL statement_timeout = 0"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security.offload import VerificationOffloader
+
+
+async def test_concurrency_is_limited_to_worker_count() -> None:
+    # 同時実行はワーカー数までで、残りは枠待ち（キュー深さ）として数える。
+    offloader = VerificationOffloader(max_workers=2)
+    release = threading.Event()
+
+    def blocking(value: int) -> int:
+        release.wait(timeout=5)
+        return value * 2
+
+    tasks = [asyncio.create_task(offloader.run(blocking, i)) for i in range(5)]
+    for _ in range(100):
+        if offloader.running == 2 and offloader.waiting == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert (offloader.running, offloader.waiting) == (2, 3)
+
+    release.set()
+    assert await asyncio.gather(*tasks) == [0, 2, 4, 6, 8]
+    assert (offloader.running, offloader.waiting) == (0, 0)
+    offloader.shutdown()
+
+
+async def test_worker_exceptions_propagate_and_free_the_slot() -> None:
+    # ワーカー内の例外はそのまま呼び出し元へ伝わり、枠は解放される。
+    offloader = VerificationOffloader(max_workers=1)
+
+    def failing(value: str) -> str:
+        raise ValueError(value)
+
+    with pytest.raises(ValueError, match="bad token"):
+        await offloader.run(failing, "bad token")
+    assert await offloader.run(str.upper, "ok") == "OK"
+    offloader.shutdown()
+
+
+async def test_cancelled_caller_keeps_the_slot_until_the_worker_finishes() -> None:
+    # 呼び出し元がキャンセルされても、実行中の検証が終わるまで枠を返さない。
+    # クライアント切断が続いても同時実行数が上限を超えないこと。
+    offloader = VerificationOffloader(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(value: int) -> int:
+        started.set()
+        release.wait(timeout=5)
+        return value
+
+    first = asyncio.create_task(offloader.run(blocking, 1))
+    await asyncio.to_thread(started.wait, 5)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    second = asyncio.create_task(offloader.run(str, 2))
+    await asyncio.sleep(0.05)
+    assert (offloader.running, offloader.waiting) == (1, 1)
+
+    release.set()
+    assert await second == "2"
+    assert (offloader.running, offloader.waiting) == (0, 0)
+    offloader.shutdown()